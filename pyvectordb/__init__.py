@@ -1,5 +1,23 @@
+from .async_driver import AsyncVectorDB
 from .driver import VectorDB
+from .filter import Filter
+from .index_spec import IndexSpec
+from .metadata_type import MetadataType
+from .search_params import SearchParams
+from .search_result import SearchResult
 from .vector import Vector
+from .vector_batch import VectorBatch
 from .vector_distance import VectorDistance
 
-__all__ = ["VectorDB", "Vector", "VectorDistance"]
+__all__ = [
+    "VectorDB",
+    "AsyncVectorDB",
+    "Filter",
+    "IndexSpec",
+    "MetadataType",
+    "SearchParams",
+    "SearchResult",
+    "Vector",
+    "VectorBatch",
+    "VectorDistance",
+]
@@ -0,0 +1,136 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+
+from .filter import Filter
+from .metadata_type import MetadataType
+from .search_params import SearchParams
+from .search_result import SearchResult
+from .vector import Vector
+from .vector_batch import VectorBatch
+from .vector_distance import VectorDistance
+
+
+class AsyncVectorDB(ABC):
+    """Asyncio counterpart of `VectorDB`, every call awaits the backend's async client instead of blocking the loop.
+
+    Clients are created in `connect`, which `async with` calls on enter (and `close` on exit).
+    """
+
+    def __init__(self, host, port, debug: bool = False):
+        logging.basicConfig(
+            level=logging.DEBUG if debug else logging.INFO,
+            format="%(asctime)s - %(name)s - %(levelname)s - %(filename)s - Line: %(lineno)d - %(funcName)s - %(message)s",
+            handlers=[
+                logging.StreamHandler(),
+            ],
+        )
+        self.__log = logging.getLogger(self.__class__.__name__)
+
+        self.__host = host
+        self.__port = port
+
+    async def connect(self) -> None:
+        # in-process databases have no server to connect to
+        if self.__host is not None:
+            await self.__test_connection(self.__host, self.__port)
+        await self._connect()
+
+    async def __aenter__(self) -> "AsyncVectorDB":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    @abstractmethod
+    async def _connect(self) -> None: ...
+
+    @abstractmethod
+    async def close(self) -> None: ...
+
+    @abstractmethod
+    async def insert_vector(self, vector: Vector) -> None: ...
+
+    @abstractmethod
+    async def insert_vectors(self, vectors: list[Vector] | VectorBatch) -> None: ...
+
+    @abstractmethod
+    async def read_vector(
+        self, id: str, include_embedding: bool = True, include_metadata: bool = True
+    ) -> Vector | None: ...
+
+    @abstractmethod
+    async def update_vector(self, vector: Vector) -> None: ...
+
+    @abstractmethod
+    async def update_vectors(self, vectors: list[Vector] | VectorBatch) -> None: ...
+
+    @abstractmethod
+    async def delete_vector(self, id: str) -> None: ...
+
+    @abstractmethod
+    async def delete_vectors(self, ids: list[str] | list[Vector]) -> None: ...
+
+    @abstractmethod
+    async def get_neighbor_vectors(
+        self,
+        vector: Vector,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[VectorDistance]: ...
+
+    @abstractmethod
+    async def get_neighbor_vectors_batch(
+        self,
+        vectors: list[Vector] | VectorBatch,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[list[VectorDistance]]: ...
+
+    @abstractmethod
+    async def get_neighbor_results(
+        self,
+        vector: Vector,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> SearchResult:
+        """`get_neighbor_vectors` as one columnar `SearchResult`, without a `Vector` object per neighbor."""
+
+    @abstractmethod
+    async def get_neighbor_results_batch(
+        self,
+        vectors: list[Vector] | VectorBatch,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[SearchResult]: ...
+
+    @abstractmethod
+    async def create_metadata_index(self, field: str, type: MetadataType | str) -> None:
+        """Indexes the `field` metadata key for filtered searches, a no-op where the backend indexes every key."""
+
+    async def __test_connection(self, host, port):
+        timeout = 3.0
+
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(host, int(port)), timeout)
+            writer.close()
+            await writer.wait_closed()
+            self.__log.info(f"Connection to {host}:{port} succeeded.")
+
+        except (TimeoutError, OSError) as e:
+            err_msg = f"Connection to {host}:{port} failed: {e}"
+            self.__log.error(err_msg)
+            raise ConnectionError(err_msg)
@@ -3,7 +3,12 @@ from chromadb.config import Settings
 
 from pyvectordb.distance_function import DistanceFunction
 from pyvectordb.driver import VectorDB
+from pyvectordb.filter import Filter, to_operator_dict
+from pyvectordb.metadata_type import MetadataType
+from pyvectordb.search_params import SearchParams
+from pyvectordb.search_result import SearchResult
 from pyvectordb.vector import Vector
+from pyvectordb.vector_batch import VectorBatch
 from pyvectordb.vector_distance import VectorDistance
 
 from .distance import Distance
@@ -75,15 +80,11 @@ class ChromaDB(VectorDB):
             metadatas=[vector.metadata],
         )
 
-    def insert_vectors(self, vectors: list[Vector]) -> None:
+    def insert_vectors(self, vectors: list[Vector] | VectorBatch) -> None:
         if len(vectors) == 0:
             return
 
-        ids, embeddings, metadatas = [], [], []
-        for v in vectors:
-            ids.append(v.get_id())
-            embeddings.append(v.embedding)
-            metadatas.append(v.metadata)
+        ids, embeddings, metadatas = self.__columns(vectors)
 
         self.collection.add(
             ids=ids,
@@ -91,15 +92,15 @@ class ChromaDB(VectorDB):
             metadatas=metadatas,
         )
 
-    def read_vector(self, id: str) -> Vector | None:
-        result: dict = self.collection.get(ids=id, include=["metadatas", "documents", "embeddings"])
+    def read_vector(self, id: str, include_embedding: bool = True, include_metadata: bool = True) -> Vector | None:
+        result: dict = self.collection.get(ids=id, include=self.__include(include_embedding, include_metadata))
 
         if len(result.get("ids")) == 0:
             return None
 
         vector_id = result.get("ids")[0]
-        embedding = result.get("embeddings")[0]
-        metadata = result.get("metadatas")[0]
+        embedding = result.get("embeddings")[0] if include_embedding else None
+        metadata = result.get("metadatas")[0] if include_metadata else None
 
         return Vector(
             embedding=embedding,
@@ -114,15 +115,11 @@ class ChromaDB(VectorDB):
             metadatas=[vector.metadata],
         )
 
-    def update_vectors(self, vectors: list[Vector]) -> None:
+    def update_vectors(self, vectors: list[Vector] | VectorBatch) -> None:
         if len(vectors) == 0:
             return
 
-        ids, embeddings, metadatas = [], [], []
-        for v in vectors:
-            ids.append(v.id)
-            embeddings.append(v.embedding)
-            metadatas.append(v.metadata)
+        ids, embeddings, metadatas = self.__columns(vectors)
 
         self.collection.update(
             ids=ids,
@@ -150,26 +147,92 @@ class ChromaDB(VectorDB):
         self,
         vector: Vector,
         n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
     ) -> list[VectorDistance]:
+        return self.get_neighbor_results(
+            vector, n, filter, include_embedding=include_embedding, include_metadata=include_metadata, params=params
+        ).to_vector_distances()
+
+    def get_neighbor_results(
+        self,
+        vector: Vector,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> SearchResult:
+        return self.get_neighbor_results_batch([vector], n, filter, include_embedding, include_metadata, params)[0]
+
+    def get_neighbor_vectors_batch(
+        self,
+        vectors: list[Vector] | VectorBatch,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[list[VectorDistance]]:
+        results = self.get_neighbor_results_batch(
+            vectors, n, filter, include_embedding=include_embedding, include_metadata=include_metadata, params=params
+        )
+        return [result.to_vector_distances() for result in results]
+
+    def get_neighbor_results_batch(
+        self,
+        vectors: list[Vector] | VectorBatch,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[SearchResult]:
+        # hnsw:search_ef is collection metadata on chroma, params have no per query equivalent
+        if len(vectors) == 0:
+            return []
+
+        _, embeddings, _ = self.__columns(vectors)
         result: dict = self.collection.query(
-            query_embeddings=[vector.embedding],
+            query_embeddings=embeddings,
             n_results=n,
-            include=["metadatas", "documents", "distances", "embeddings"],
+            where=to_operator_dict(filter) if filter is not None else None,
+            include=self.__include(include_embedding, include_metadata) + ["distances"],
         )
 
-        vds = []
-        for i, _ in enumerate(result.get("ids")[0]):
-            vd = VectorDistance(
-                vector=Vector(
-                    vector_id=result.get("ids")[0][i],
-                    embedding=result.get("embeddings")[0][i],
-                    metadata=result.get("metadatas")[0][i],
-                ),
-                distance=result.get("distances")[0][i],
+        return [
+            SearchResult(
+                ids=ids,
+                distances=result.get("distances")[q],
+                embeddings=result.get("embeddings")[q] if include_embedding else None,
+                metadata=result.get("metadatas")[q] if include_metadata else None,
             )
-            vds.append(vd)
+            for q, ids in enumerate(result.get("ids"))
+        ]
+
+    def create_metadata_index(self, field: str, type: MetadataType | str) -> None:
+        # chroma indexes every metadata key of a collection, there is nothing to create
+        pass
+
+    @staticmethod
+    def __include(include_embedding: bool, include_metadata: bool) -> list[str]:
+        # every included field is sent back for each result, documents are never stored
+        return (["embeddings"] if include_embedding else []) + (["metadatas"] if include_metadata else [])
 
-        return vds
+    @staticmethod
+    def __columns(vectors: list[Vector] | VectorBatch) -> tuple[list, list, list]:
+        if isinstance(vectors, VectorBatch):
+            # chroma takes the 2-D embedding matrix as is
+            return vectors.ids, vectors.embeddings, vectors.metadata
+
+        ids, embeddings, metadatas = [], [], []
+        for v in vectors:
+            ids.append(v.get_id())
+            embeddings.append(v.embedding)
+            metadatas.append(v.metadata)
+        return ids, embeddings, metadatas
 
     def __get_distance_function(self, distance_function: DistanceFunction | str) -> Distance:
         if isinstance(distance_function, str):
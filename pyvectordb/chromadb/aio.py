@@ -0,0 +1,246 @@
+import chromadb
+from chromadb.api import AsyncClientAPI
+from chromadb.config import Settings
+
+from pyvectordb.async_driver import AsyncVectorDB
+from pyvectordb.distance_function import DistanceFunction
+from pyvectordb.filter import Filter, to_operator_dict
+from pyvectordb.metadata_type import MetadataType
+from pyvectordb.search_params import SearchParams
+from pyvectordb.search_result import SearchResult
+from pyvectordb.vector import Vector
+from pyvectordb.vector_batch import VectorBatch
+from pyvectordb.vector_distance import VectorDistance
+
+from .distance import Distance
+
+
+class AsyncChromaDB(AsyncVectorDB):
+    def __init__(
+        self,
+        host: str,
+        port: str,
+        auth_provider: str = None,
+        auth_credentials: str = None,
+        collection_name: str = None,
+        distance_function: DistanceFunction | str = DistanceFunction.L2,
+        debug: bool = False,
+    ) -> None:
+        super().__init__(host, port, debug)
+
+        self.host = host or self.__raise_value_error("host")
+        self.port = port or self.__raise_value_error("port")
+        self.auth_provider = auth_provider
+        self.auth_credentials = auth_credentials
+        self.collection_name = collection_name or self.__raise_value_error("collection_name")
+        self.distance_function = distance_function or self.__raise_value_error("distance_function")
+
+        self.client: AsyncClientAPI = None
+        self.collection = None
+
+    @staticmethod
+    def __raise_value_error(param: str):
+        raise ValueError(f"{param} is required")
+
+    async def _connect(self) -> None:
+        if self.client is None:
+            settings = Settings(
+                anonymized_telemetry=False,
+                allow_reset=True,
+            )
+
+            if self.auth_provider and self.auth_credentials:
+                settings.chroma_client_auth_provider = self.auth_provider
+                settings.chroma_client_auth_credentials = self.auth_credentials
+
+            self.client = await chromadb.AsyncHttpClient(
+                host=self.host,
+                port=int(self.port),
+                settings=settings,
+            )
+
+        await self.client.heartbeat()
+
+        if self.collection is None:
+            distance_func = self.__get_distance_function(self.distance_function)
+            self.collection = await self.client.get_or_create_collection(
+                name=self.collection_name, metadata={"hnsw:space": distance_func.value}
+            )
+
+    async def close(self) -> None:
+        # the async http client has no connection to release, its session is closed with the event loop
+        self.client = None
+        self.collection = None
+
+    async def insert_vector(self, vector: Vector) -> None:
+        await self.insert_vectors([vector])
+
+    async def insert_vectors(self, vectors: list[Vector] | VectorBatch) -> None:
+        if len(vectors) == 0:
+            return
+
+        ids, embeddings, metadatas = self.__columns(vectors)
+
+        await self.collection.add(
+            ids=ids,
+            embeddings=embeddings,
+            metadatas=metadatas,
+        )
+
+    async def read_vector(
+        self, id: str, include_embedding: bool = True, include_metadata: bool = True
+    ) -> Vector | None:
+        result: dict = await self.collection.get(ids=id, include=self.__include(include_embedding, include_metadata))
+
+        if len(result.get("ids")) == 0:
+            return None
+
+        return Vector(
+            embedding=result.get("embeddings")[0] if include_embedding else None,
+            vector_id=result.get("ids")[0],
+            metadata=result.get("metadatas")[0] if include_metadata else None,
+        )
+
+    async def update_vector(self, vector: Vector) -> None:
+        await self.update_vectors([vector])
+
+    async def update_vectors(self, vectors: list[Vector] | VectorBatch) -> None:
+        if len(vectors) == 0:
+            return
+
+        ids, embeddings, metadatas = self.__columns(vectors)
+
+        await self.collection.update(
+            ids=ids,
+            embeddings=embeddings,
+            metadatas=metadatas,
+        )
+
+    async def delete_vector(self, id_: str) -> None:
+        await self.collection.delete(
+            ids=[id_],
+        )
+
+    async def delete_vectors(self, ids: list[str] | list[Vector]) -> None:
+        if len(ids) == 0:
+            return
+
+        if isinstance(ids[0], Vector):
+            ids = [v.id for v in ids]
+
+        await self.collection.delete(
+            ids=ids,
+        )
+
+    async def get_neighbor_vectors(
+        self,
+        vector: Vector,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[VectorDistance]:
+        return (
+            await self.get_neighbor_results(
+                vector, n, filter, include_embedding=include_embedding, include_metadata=include_metadata, params=params
+            )
+        ).to_vector_distances()
+
+    async def get_neighbor_results(
+        self,
+        vector: Vector,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> SearchResult:
+        return (
+            await self.get_neighbor_results_batch([vector], n, filter, include_embedding, include_metadata, params)
+        )[0]
+
+    async def get_neighbor_vectors_batch(
+        self,
+        vectors: list[Vector] | VectorBatch,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[list[VectorDistance]]:
+        results = await self.get_neighbor_results_batch(
+            vectors, n, filter, include_embedding=include_embedding, include_metadata=include_metadata, params=params
+        )
+        return [result.to_vector_distances() for result in results]
+
+    async def get_neighbor_results_batch(
+        self,
+        vectors: list[Vector] | VectorBatch,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[SearchResult]:
+        # hnsw:search_ef is collection metadata on chroma, params have no per query equivalent
+        if len(vectors) == 0:
+            return []
+
+        _, embeddings, _ = self.__columns(vectors)
+        result: dict = await self.collection.query(
+            query_embeddings=embeddings,
+            n_results=n,
+            where=to_operator_dict(filter) if filter is not None else None,
+            include=self.__include(include_embedding, include_metadata) + ["distances"],
+        )
+
+        return [
+            SearchResult(
+                ids=ids,
+                distances=result.get("distances")[q],
+                embeddings=result.get("embeddings")[q] if include_embedding else None,
+                metadata=result.get("metadatas")[q] if include_metadata else None,
+            )
+            for q, ids in enumerate(result.get("ids"))
+        ]
+
+    async def create_metadata_index(self, field: str, type: MetadataType | str) -> None:
+        # chroma indexes every metadata key of a collection, there is nothing to create
+        pass
+
+    @staticmethod
+    def __include(include_embedding: bool, include_metadata: bool) -> list[str]:
+        # every included field is sent back for each result, documents are never stored
+        return (["embeddings"] if include_embedding else []) + (["metadatas"] if include_metadata else [])
+
+    @staticmethod
+    def __columns(vectors: list[Vector] | VectorBatch) -> tuple[list, list, list]:
+        if isinstance(vectors, VectorBatch):
+            # chroma takes the 2-D embedding matrix as is
+            return vectors.ids, vectors.embeddings, vectors.metadata
+
+        ids, embeddings, metadatas = [], [], []
+        for v in vectors:
+            ids.append(v.get_id())
+            embeddings.append(v.embedding)
+            metadatas.append(v.metadata)
+        return ids, embeddings, metadatas
+
+    def __get_distance_function(self, distance_function: DistanceFunction | str) -> Distance:
+        if isinstance(distance_function, str):
+            distance_function = DistanceFunction.from_str(distance_function)
+
+        if distance_function == DistanceFunction.L2:
+            return Distance.SQUARED_L2
+        elif distance_function == DistanceFunction.MAX_INNER_PRODUCT:
+            return Distance.INNER_PRODUCT
+        elif distance_function == DistanceFunction.COSINE:
+            return Distance.COSINE_SIMILARITY
+        else:
+            d_ = [
+                "L2",
+                "MAX_INNER_PRODUCT",
+                "COSINE",
+            ]
+            raise ValueError(f"distance function unavailable on chromadb. {d_}")
@@ -2,7 +2,12 @@ import logging
 import socket
 from abc import ABC, abstractmethod
 
+from .filter import Filter
+from .metadata_type import MetadataType
+from .search_params import SearchParams
+from .search_result import SearchResult
 from .vector import Vector
+from .vector_batch import VectorBatch
 from .vector_distance import VectorDistance
 
 
@@ -17,22 +22,24 @@ class VectorDB(ABC):
         )
         self.__log = logging.getLogger(self.__class__.__name__)
 
-        self.__test_connection(host, port)
+        # in-process databases have no server to connect to
+        if host is not None:
+            self.__test_connection(host, port)
 
     @abstractmethod
     def insert_vector(self, vector: Vector) -> None: ...
 
     @abstractmethod
-    def insert_vectors(self, vectors: list[Vector]) -> None: ...
+    def insert_vectors(self, vectors: list[Vector] | VectorBatch) -> None: ...
 
     @abstractmethod
-    def read_vector(self, id: str) -> Vector | None: ...
+    def read_vector(self, id: str, include_embedding: bool = True, include_metadata: bool = True) -> Vector | None: ...
 
     @abstractmethod
     def update_vector(self, vector: Vector) -> None: ...
 
     @abstractmethod
-    def update_vectors(self, vectors: list[Vector]) -> None: ...
+    def update_vectors(self, vectors: list[Vector] | VectorBatch) -> None: ...
 
     @abstractmethod
     def delete_vector(self, id: str) -> None: ...
@@ -41,7 +48,58 @@ class VectorDB(ABC):
     def delete_vectors(self, ids: list[str] | list[Vector]) -> None: ...
 
     @abstractmethod
-    def get_neighbor_vectors(self, vector: Vector, n: int) -> list[VectorDistance]: ...
+    def get_neighbor_vectors(
+        self,
+        vector: Vector,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[VectorDistance]: ...
+
+    @abstractmethod
+    def get_neighbor_vectors_batch(
+        self,
+        vectors: list[Vector] | VectorBatch,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[list[VectorDistance]]:
+        """Neighbors of every query vector, in the order of `vectors`, resolved in as few round trips as possible.
+
+        `include_embedding=False` / `include_metadata=False` leave embeddings / metadata out of the response, the
+        returned vectors hold None instead. `params` sets the search time index settings (`SearchParams`) of the call.
+        """
+
+    @abstractmethod
+    def get_neighbor_results(
+        self,
+        vector: Vector,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> SearchResult:
+        """`get_neighbor_vectors` as one columnar `SearchResult`, without a `Vector` object per neighbor."""
+
+    @abstractmethod
+    def get_neighbor_results_batch(
+        self,
+        vectors: list[Vector] | VectorBatch,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[SearchResult]: ...
+
+    @abstractmethod
+    def create_metadata_index(self, field: str, type: MetadataType | str) -> None:
+        """Indexes the `field` metadata key for filtered searches, a no-op where the backend indexes every key."""
 
     def __test_connection(self, host, port):
         timeout = 3.0
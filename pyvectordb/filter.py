@@ -0,0 +1,184 @@
+from abc import ABC, abstractmethod
+from typing import Any
+
+
+class Filter(ABC):
+    """Backend neutral metadata filter, built from `Eq`, `In` and `Range` conditions on metadata keys combined with
+    `And`, `Or` and `Not` (or the `&`, `|` and `~` operators).
+
+    Every backend compiles it to its native filter so it is applied by the engine during the search:
+
+        Eq("lang", "en") & Range("year", gte=2020) & ~In("source", ["crawler", "spam"])
+
+    `Not` is pushed down to the conditions (see `push_down_not`), where a negated `Range` is the complementary range:
+    `~Range("year", gte=2020)` is `Range("year", lt=2020)`, so like any range it never matches a missing key.
+    """
+
+    __slots__ = ()
+
+    def __and__(self, other: "Filter") -> "And":
+        return And(*self.filters, other) if isinstance(self, And) else And(self, other)
+
+    def __or__(self, other: "Filter") -> "Or":
+        return Or(*self.filters, other) if isinstance(self, Or) else Or(self, other)
+
+    def __invert__(self) -> "Not":
+        return Not(self)
+
+    @abstractmethod
+    def matches(self, metadata: dict | None) -> bool: ...
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({', '.join(repr(getattr(self, s)) for s in self.__slots__)})"
+
+
+class Eq(Filter):
+    __slots__ = ("key", "value")
+
+    def __init__(self, key: str, value: Any) -> None:
+        self.key = key
+        self.value = value
+
+    def matches(self, metadata: dict | None) -> bool:
+        return metadata is not None and self.key in metadata and metadata[self.key] == self.value
+
+
+class In(Filter):
+    __slots__ = ("key", "values")
+
+    def __init__(self, key: str, values: list) -> None:
+        if len(values) == 0:
+            raise ValueError("values is required")
+
+        self.key = key
+        self.values = list(values)
+
+    def matches(self, metadata: dict | None) -> bool:
+        return metadata is not None and self.key in metadata and metadata[self.key] in self.values
+
+
+class Range(Filter):
+    __slots__ = ("key", "gt", "gte", "lt", "lte")
+
+    def __init__(self, key: str, gt: Any = None, gte: Any = None, lt: Any = None, lte: Any = None) -> None:
+        if gt is None and gte is None and lt is None and lte is None:
+            raise ValueError("at least one of gt, gte, lt or lte is required")
+
+        self.key = key
+        self.gt = gt
+        self.gte = gte
+        self.lt = lt
+        self.lte = lte
+
+    def bounds(self) -> list[tuple[str, Any]]:
+        """The given bounds as (operator name, value) pairs."""
+        return [(name, getattr(self, name)) for name in ("gt", "gte", "lt", "lte") if getattr(self, name) is not None]
+
+    def matches(self, metadata: dict | None) -> bool:
+        if metadata is None or metadata.get(self.key) is None:
+            return False
+
+        value = metadata[self.key]
+        try:
+            return (
+                (self.gt is None or value > self.gt)
+                and (self.gte is None or value >= self.gte)
+                and (self.lt is None or value < self.lt)
+                and (self.lte is None or value <= self.lte)
+            )
+        except TypeError:
+            return False
+
+
+class And(Filter):
+    __slots__ = ("filters",)
+
+    def __init__(self, *filters: Filter) -> None:
+        if len(filters) == 0:
+            raise ValueError("filters is required")
+
+        self.filters = list(filters)
+
+    def matches(self, metadata: dict | None) -> bool:
+        return all(f.matches(metadata) for f in self.filters)
+
+
+class Or(Filter):
+    __slots__ = ("filters",)
+
+    def __init__(self, *filters: Filter) -> None:
+        if len(filters) == 0:
+            raise ValueError("filters is required")
+
+        self.filters = list(filters)
+
+    def matches(self, metadata: dict | None) -> bool:
+        return any(f.matches(metadata) for f in self.filters)
+
+
+class Not(Filter):
+    __slots__ = ("filter",)
+
+    def __init__(self, filter: Filter) -> None:
+        self.filter = filter
+
+    def matches(self, metadata: dict | None) -> bool:
+        filter = push_down_not(self)
+        if isinstance(filter, Not):
+            return not filter.filter.matches(metadata)
+        return filter.matches(metadata)
+
+
+def push_down_not(filter: Filter) -> Filter:
+    """Equivalent filter where `Not` only wraps `Eq` and `In`, compiled by every backend so negated ranges behave
+    the same everywhere.
+
+    `Not` is moved inwards with De Morgan's laws, a negated `Range` becomes an `Or` of the complementary bounds.
+    """
+    if isinstance(filter, And):
+        return And(*[push_down_not(f) for f in filter.filters])
+    if isinstance(filter, Or):
+        return Or(*[push_down_not(f) for f in filter.filters])
+    if not isinstance(filter, Not):
+        return filter
+
+    inner = filter.filter
+    if isinstance(inner, Not):
+        return push_down_not(inner.filter)
+    if isinstance(inner, And):
+        return Or(*[push_down_not(Not(f)) for f in inner.filters])
+    if isinstance(inner, Or):
+        return And(*[push_down_not(Not(f)) for f in inner.filters])
+    if isinstance(inner, Range):
+        complement = {"gt": "lte", "gte": "lt", "lt": "gte", "lte": "gt"}
+        return Or(*[Range(inner.key, **{complement[name]: value}) for name, value in inner.bounds()])
+    return filter
+
+
+def to_operator_dict(filter: Filter) -> dict:
+    """Compiles to the `$eq` / `$in` / `$and` ... operator documents of Chroma `where` and Pinecone metadata filters,
+    metadata keys are top level fields of both."""
+    filter = push_down_not(filter)
+
+    if isinstance(filter, Eq):
+        return {filter.key: {"$eq": filter.value}}
+    if isinstance(filter, In):
+        return {filter.key: {"$in": filter.values}}
+    if isinstance(filter, Range):
+        conditions = [{filter.key: {f"${name}": value}} for name, value in filter.bounds()]
+        return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+    if isinstance(filter, Not):
+        # after push_down_not only Eq and In are negated
+        inner = filter.filter
+        if isinstance(inner, Eq):
+            return {inner.key: {"$ne": inner.value}}
+        return {inner.key: {"$nin": inner.values}}
+
+    # chroma rejects $and / $or with a single condition
+    conditions = [to_operator_dict(f) for f in filter.filters]
+    if len(conditions) == 1:
+        return conditions[0]
+    return {"$and" if isinstance(filter, And) else "$or": conditions}
+
+
+__all__ = ["Filter", "Eq", "In", "Range", "And", "Or", "Not"]
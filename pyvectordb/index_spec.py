@@ -0,0 +1,103 @@
+from enum import Enum
+
+
+class IndexType(Enum):
+    """Vector index structure of a collection"""
+
+    HNSW = "hnsw"
+    FLAT = "flat"
+    IVF = "ivf"
+    DYNAMIC = "dynamic"
+
+    @staticmethod
+    def from_str(text: str) -> "IndexType":
+        text = text.lower()
+
+        if text == "hnsw":
+            return IndexType.HNSW
+        if text in ("flat", "brute_force"):
+            return IndexType.FLAT
+        if text == "ivf":
+            return IndexType.IVF
+        if text == "dynamic":
+            return IndexType.DYNAMIC
+
+        raise ValueError("invalid string for index type")
+
+
+class QuantizationType(Enum):
+    """Compressed representation the index searches, full precision vectors are kept for rescoring"""
+
+    SCALAR = "scalar"
+    BINARY = "binary"
+    PRODUCT = "product"
+
+    @staticmethod
+    def from_str(text: str) -> "QuantizationType":
+        text = text.lower()
+
+        if text in ("scalar", "sq", "int8"):
+            return QuantizationType.SCALAR
+        if text in ("binary", "bq"):
+            return QuantizationType.BINARY
+        if text in ("product", "pq"):
+            return QuantizationType.PRODUCT
+
+        raise ValueError("invalid string for quantization type")
+
+
+class IndexSpec:
+    """Backend neutral vector index settings of a new collection, translated by `QdrantDB`, `MilvusDB` and
+    `WeaviateDB` to their native index config. Settings left as None keep the backend default.
+
+    `m` / `ef_construction` are the HNSW graph degree and build beam width, `nlist` the IVF cluster count and
+    `pq_segments` the product quantization sub-vector count. `on_disk` keeps the full precision vectors (or the
+    index) on disk, `quantization_always_ram` pins the quantized vectors in memory.
+
+        IndexSpec("hnsw", m=32, ef_construction=256, quantization="scalar", on_disk=True)
+    """
+
+    __slots__ = (
+        "index_type",
+        "m",
+        "ef_construction",
+        "nlist",
+        "quantization",
+        "pq_segments",
+        "on_disk",
+        "quantization_always_ram",
+    )
+
+    def __init__(
+        self,
+        index_type: IndexType | str = IndexType.HNSW,
+        m: int | None = None,
+        ef_construction: int | None = None,
+        nlist: int | None = None,
+        quantization: QuantizationType | str | None = None,
+        pq_segments: int | None = None,
+        on_disk: bool = False,
+        quantization_always_ram: bool = True,
+    ) -> None:
+        if isinstance(index_type, str):
+            index_type = IndexType.from_str(index_type)
+        if isinstance(quantization, str):
+            quantization = QuantizationType.from_str(quantization)
+
+        if pq_segments is not None and quantization != QuantizationType.PRODUCT:
+            raise ValueError("pq_segments requires product quantization")
+
+        self.index_type = index_type
+        self.m = m
+        self.ef_construction = ef_construction
+        self.nlist = nlist
+        self.quantization = quantization
+        self.pq_segments = pq_segments
+        self.on_disk = on_disk
+        self.quantization_always_ram = quantization_always_ram
+
+    def __repr__(self) -> str:
+        return f"IndexSpec({', '.join(f'{s}={getattr(self, s)!r}' for s in self.__slots__)})"
+
+
+__all__ = ["IndexSpec", "IndexType", "QuantizationType"]
@@ -0,0 +1,373 @@
+import json
+import os
+import threading
+
+import numpy as np
+
+from pyvectordb.distance_function import DistanceFunction
+from pyvectordb.driver import VectorDB
+from pyvectordb.filter import Filter, push_down_not
+from pyvectordb.metadata_type import MetadataType
+from pyvectordb.search_params import SearchParams
+from pyvectordb.search_result import SearchResult
+from pyvectordb.vector import Vector
+from pyvectordb.vector_batch import VectorBatch
+from pyvectordb.vector_distance import VectorDistance
+
+from .distance import Distance, finalize_distances, pairwise_distances, top_k
+from .hnsw import HNSWIndex
+from .index import FlatIndex, Index
+from .ivf import IVFIndex
+from .metadata_index import MetadataIndex, candidate_slots
+from .quantization import BinaryQuantizer, ProductQuantizer, QuantizedIndex, Quantizer, ScalarQuantizer
+from .storage import VectorStorage, load_array, save_array
+
+# tombstoned rows are compacted away once they outnumber this ratio of the stored rows
+COMPACT_RATIO = 0.5
+
+FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+
+
+class NumpyVectorDB(VectorDB):
+    def __init__(
+        self,
+        vector_size: int = None,
+        distance_function: DistanceFunction | str = None,
+        index: Index | None = None,
+        path: str | None = None,
+        debug: bool = False,
+    ) -> None:
+        super().__init__(None, None, debug)
+
+        self.path = path
+        self.index = index or FlatIndex()
+        self.metadata_indexes: dict[str, MetadataIndex] = {}
+        self.__lock = threading.RLock()
+
+        manifest = self.__read_manifest()
+        if manifest is not None:
+            vector_size = vector_size or manifest["vector_size"]
+            distance_function = distance_function or manifest["distance_function"]
+
+        self.vector_size = vector_size or self.__raise_value_error("vector_size")
+        self.distance_function = distance_function or DistanceFunction.L2
+        self.distance = self.__get_distance_function(self.distance_function)
+
+        if manifest is None:
+            self.storage = VectorStorage(self.vector_size)
+            self.index.attach(self.storage, self.distance)
+        else:
+            self.__open(manifest)
+
+    @staticmethod
+    def __raise_value_error(param: str):
+        raise ValueError(f"{param} is required")
+
+    def __get_distance_function(self, distance_function: DistanceFunction | str) -> Distance:
+        if isinstance(distance_function, str):
+            distance_function = DistanceFunction.from_str(distance_function)
+
+        if distance_function in (DistanceFunction.L2, DistanceFunction.EUCLIDEAN):
+            return Distance.L2
+        elif distance_function == DistanceFunction.COSINE:
+            return Distance.COSINE
+        elif distance_function in (DistanceFunction.MAX_INNER_PRODUCT, DistanceFunction.DOT):
+            return Distance.IP
+        elif distance_function in (DistanceFunction.L1, DistanceFunction.MANHATTAN):
+            return Distance.L1
+        else:
+            d_ = [
+                "L2",
+                "EUCLIDEAN",
+                "COSINE",
+                "MAX_INNER_PRODUCT",
+                "DOT",
+                "L1",
+                "MANHATTAN",
+            ]
+            raise ValueError(f"distance function unavailable on local: {d_}")
+
+    def __len__(self) -> int:
+        return len(self.storage)
+
+    def __read_manifest(self) -> dict | None:
+        if self.path is None or not os.path.exists(os.path.join(self.path, MANIFEST_FILE)):
+            return None
+
+        with open(os.path.join(self.path, MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+
+        if manifest.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"unsupported local collection format: {manifest.get('format_version')}")
+        return manifest
+
+    def __open(self, manifest: dict) -> None:
+        if manifest["vector_size"] != self.vector_size:
+            raise ValueError(f"collection at {self.path} has vector_size {manifest['vector_size']}")
+        if manifest["distance"] != self.distance.value:
+            raise ValueError(f"collection at {self.path} uses distance {manifest['distance']}")
+
+        self.storage = VectorStorage.open(self.path, self.vector_size)
+
+        # the saved index structure is only reused by an index of the same type, others are rebuilt
+        state = None
+        if manifest["index"] == type(self.index).__name__:
+            state = {key: load_array(self.path, f"index.{key}") for key in manifest["index_state"]}
+        self.index.attach(self.storage, self.distance, state)
+
+        for field, metadata_type in manifest.get("metadata_indexes", {}).items():
+            self.__add_metadata_index(field, MetadataType(metadata_type))
+
+    def save(self, path: str | None = None) -> None:
+        """Persists the collection in `path` (defaults to the path it was opened from).
+
+        Embeddings, norms and index arrays are written as `.npy` files that are memory-mapped on open, so loading a
+        collection does not deserialize it and reads go through the OS page cache.
+        """
+        path = path or self.path or self.__raise_value_error("path")
+        os.makedirs(path, exist_ok=True)
+
+        with self.__lock:
+            self.storage.save(path)
+
+            state = self.index.state()
+            for key, array in state.items():
+                save_array(path, f"index.{key}", array)
+
+            manifest = {
+                "format_version": FORMAT_VERSION,
+                "vector_size": self.vector_size,
+                "distance": self.distance.value,
+                "distance_function": DistanceFunction.from_str(self.distance_function).value
+                if isinstance(self.distance_function, str)
+                else self.distance_function.value,
+                "count": self.storage.count,
+                "index": type(self.index).__name__,
+                "index_state": list(state),
+                "metadata_indexes": {field: index.type.value for field, index in self.metadata_indexes.items()},
+            }
+            # the manifest goes last, it is what makes the new files a collection
+            with open(os.path.join(path, MANIFEST_FILE + ".tmp"), "w") as f:
+                json.dump(manifest, f)
+            os.replace(os.path.join(path, MANIFEST_FILE + ".tmp"), os.path.join(path, MANIFEST_FILE))
+
+        self.path = path
+
+    def insert_vector(self, vector: Vector) -> None:
+        self.insert_vectors([vector])
+
+    def insert_vectors(self, vectors: list[Vector] | VectorBatch) -> None:
+        if len(vectors) == 0:
+            return
+
+        ids = vectors.ids if isinstance(vectors, VectorBatch) else [v.get_id() for v in vectors]
+        with self.__lock:
+            duplicates = [id_ for id_ in ids if self.storage.get_slot(id_) is not None]
+            if duplicates or len(set(ids)) != len(ids):
+                raise ValueError(f"vector already exists in database: {duplicates or ids}")
+
+            self.__append(ids, vectors)
+
+    def read_vector(self, id: str, include_embedding: bool = True, include_metadata: bool = True) -> Vector | None:
+        with self.__lock:
+            slot = self.storage.get_slot(id)
+
+            if slot is None:
+                return None
+
+            return self.__to_vector(slot, include_embedding, include_metadata)
+
+    def update_vector(self, vector: Vector) -> None:
+        self.update_vectors([vector])
+
+    def update_vectors(self, vectors: list[Vector] | VectorBatch) -> None:
+        if len(vectors) == 0:
+            return
+
+        ids = vectors.ids if isinstance(vectors, VectorBatch) else [v.id for v in vectors]
+        if len(set(ids)) != len(ids):
+            # each id maps to one live row, a repeated id would append a row no delete can reach
+            raise ValueError(f"vector ids repeated in update: {sorted({id_ for id_ in ids if ids.count(id_) > 1})}")
+
+        with self.__lock:
+            for id_ in ids:
+                if self.storage.get_slot(id_) is None:
+                    raise ValueError(f"vector {id_} not found in database")
+
+            # rows are immutable, the old row is tombstoned and the new one appended
+            self.__remove(ids)
+            self.__append(ids, vectors)
+            self.__maybe_compact()
+
+    def delete_vector(self, id: str) -> None:
+        self.delete_vectors([id])
+
+    def delete_vectors(self, ids: list[str] | list[Vector]) -> None:
+        if len(ids) == 0:
+            return
+
+        if isinstance(ids[0], Vector):
+            ids = [v.id for v in ids]
+
+        with self.__lock:
+            self.__remove(ids)
+            self.__maybe_compact()
+
+    def get_neighbor_vectors(
+        self,
+        vector: Vector,
+        n: int = 5,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[VectorDistance]:
+        return self.get_neighbor_results(
+            vector, n, filter, include_embedding=include_embedding, include_metadata=include_metadata, params=params
+        ).to_vector_distances()
+
+    def get_neighbor_results(
+        self,
+        vector: Vector,
+        n: int = 5,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> SearchResult:
+        return self.get_neighbor_results_batch([vector], n, filter, include_embedding, include_metadata, params)[0]
+
+    def get_neighbor_vectors_batch(
+        self,
+        vectors: list[Vector] | VectorBatch,
+        n: int = 5,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[list[VectorDistance]]:
+        results = self.get_neighbor_results_batch(
+            vectors, n, filter, include_embedding=include_embedding, include_metadata=include_metadata, params=params
+        )
+        return [result.to_vector_distances() for result in results]
+
+    def get_neighbor_results_batch(
+        self,
+        vectors: list[Vector] | VectorBatch,
+        n: int = 5,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[SearchResult]:
+        if len(vectors) == 0:
+            return []
+
+        if isinstance(vectors, VectorBatch):
+            queries = vectors.embeddings
+        else:
+            queries = np.stack([np.asarray(v.embedding, dtype=np.float32) for v in vectors])
+        if queries.shape[1] != self.vector_size:
+            raise ValueError(f"embedding size must be {self.vector_size}")
+
+        with self.__lock:
+            if filter is None and (params is None or not params.exact):
+                slots, distances = self.index.search(queries, n, params)
+            else:
+                slots, distances = self.__exact_search(queries, n, filter)
+
+            results = []
+            for row_slots, row_distances in zip(slots, distances, strict=True):
+                found = row_slots >= 0
+                row_slots = row_slots[found]
+                results.append(
+                    SearchResult(
+                        ids=[str(self.storage.ids[slot]) for slot in row_slots.tolist()],
+                        distances=row_distances[found],
+                        # fancy indexing copies the rows out of the storage
+                        embeddings=self.storage.embeddings[row_slots] if include_embedding else None,
+                        metadata=[self.storage.metadata[slot] for slot in row_slots.tolist()]
+                        if include_metadata
+                        else None,
+                    )
+                )
+            return results
+
+    def create_metadata_index(self, field: str, type: MetadataType | str) -> None:
+        """Indexes the values of the `field` metadata key, filters on it then only test the rows holding the
+        requested values. Persisted with the collection."""
+        if isinstance(type, str):
+            type = MetadataType.from_str(type)
+
+        with self.__lock:
+            self.__add_metadata_index(field, type)
+
+    def __add_metadata_index(self, field: str, type: MetadataType) -> None:
+        index = MetadataIndex(field, type)
+        index.rebuild(self.storage)
+        self.metadata_indexes[field] = index
+
+    def __exact_search(self, queries: np.ndarray, n: int, filter: Filter | None) -> tuple[np.ndarray, np.ndarray]:
+        # exact scan of the matching rows, an index traversal would have to skip the rows the filter rejects
+        candidates = np.flatnonzero(self.storage.alive[: self.storage.count])
+        if filter is not None:
+            # negated ranges become ranges the metadata indexes can narrow
+            filter = push_down_not(filter)
+            slots = candidate_slots(filter, self.metadata_indexes)
+            candidates = np.array(
+                [
+                    slot
+                    for slot in (sorted(slots) if slots is not None else candidates.tolist())
+                    if filter.matches(self.storage.metadata[slot])
+                ],
+                dtype=np.int64,
+            )
+
+        distances = pairwise_distances(
+            queries, self.storage.embeddings[candidates], self.storage.norms[candidates], self.distance
+        )
+        positions, distances = top_k(distances, n)
+        return candidates[positions], finalize_distances(distances, self.distance)
+
+    def __append(self, ids: list[str], vectors: list[Vector] | VectorBatch) -> None:
+        if not isinstance(vectors, VectorBatch):
+            vectors = VectorBatch.from_vectors(vectors)
+        slots = self.storage.append(ids, vectors.embeddings, vectors.metadata)
+        self.index.add(slots)
+        for metadata_index in self.metadata_indexes.values():
+            metadata_index.add(slots, vectors.metadata)
+
+    def __remove(self, ids: list[str]) -> None:
+        slots = self.storage.remove(ids)
+        self.index.remove(slots)
+        for metadata_index in self.metadata_indexes.values():
+            metadata_index.remove(slots)
+
+    def __maybe_compact(self) -> None:
+        if self.storage.dead > COMPACT_RATIO * self.storage.count:
+            self.storage.compact()
+            self.index.rebuild()
+            for metadata_index in self.metadata_indexes.values():
+                metadata_index.rebuild(self.storage)
+
+    def __to_vector(self, slot: int, include_embedding: bool = True, include_metadata: bool = True) -> Vector:
+        return Vector(
+            embedding=self.storage.embeddings[slot].copy() if include_embedding else None,
+            vector_id=str(self.storage.ids[slot]),
+            metadata=self.storage.metadata[slot] if include_metadata else None,
+        )
+
+
+__all__ = [
+    "NumpyVectorDB",
+    "Index",
+    "FlatIndex",
+    "HNSWIndex",
+    "IVFIndex",
+    "QuantizedIndex",
+    "Quantizer",
+    "ScalarQuantizer",
+    "BinaryQuantizer",
+    "ProductQuantizer",
+]
@@ -0,0 +1,130 @@
+import asyncio
+
+from pyvectordb.async_driver import AsyncVectorDB
+from pyvectordb.distance_function import DistanceFunction
+from pyvectordb.filter import Filter
+from pyvectordb.metadata_type import MetadataType
+from pyvectordb.search_params import SearchParams
+from pyvectordb.search_result import SearchResult
+from pyvectordb.vector import Vector
+from pyvectordb.vector_batch import VectorBatch
+from pyvectordb.vector_distance import VectorDistance
+
+from . import NumpyVectorDB
+from .index import Index
+
+
+class AsyncNumpyVectorDB(AsyncVectorDB):
+    """`NumpyVectorDB` behind the async interface.
+
+    There is no I/O to await, calls run in the default executor so searches (numpy releases the GIL) do not block the
+    event loop.
+    """
+
+    def __init__(
+        self,
+        vector_size: int = None,
+        distance_function: DistanceFunction | str = None,
+        index: Index | None = None,
+        path: str | None = None,
+        debug: bool = False,
+    ) -> None:
+        super().__init__(None, None, debug)
+
+        self.db = NumpyVectorDB(
+            vector_size=vector_size,
+            distance_function=distance_function,
+            index=index,
+            path=path,
+            debug=debug,
+        )
+
+    def __len__(self) -> int:
+        return len(self.db)
+
+    async def _connect(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    async def save(self, path: str | None = None) -> None:
+        await asyncio.to_thread(self.db.save, path)
+
+    async def insert_vector(self, vector: Vector) -> None:
+        await asyncio.to_thread(self.db.insert_vector, vector)
+
+    async def insert_vectors(self, vectors: list[Vector] | VectorBatch) -> None:
+        await asyncio.to_thread(self.db.insert_vectors, vectors)
+
+    async def read_vector(
+        self, id: str, include_embedding: bool = True, include_metadata: bool = True
+    ) -> Vector | None:
+        return await asyncio.to_thread(self.db.read_vector, id, include_embedding, include_metadata)
+
+    async def update_vector(self, vector: Vector) -> None:
+        await asyncio.to_thread(self.db.update_vector, vector)
+
+    async def update_vectors(self, vectors: list[Vector] | VectorBatch) -> None:
+        await asyncio.to_thread(self.db.update_vectors, vectors)
+
+    async def delete_vector(self, id: str) -> None:
+        await asyncio.to_thread(self.db.delete_vector, id)
+
+    async def delete_vectors(self, ids: list[str] | list[Vector]) -> None:
+        await asyncio.to_thread(self.db.delete_vectors, ids)
+
+    async def get_neighbor_vectors(
+        self,
+        vector: Vector,
+        n: int = 5,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[VectorDistance]:
+        return await asyncio.to_thread(
+            self.db.get_neighbor_vectors, vector, n, filter, include_embedding, include_metadata, params
+        )
+
+    async def get_neighbor_vectors_batch(
+        self,
+        vectors: list[Vector] | VectorBatch,
+        n: int = 5,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[list[VectorDistance]]:
+        return await asyncio.to_thread(
+            self.db.get_neighbor_vectors_batch, vectors, n, filter, include_embedding, include_metadata, params
+        )
+
+    async def get_neighbor_results(
+        self,
+        vector: Vector,
+        n: int = 5,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> SearchResult:
+        return await asyncio.to_thread(
+            self.db.get_neighbor_results, vector, n, filter, include_embedding, include_metadata, params
+        )
+
+    async def get_neighbor_results_batch(
+        self,
+        vectors: list[Vector] | VectorBatch,
+        n: int = 5,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[SearchResult]:
+        return await asyncio.to_thread(
+            self.db.get_neighbor_results_batch, vectors, n, filter, include_embedding, include_metadata, params
+        )
+
+    async def create_metadata_index(self, field: str, type: MetadataType | str) -> None:
+        await asyncio.to_thread(self.db.create_metadata_index, field, type)
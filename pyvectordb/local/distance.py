@@ -0,0 +1,89 @@
+from enum import Enum
+
+import numpy as np
+
+# upper bound of floats materialized at once when broadcasting l1 distances
+_L1_CHUNK_ELEMENTS = 1 << 24
+
+
+class Distance(Enum):
+    """Local distance metrics, smaller distance means closer vector"""
+
+    L2 = "l2"
+    COSINE = "cosine"
+    IP = "ip"
+    L1 = "l1"
+
+
+def row_norms(embeddings: np.ndarray) -> np.ndarray:
+    return np.sqrt(np.einsum("ij,ij->i", embeddings, embeddings, dtype=np.float32))
+
+
+def pairwise_distances(
+    queries: np.ndarray,
+    embeddings: np.ndarray,
+    norms: np.ndarray,
+    distance: Distance,
+    query_norms: np.ndarray | None = None,
+) -> np.ndarray:
+    """Distances between every query (q, d) and every embedding (m, d), returns (q, m) float32 matrix.
+
+    `norms` are the precomputed l2 norms of `embeddings` (and `query_norms` of `queries`, computed when omitted).
+    L2 distances are squared, use `finalize_distances` on the selected top-k only.
+    """
+    if distance == Distance.L1:
+        return _l1_distances(queries, embeddings)
+
+    products = queries @ embeddings.T
+
+    if distance == Distance.IP:
+        return np.negative(products, out=products)
+
+    if query_norms is None:
+        query_norms = row_norms(queries)
+
+    if distance == Distance.COSINE:
+        denominator = np.outer(query_norms, norms)
+        np.maximum(denominator, np.finfo(np.float32).tiny, out=denominator)
+        products /= denominator
+        return np.subtract(1.0, products, out=products)
+
+    # ||q - x||^2 = ||q||^2 - 2 q.x + ||x||^2
+    products *= -2.0
+    products += np.square(norms)[None, :]
+    products += np.square(query_norms)[:, None]
+    return np.maximum(products, 0.0, out=products)
+
+
+def finalize_distances(distances: np.ndarray, distance: Distance) -> np.ndarray:
+    if distance == Distance.L2:
+        return np.sqrt(distances)
+    return distances
+
+
+def top_k(distances: np.ndarray, n: int) -> tuple[np.ndarray, np.ndarray]:
+    """Per row indices and values of the `n` smallest distances, sorted ascending."""
+    n = min(n, distances.shape[1])
+    if n <= 0:
+        empty = np.empty((distances.shape[0], 0))
+        return empty.astype(np.int64), empty.astype(distances.dtype)
+
+    if n < distances.shape[1]:
+        candidates = np.argpartition(distances, n - 1, axis=1)[:, :n]
+    else:
+        candidates = np.broadcast_to(np.arange(distances.shape[1]), distances.shape)
+
+    candidate_distances = np.take_along_axis(distances, candidates, axis=1)
+    order = np.argsort(candidate_distances, axis=1, kind="stable")
+    return np.take_along_axis(candidates, order, axis=1), np.take_along_axis(candidate_distances, order, axis=1)
+
+
+def _l1_distances(queries: np.ndarray, embeddings: np.ndarray) -> np.ndarray:
+    result = np.empty((queries.shape[0], embeddings.shape[0]), dtype=np.float32)
+    step = max(1, _L1_CHUNK_ELEMENTS // max(1, queries.shape[0] * embeddings.shape[1]))
+
+    for start in range(0, embeddings.shape[0], step):
+        chunk = embeddings[start : start + step]
+        result[:, start : start + step] = np.abs(queries[:, None, :] - chunk[None, :, :]).sum(axis=2)
+
+    return result
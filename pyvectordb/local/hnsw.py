@@ -0,0 +1,282 @@
+import heapq
+import math
+
+import numpy as np
+
+from pyvectordb.search_params import SearchParams
+
+from .distance import finalize_distances, pairwise_distances, row_norms
+from .index import Index
+
+
+class HNSWIndex(Index):
+    """Hierarchical Navigable Small World graph (Malkov & Yashunin) over the storage rows.
+
+    `m` is the number of links per node on the upper layers (2 * m on the base layer), `ef_construction` the
+    candidate list size while linking a new node and `ef_search` the candidate list size at query time.
+    Deleted rows stay in the graph as waypoints until the storage is compacted, which rebuilds the graph.
+    """
+
+    def __init__(
+        self,
+        m: int = 16,
+        ef_construction: int = 200,
+        ef_search: int = 64,
+        seed: int | None = None,
+    ) -> None:
+        super().__init__()
+
+        if m < 2:
+            raise ValueError("m must be at least 2")
+
+        self.m = m
+        self.ef_construction = max(ef_construction, m)
+        self.ef_search = ef_search
+        self.seed = seed
+
+        self.__m0 = 2 * m
+        self.__level_mult = 1 / math.log(m)
+        self.__rng = np.random.default_rng(seed)
+        self.__reset()
+
+    def __reset(self) -> None:
+        # level of every slot, -1 when the slot is not linked in the graph
+        self.__levels = np.full(0, -1, dtype=np.int8)
+        # base layer links, -1 padded
+        self.__links0 = np.full((0, self.__m0), -1, dtype=np.int32)
+        self.__counts0 = np.zeros(0, dtype=np.int32)
+        # links of the layers above the base one, few nodes reach them so they are kept sparse
+        self.__upper: list[dict[int, list[int]]] = []
+
+        self.__entry = -1
+        self.__max_level = -1
+
+    def rebuild(self) -> None:
+        self.__reset()
+        self.add(self._alive_slots())
+
+    def state(self) -> dict[str, np.ndarray]:
+        # upper layers are flattened as (level, node) pairs with their links in one array, sliced by offsets
+        upper_levels, upper_nodes, upper_offsets, upper_links = [], [], [0], []
+        for level, layer in enumerate(self.__upper, start=1):
+            for node, links in layer.items():
+                upper_levels.append(level)
+                upper_nodes.append(node)
+                upper_links.extend(links)
+                upper_offsets.append(len(upper_links))
+
+        return {
+            "levels": self.__levels,
+            "links0": self.__links0,
+            "counts0": self.__counts0,
+            "upper_levels": np.asarray(upper_levels, dtype=np.int32),
+            "upper_nodes": np.asarray(upper_nodes, dtype=np.int64),
+            "upper_offsets": np.asarray(upper_offsets, dtype=np.int64),
+            "upper_links": np.asarray(upper_links, dtype=np.int64),
+            "entry": np.asarray([self.__entry, self.__max_level], dtype=np.int64),
+        }
+
+    def load_state(self, state: dict[str, np.ndarray]) -> None:
+        if "links0" not in state or state["links0"].shape[1] != self.__m0:
+            self.rebuild()
+            return
+
+        self.__levels = state["levels"]
+        self.__links0 = state["links0"]
+        self.__counts0 = state["counts0"]
+        self.__entry, self.__max_level = state["entry"].tolist()
+
+        self.__upper = [{} for _ in range(max(self.__max_level, 0))]
+        offsets = state["upper_offsets"].tolist()
+        links = state["upper_links"].tolist()
+        for i, (level, node) in enumerate(
+            zip(state["upper_levels"].tolist(), state["upper_nodes"].tolist(), strict=True)
+        ):
+            self.__upper[level - 1][node] = links[offsets[i] : offsets[i + 1]]
+
+    def add(self, slots: np.ndarray) -> None:
+        if len(slots) == 0:
+            return
+
+        self.__reserve(int(np.max(slots)) + 1)
+        for slot in slots.tolist():
+            self.__insert(slot)
+
+    def search(self, queries: np.ndarray, n: int, params: SearchParams | None = None) -> tuple[np.ndarray, np.ndarray]:
+        ef = max(params.ef if params is not None and params.ef else self.ef_search, n)
+        rows = []
+
+        for query in queries:
+            if self.__entry < 0:
+                rows.append((np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)))
+                continue
+
+            slots, distances = self.__search_layers(query, ef, 0)
+            keep = self.storage.alive[slots]
+            rows.append((slots[keep], finalize_distances(distances[keep], self.distance)))
+
+        return self._pad(rows, n)
+
+    def __insert(self, slot: int) -> None:
+        level = int(-math.log(1.0 - self.__rng.random()) * self.__level_mult)
+        self.__levels[slot] = level
+        while len(self.__upper) < level:
+            self.__upper.append({})
+        for lc in range(1, level + 1):
+            self.__upper[lc - 1][slot] = []
+
+        if self.__entry < 0:
+            self.__entry, self.__max_level = slot, level
+            return
+
+        query = self.storage.embeddings[slot]
+        entries, entry_distances = self.__search_layers(query, 1, level + 1)
+
+        for lc in range(min(level, self.__max_level), -1, -1):
+            candidates, candidate_distances = self.__search_layer(
+                query, entries, entry_distances, self.ef_construction, lc
+            )
+            max_links = self.__m0 if lc == 0 else self.m
+            neighbors = self.__select_neighbors(candidates, candidate_distances, max_links)
+
+            self.__set_links(slot, lc, neighbors)
+            for neighbor in neighbors.tolist():
+                self.__link(neighbor, slot, lc, max_links)
+
+            entries, entry_distances = candidates, candidate_distances
+
+        if level > self.__max_level:
+            self.__entry, self.__max_level = slot, level
+
+    def __search_layers(self, query: np.ndarray, ef: int, stop_level: int) -> tuple[np.ndarray, np.ndarray]:
+        """Greedy descent from the entry point down to `stop_level`, then a beam search of width `ef` there."""
+        entries = np.asarray([self.__entry], dtype=np.int64)
+        entry_distances = self.__distances(query, entries)
+
+        for lc in range(self.__max_level, stop_level, -1):
+            entries, entry_distances = self.__search_layer(query, entries, entry_distances, 1, lc)
+
+        if stop_level > self.__max_level:
+            return entries, entry_distances
+
+        return self.__search_layer(query, entries, entry_distances, ef, stop_level)
+
+    def __search_layer(
+        self,
+        query: np.ndarray,
+        entries: np.ndarray,
+        entry_distances: np.ndarray,
+        ef: int,
+        level: int,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        query_norm = row_norms(query.reshape(1, -1))
+        visited = np.zeros(self.storage.count, dtype=bool)
+        visited[entries] = True
+
+        candidates = list(zip(entry_distances.tolist(), entries.tolist(), strict=True))
+        heapq.heapify(candidates)
+        results = [(-d, s) for d, s in candidates]
+        heapq.heapify(results)
+        while len(results) > ef:
+            heapq.heappop(results)
+
+        while candidates:
+            distance, node = heapq.heappop(candidates)
+            if distance > -results[0][0]:
+                break
+
+            neighbors = self.__neighbors(node, level)
+            neighbors = neighbors[~visited[neighbors]]
+            if len(neighbors) == 0:
+                continue
+            visited[neighbors] = True
+
+            furthest = -results[0][0]
+            distances = self.__distances(query, neighbors, query_norm)
+            for d, neighbor in zip(distances.tolist(), neighbors.tolist(), strict=True):
+                if len(results) < ef or d < furthest:
+                    heapq.heappush(candidates, (d, neighbor))
+                    heapq.heappush(results, (-d, neighbor))
+                    if len(results) > ef:
+                        heapq.heappop(results)
+                    furthest = -results[0][0]
+
+        results.sort(reverse=True)
+        slots = np.fromiter((s for _, s in results), dtype=np.int64, count=len(results))
+        distances = np.fromiter((-d for d, _ in results), dtype=np.float32, count=len(results))
+        return slots, distances
+
+    def __select_neighbors(self, candidates: np.ndarray, distances: np.ndarray, m: int) -> np.ndarray:
+        """Neighbor selection heuristic, prefers candidates closer to the base than to already selected ones."""
+        if len(candidates) <= m:
+            return candidates
+
+        embeddings = self.storage.embeddings[candidates]
+        norms = self.storage.norms[candidates]
+        between = pairwise_distances(embeddings, embeddings, norms, self.distance, norms)
+
+        # distance of every candidate to its closest already selected neighbor
+        closest = np.full(len(candidates), np.inf, dtype=np.float32)
+        selected: list[int] = []
+        pruned: list[int] = []
+        for i, distance in enumerate(distances.tolist()):
+            if closest[i] > distance:
+                selected.append(i)
+                if len(selected) == m:
+                    break
+                np.minimum(closest, between[i], out=closest)
+            else:
+                pruned.append(i)
+
+        # keep the pruned connections to fill up the link list, helps on clustered data
+        selected.extend(pruned[: m - len(selected)])
+        return candidates[selected]
+
+    def __link(self, node: int, new: int, level: int, max_links: int) -> None:
+        links = self.__neighbors(node, level)
+        if len(links) < max_links:
+            self.__set_links(node, level, np.append(links, new))
+            return
+
+        links = np.append(links, new)
+        distances = self.__distances(self.storage.embeddings[node], links)
+        order = np.argsort(distances, kind="stable")
+        self.__set_links(node, level, self.__select_neighbors(links[order], distances[order], max_links))
+
+    def __neighbors(self, node: int, level: int) -> np.ndarray:
+        if level == 0:
+            return self.__links0[node, : self.__counts0[node]].astype(np.int64)
+        return np.asarray(self.__upper[level - 1][node], dtype=np.int64)
+
+    def __set_links(self, node: int, level: int, links: np.ndarray) -> None:
+        if level == 0:
+            self.__links0[node, : len(links)] = links
+            self.__links0[node, len(links) :] = -1
+            self.__counts0[node] = len(links)
+        else:
+            self.__upper[level - 1][node] = links.tolist()
+
+    def __distances(self, query: np.ndarray, slots: np.ndarray, query_norm: np.ndarray | None = None) -> np.ndarray:
+        return pairwise_distances(
+            query.reshape(1, -1),
+            self.storage.embeddings[slots],
+            self.storage.norms[slots],
+            self.distance,
+            query_norm,
+        )[0]
+
+    def __reserve(self, size: int) -> None:
+        capacity = len(self.__levels)
+        if size <= capacity:
+            return
+
+        capacity = max(size, capacity * 2)
+
+        levels = np.full(capacity, -1, dtype=np.int8)
+        levels[: len(self.__levels)] = self.__levels
+        links0 = np.full((capacity, self.__m0), -1, dtype=np.int32)
+        links0[: len(self.__links0)] = self.__links0
+        counts0 = np.zeros(capacity, dtype=np.int32)
+        counts0[: len(self.__counts0)] = self.__counts0
+
+        self.__levels, self.__links0, self.__counts0 = levels, links0, counts0
@@ -0,0 +1,90 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from pyvectordb.search_params import SearchParams
+
+from .distance import Distance, finalize_distances, pairwise_distances, top_k
+from .storage import VectorStorage
+
+
+class Index(ABC):
+    """Search structure over the rows of a `VectorStorage`.
+
+    Indexes address vectors by storage slot. Tombstoned slots may still be referenced by the index,
+    `search` must skip them. `search` returns (q, n) slots and final distances, padded with -1 / inf, the search time
+    settings of `params` it has an equivalent for override the index settings for that call.
+    `state` exposes the built structure as named arrays so it can be saved next to the storage and reloaded
+    (memory-mapped) with `attach` instead of being rebuilt.
+    """
+
+    def __init__(self) -> None:
+        self.storage: VectorStorage = None
+        self.distance: Distance = None
+
+    def attach(self, storage: VectorStorage, distance: Distance, state: dict[str, np.ndarray] | None = None) -> None:
+        self.storage = storage
+        self.distance = distance
+
+        if state is None:
+            self.rebuild()
+        else:
+            self.load_state(state)
+
+    def state(self) -> dict[str, np.ndarray]:
+        return {}
+
+    def load_state(self, state: dict[str, np.ndarray]) -> None:
+        self.rebuild()
+
+    @abstractmethod
+    def add(self, slots: np.ndarray) -> None: ...
+
+    def remove(self, slots: np.ndarray) -> None:
+        pass
+
+    @abstractmethod
+    def search(
+        self, queries: np.ndarray, n: int, params: SearchParams | None = None
+    ) -> tuple[np.ndarray, np.ndarray]: ...
+
+    @abstractmethod
+    def rebuild(self) -> None: ...
+
+    def _alive_slots(self) -> np.ndarray:
+        return np.flatnonzero(self.storage.alive[: self.storage.count])
+
+    @staticmethod
+    def _pad(rows: list[tuple[np.ndarray, np.ndarray]], n: int) -> tuple[np.ndarray, np.ndarray]:
+        slots = np.full((len(rows), n), -1, dtype=np.int64)
+        distances = np.full((len(rows), n), np.inf, dtype=np.float32)
+
+        for i, (row_slots, row_distances) in enumerate(rows):
+            k = min(len(row_slots), n)
+            slots[i, :k] = row_slots[:k]
+            distances[i, :k] = row_distances[:k]
+
+        return slots, distances
+
+
+class FlatIndex(Index):
+    """Exact search, every query is scanned against the whole embedding matrix."""
+
+    def add(self, slots: np.ndarray) -> None:
+        pass
+
+    def rebuild(self) -> None:
+        pass
+
+    def search(self, queries: np.ndarray, n: int, params: SearchParams | None = None) -> tuple[np.ndarray, np.ndarray]:
+        count = self.storage.count
+        distances = pairwise_distances(
+            queries,
+            self.storage.embeddings[:count],
+            self.storage.norms[:count],
+            self.distance,
+        )
+        distances[:, ~self.storage.alive[:count]] = np.inf
+
+        slots, distances = top_k(distances, min(n, len(self.storage)))
+        return slots, finalize_distances(distances, self.distance)
@@ -0,0 +1,163 @@
+import numpy as np
+
+from pyvectordb.search_params import SearchParams
+
+from .distance import Distance, finalize_distances, pairwise_distances, row_norms, top_k
+from .index import Index
+from .kmeans import assign, kmeans
+
+
+class IVFIndex(Index):
+    """Inverted file index with a k-means coarse quantizer (IVF-Flat).
+
+    Vectors are assigned to the closest of `nlist` centroids and queries scan only the `nprobe` closest lists.
+    The quantizer is trained once the collection holds `nlist * min_points_per_list` vectors (exact search is used
+    until then) and retrained when the collection grew by `retrain_ratio` since the last training.
+    """
+
+    def __init__(
+        self,
+        nlist: int = 100,
+        nprobe: int = 8,
+        min_points_per_list: int = 39,
+        retrain_ratio: float | None = 1.0,
+        seed: int | None = None,
+    ) -> None:
+        super().__init__()
+
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.min_points_per_list = min_points_per_list
+        self.retrain_ratio = retrain_ratio
+        self.seed = seed
+
+        self.centroids: np.ndarray | None = None
+        self.__trained_size = 0
+        self.__reset_lists()
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def __reset_lists(self) -> None:
+        # a list is kept as python list while written and as array for search, either one may be missing
+        self.__lists: list[list[int] | None] = [[] for _ in range(self.nlist)]
+        self.__arrays: list[np.ndarray | None] = [None] * self.nlist
+
+    def train(self) -> None:
+        slots = self._alive_slots()
+        if len(slots) < self.nlist:
+            raise ValueError(f"ivf index needs at least {self.nlist} vectors to train, got {len(slots)}")
+
+        self.centroids = kmeans(self.__coarse_embeddings(slots), self.nlist, seed=self.seed)
+        self.__centroid_norms = row_norms(self.centroids)
+        self.__trained_size = len(slots)
+
+        self.__reset_lists()
+        self.__assign(slots)
+
+    def state(self) -> dict[str, np.ndarray]:
+        if not self.is_trained:
+            return {}
+
+        lists = [self.__list_array(i) for i in range(self.nlist)]
+        return {
+            "centroids": self.centroids,
+            "list_offsets": np.cumsum([0] + [len(slots) for slots in lists]),
+            "list_slots": np.concatenate(lists),
+            "trained_size": np.asarray([self.__trained_size]),
+        }
+
+    def load_state(self, state: dict[str, np.ndarray]) -> None:
+        if "centroids" not in state or len(state["centroids"]) != self.nlist:
+            self.rebuild()
+            return
+
+        self.centroids = state["centroids"]
+        self.__centroid_norms = row_norms(self.centroids)
+        self.__trained_size = int(state["trained_size"][0])
+
+        offsets = state["list_offsets"]
+        self.__lists = [None] * self.nlist
+        self.__arrays = [state["list_slots"][offsets[i] : offsets[i + 1]] for i in range(self.nlist)]
+
+    def rebuild(self) -> None:
+        self.__reset_lists()
+        if self.is_trained:
+            self.__assign(self._alive_slots())
+        else:
+            self.__maybe_train()
+
+    def add(self, slots: np.ndarray) -> None:
+        if len(slots) == 0:
+            return
+
+        if self.is_trained:
+            self.__assign(slots)
+        self.__maybe_train()
+
+    def search(self, queries: np.ndarray, n: int, params: SearchParams | None = None) -> tuple[np.ndarray, np.ndarray]:
+        if not self.is_trained:
+            return self.__scan(queries, self._alive_slots(), n)
+
+        probes = self.__probe(queries, params.nprobe if params is not None and params.nprobe else self.nprobe)
+        rows = []
+        for query, lists in zip(queries, probes, strict=True):
+            candidates = [self.__list_array(i) for i in lists]
+            slots, distances = self.__scan(query.reshape(1, -1), np.concatenate(candidates), n)
+            keep = slots[0] >= 0
+            rows.append((slots[0][keep], distances[0][keep]))
+
+        return self._pad(rows, n)
+
+    def __maybe_train(self) -> None:
+        size = len(self.storage)
+        if not self.is_trained:
+            if size >= self.nlist * self.min_points_per_list:
+                self.train()
+        elif self.retrain_ratio is not None and size >= self.__trained_size * (1 + self.retrain_ratio):
+            self.train()
+
+    def __probe(self, queries: np.ndarray, nprobe: int) -> np.ndarray:
+        distances = pairwise_distances(queries, self.centroids, self.__centroid_norms, self.__coarse_distance())
+        lists, _ = top_k(distances, nprobe)
+        return lists
+
+    def __scan(self, queries: np.ndarray, slots: np.ndarray, n: int) -> tuple[np.ndarray, np.ndarray]:
+        slots = slots[self.storage.alive[slots]]
+        distances = pairwise_distances(
+            queries, self.storage.embeddings[slots], self.storage.norms[slots], self.distance
+        )
+
+        positions, distances = top_k(distances, n)
+        rows = [
+            (slots[row_positions], finalize_distances(row_distances, self.distance))
+            for row_positions, row_distances in zip(positions, distances, strict=True)
+        ]
+        return self._pad(rows, n)
+
+    def __assign(self, slots: np.ndarray) -> None:
+        labels = assign(self.__coarse_embeddings(slots), self.centroids, self.__coarse_distance())
+        for slot, label in zip(slots.tolist(), labels.tolist(), strict=True):
+            if self.__lists[label] is None:
+                self.__lists[label] = self.__arrays[label].tolist()
+            self.__lists[label].append(slot)
+            self.__arrays[label] = None
+
+    def __list_array(self, i: int) -> np.ndarray:
+        if self.__arrays[i] is None:
+            self.__arrays[i] = np.asarray(self.__lists[i], dtype=np.int64)
+        return self.__arrays[i]
+
+    def __coarse_distance(self) -> Distance:
+        # centroids are trained with l2 k-means, cosine and inner product collections are probed with their own metric
+        if self.distance in (Distance.COSINE, Distance.IP):
+            return self.distance
+        return Distance.L2
+
+    def __coarse_embeddings(self, slots: np.ndarray) -> np.ndarray:
+        embeddings = self.storage.embeddings[slots]
+        if self.distance == Distance.COSINE:
+            norms = np.maximum(self.storage.norms[slots], np.finfo(np.float32).tiny)
+            embeddings = embeddings / norms[:, None]
+        return embeddings
@@ -0,0 +1,61 @@
+import numpy as np
+
+from .distance import Distance, pairwise_distances, row_norms
+
+# upper bound of distances materialized at once while assigning points to centroids
+_ASSIGN_CHUNK_ELEMENTS = 1 << 24
+
+
+def kmeans(
+    data: np.ndarray,
+    k: int,
+    iterations: int = 20,
+    seed: int | None = None,
+    max_points_per_centroid: int = 256,
+) -> np.ndarray:
+    """Lloyd's k-means with l2 distance, returns (k, d) float32 centroids.
+
+    Training is done on a random sample of at most `k * max_points_per_centroid` points.
+    """
+    rng = np.random.default_rng(seed)
+    data = np.asarray(data, dtype=np.float32)
+
+    if len(data) < k:
+        raise ValueError(f"k-means needs at least {k} points, got {len(data)}")
+
+    if len(data) > k * max_points_per_centroid:
+        data = data[rng.choice(len(data), k * max_points_per_centroid, replace=False)]
+
+    centroids = data[rng.choice(len(data), k, replace=False)].copy()
+
+    for _ in range(iterations):
+        labels = assign(data, centroids, Distance.L2)
+
+        counts = np.bincount(labels, minlength=k)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, data)
+
+        empty = counts == 0
+        centroids[~empty] = sums[~empty] / counts[~empty, None]
+
+        # re-seed empty clusters with points of the largest ones
+        if empty.any():
+            largest = np.argsort(counts)[::-1][: int(empty.sum())]
+            for target, source in zip(np.flatnonzero(empty), largest, strict=True):
+                members = np.flatnonzero(labels == source)
+                centroids[target] = data[rng.choice(members)] + rng.normal(0, 1e-4, data.shape[1])
+
+    return centroids
+
+
+def assign(data: np.ndarray, centroids: np.ndarray, distance: Distance) -> np.ndarray:
+    """Index of the closest centroid for every row of `data`."""
+    labels = np.empty(len(data), dtype=np.int64)
+    centroid_norms = row_norms(centroids)
+    step = max(1, _ASSIGN_CHUNK_ELEMENTS // max(1, len(centroids)))
+
+    for start in range(0, len(data), step):
+        distances = pairwise_distances(data[start : start + step], centroids, centroid_norms, distance)
+        labels[start : start + step] = np.argmin(distances, axis=1)
+
+    return labels
@@ -0,0 +1,88 @@
+from typing import Any
+
+import numpy as np
+
+from pyvectordb.filter import And, Eq, Filter, In, Or, Range
+from pyvectordb.metadata_type import MetadataType
+
+from .storage import VectorStorage
+
+
+class MetadataIndex:
+    """Inverted index of one metadata key, every value maps to the alive slots holding it.
+
+    Filtered searches on the key only test the rows of the matching values instead of the metadata of every row.
+    Unhashable values (lists, objects) are kept aside and are always candidates.
+    """
+
+    def __init__(self, field: str, type: MetadataType) -> None:
+        self.field = field
+        self.type = type
+
+        self.postings: dict[Any, set[int]] = {}
+        self.unhashable: set[int] = set()
+        self.values: dict[int, Any] = {}
+
+    def add(self, slots: np.ndarray, metadata: list[dict | None]) -> None:
+        for slot, metadata_ in zip(slots.tolist(), metadata, strict=True):
+            if metadata_ is None or self.field not in metadata_:
+                continue
+
+            value = metadata_[self.field]
+            try:
+                self.postings.setdefault(value, set()).add(slot)
+            except TypeError:
+                self.unhashable.add(slot)
+                continue
+            self.values[slot] = value
+
+    def remove(self, slots: np.ndarray) -> None:
+        for slot in slots.tolist():
+            self.unhashable.discard(slot)
+            if slot not in self.values:
+                continue
+
+            value = self.values.pop(slot)
+            self.postings[value].discard(slot)
+            if not self.postings[value]:
+                del self.postings[value]
+
+    def rebuild(self, storage: VectorStorage) -> None:
+        self.postings, self.unhashable, self.values = {}, set(), {}
+
+        alive = np.flatnonzero(storage.alive[: storage.count])
+        self.add(alive, [storage.metadata[slot] for slot in alive.tolist()])
+
+    def lookup(self, filter: Eq | In | Range) -> set[int]:
+        """Slots that may match the condition on this key."""
+        if isinstance(filter, Range):
+            values = [value for value in self.postings if filter.matches({self.field: value})]
+        else:
+            values = [filter.value] if isinstance(filter, Eq) else filter.values
+
+        slots = set(self.unhashable)
+        for value in values:
+            try:
+                slots.update(self.postings.get(value, ()))
+            except TypeError:
+                # only equal to the unhashable values already included
+                pass
+        return slots
+
+
+def candidate_slots(filter: Filter, indexes: dict[str, MetadataIndex]) -> set[int] | None:
+    """Superset of the slots matching `filter` from the metadata indexes, None when no index narrows it."""
+    if isinstance(filter, Eq | In | Range):
+        index = indexes.get(filter.key)
+        return None if index is None else index.lookup(filter)
+
+    if isinstance(filter, And):
+        narrowed = [slots for slots in (candidate_slots(f, indexes) for f in filter.filters) if slots is not None]
+        return set.intersection(*narrowed) if narrowed else None
+
+    if isinstance(filter, Or):
+        narrowed = [candidate_slots(f, indexes) for f in filter.filters]
+        return None if any(slots is None for slots in narrowed) else set().union(*narrowed)
+
+    # a negation matches everything outside of the indexed values
+    return None
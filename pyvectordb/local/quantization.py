@@ -0,0 +1,353 @@
+import math
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from pyvectordb.search_params import SearchParams
+
+from .distance import Distance, finalize_distances, pairwise_distances, row_norms, top_k
+from .index import FlatIndex, Index
+from .kmeans import assign, kmeans
+from .storage import VectorStorage
+
+# number of codes scored at once, bounds the decoded block and the distance matrix
+_SCAN_BLOCK = 1 << 16
+
+
+class Quantizer(ABC):
+    """Compresses float32 embeddings to uint8 codes and scores queries against the codes (asymmetric distance)."""
+
+    code_size: int
+
+    def __init__(self) -> None:
+        self.vector_size: int = None
+
+    @property
+    @abstractmethod
+    def is_trained(self) -> bool: ...
+
+    @abstractmethod
+    def train(self, embeddings: np.ndarray) -> None: ...
+
+    @abstractmethod
+    def encode(self, embeddings: np.ndarray) -> np.ndarray: ...
+
+    @abstractmethod
+    def decode(self, codes: np.ndarray) -> np.ndarray: ...
+
+    @abstractmethod
+    def state(self) -> dict[str, np.ndarray]: ...
+
+    @abstractmethod
+    def load_state(self, state: dict[str, np.ndarray]) -> None: ...
+
+    def distances(self, queries: np.ndarray, codes: np.ndarray, norms: np.ndarray, distance: Distance) -> np.ndarray:
+        """Distances between full precision queries and reconstructed codes, `norms` are the reconstruction norms."""
+        return pairwise_distances(queries, self.decode(codes), norms, distance)
+
+
+class ScalarQuantizer(Quantizer):
+    """8-bit scalar quantization, every dimension is mapped linearly on its trained [min, max] range (4x smaller)."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.minimum: np.ndarray | None = None
+        self.scale: np.ndarray | None = None
+
+    @property
+    def is_trained(self) -> bool:
+        return self.minimum is not None
+
+    def train(self, embeddings: np.ndarray) -> None:
+        self.vector_size = embeddings.shape[1]
+        self.code_size = self.vector_size
+
+        self.minimum = embeddings.min(axis=0)
+        self.scale = (embeddings.max(axis=0) - self.minimum) / 255.0
+        self.scale[self.scale == 0] = 1.0
+
+    def encode(self, embeddings: np.ndarray) -> np.ndarray:
+        codes = np.rint((embeddings - self.minimum) / self.scale)
+        return np.clip(codes, 0, 255).astype(np.uint8)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        return (codes * self.scale + self.minimum).astype(np.float32)
+
+    def state(self) -> dict[str, np.ndarray]:
+        return {"minimum": self.minimum, "scale": self.scale}
+
+    def load_state(self, state: dict[str, np.ndarray]) -> None:
+        self.minimum, self.scale = state["minimum"], state["scale"]
+        self.vector_size = self.code_size = len(self.minimum)
+
+
+class BinaryQuantizer(Quantizer):
+    """1-bit quantization, every dimension keeps only its side of the trained mean (32x smaller)."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.center: np.ndarray | None = None
+        self.spread: np.ndarray | None = None
+
+    @property
+    def is_trained(self) -> bool:
+        return self.center is not None
+
+    def train(self, embeddings: np.ndarray) -> None:
+        self.vector_size = embeddings.shape[1]
+        self.code_size = (self.vector_size + 7) // 8
+
+        self.center = embeddings.mean(axis=0)
+        self.spread = np.abs(embeddings - self.center).mean(axis=0)
+
+    def encode(self, embeddings: np.ndarray) -> np.ndarray:
+        return np.packbits(embeddings > self.center, axis=1)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        signs = np.unpackbits(codes, axis=1, count=self.vector_size).astype(np.float32) * 2.0 - 1.0
+        return signs * self.spread + self.center
+
+    def state(self) -> dict[str, np.ndarray]:
+        return {"center": self.center, "spread": self.spread}
+
+    def load_state(self, state: dict[str, np.ndarray]) -> None:
+        self.center, self.spread = state["center"], state["spread"]
+        self.vector_size = len(self.center)
+        self.code_size = (self.vector_size + 7) // 8
+
+
+class ProductQuantizer(Quantizer):
+    """Product quantization, the vector is split into `m` sub-vectors each encoded by a 256 centroids codebook.
+
+    Codes take `m` bytes, distances are computed with per query lookup tables.
+    """
+
+    ksub = 256
+
+    def __init__(self, m: int = 8, seed: int | None = None) -> None:
+        super().__init__()
+        self.m = m
+        self.code_size = m
+        self.seed = seed
+        self.codebooks: np.ndarray | None = None
+
+    @property
+    def is_trained(self) -> bool:
+        return self.codebooks is not None
+
+    def train(self, embeddings: np.ndarray) -> None:
+        if embeddings.shape[1] % self.m != 0:
+            raise ValueError(f"vector size {embeddings.shape[1]} is not divisible by m={self.m}")
+
+        self.vector_size = embeddings.shape[1]
+        self.codebooks = np.stack(
+            [kmeans(sub, self.ksub, seed=self.seed) for sub in self.__split(embeddings)],
+        )
+
+    def encode(self, embeddings: np.ndarray) -> np.ndarray:
+        codes = [
+            assign(sub, codebook, Distance.L2)
+            for sub, codebook in zip(self.__split(embeddings), self.codebooks, strict=True)
+        ]
+        return np.stack(codes, axis=1).astype(np.uint8)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        return self.codebooks[np.arange(self.m), codes].reshape(len(codes), self.vector_size)
+
+    def state(self) -> dict[str, np.ndarray]:
+        return {"codebooks": self.codebooks}
+
+    def load_state(self, state: dict[str, np.ndarray]) -> None:
+        self.codebooks = state["codebooks"]
+        self.m = self.code_size = len(self.codebooks)
+        self.vector_size = self.m * self.codebooks.shape[2]
+
+    def distances(self, queries: np.ndarray, codes: np.ndarray, norms: np.ndarray, distance: Distance) -> np.ndarray:
+        result = np.empty((len(queries), len(codes)), dtype=np.float32)
+        subspaces = np.arange(self.m)
+
+        for i, query in enumerate(queries):
+            tables = self.__tables(query, Distance.IP if distance == Distance.COSINE else distance)
+            result[i] = tables[subspaces, codes].sum(axis=1)
+
+        if distance == Distance.COSINE:
+            # tables hold negated partial dot products
+            denominator = np.outer(row_norms(queries), norms)
+            np.maximum(denominator, np.finfo(np.float32).tiny, out=denominator)
+            result = 1.0 + result / denominator
+
+        return result
+
+    def __tables(self, query: np.ndarray, distance: Distance) -> np.ndarray:
+        """(m, ksub) partial distances between every query sub-vector and its codebook."""
+        sub_queries = query.reshape(self.m, 1, -1)
+
+        if distance == Distance.IP:
+            return -np.einsum("mkd,mld->mk", self.codebooks, sub_queries)
+        if distance == Distance.L1:
+            return np.abs(self.codebooks - sub_queries).sum(axis=2)
+        return np.square(self.codebooks - sub_queries).sum(axis=2)
+
+    def __split(self, embeddings: np.ndarray) -> list[np.ndarray]:
+        return np.split(np.asarray(embeddings, dtype=np.float32), self.m, axis=1)
+
+
+class QuantizedIndex(Index):
+    """Scans quantized codes instead of the float32 matrix, optionally re-ranking with full precision vectors.
+
+    The quantizer is trained once `train_size` vectors are stored, exact search is used until then. With `rescore`
+    set, the `n * rescore` best candidates by approximate distance are re-ranked using the stored embeddings.
+    """
+
+    def __init__(self, quantizer: Quantizer, rescore: int | None = 4, train_size: int = 10_000) -> None:
+        super().__init__()
+
+        # training runs on insert, after the rows are stored, so it must not fail for lack of points
+        if isinstance(quantizer, ProductQuantizer) and train_size < quantizer.ksub:
+            raise ValueError(f"train_size of a product quantizer must be at least {quantizer.ksub}")
+
+        self.quantizer = quantizer
+        self.rescore = rescore
+        self.train_size = train_size
+
+        self.codes: np.ndarray | None = None
+        self.code_norms: np.ndarray | None = None
+        self.__flat = FlatIndex()
+
+    def attach(self, storage: VectorStorage, distance: Distance, state: dict[str, np.ndarray] | None = None) -> None:
+        self.__flat.attach(storage, distance)
+        super().attach(storage, distance, state)
+
+    def train(self) -> None:
+        slots = self._alive_slots()
+        if len(slots) == 0:
+            raise ValueError("quantizer needs at least one vector to train")
+
+        sample = slots
+        if len(slots) > self.train_size:
+            sample = np.random.default_rng(0).choice(slots, self.train_size, replace=False)
+
+        self.quantizer.train(self.storage.embeddings[sample])
+        self.codes = np.zeros((len(self.storage.alive), self.quantizer.code_size), dtype=np.uint8)
+        self.code_norms = np.zeros(len(self.storage.alive), dtype=np.float32)
+        self.__encode(slots)
+
+    def state(self) -> dict[str, np.ndarray]:
+        if not self.quantizer.is_trained:
+            return {}
+
+        state = {f"{self.__quantizer_prefix()}{key}": value for key, value in self.quantizer.state().items()}
+        state["codes"] = self.codes[: self.storage.count]
+        state["code_norms"] = self.code_norms[: self.storage.count]
+        return state
+
+    def load_state(self, state: dict[str, np.ndarray]) -> None:
+        prefix = self.__quantizer_prefix()
+        quantizer_state = {key[len(prefix) :]: value for key, value in state.items() if key.startswith(prefix)}
+        if "codes" not in state or not quantizer_state:
+            self.rebuild()
+            return
+
+        self.quantizer.load_state(quantizer_state)
+        self.codes = state["codes"]
+        self.code_norms = state["code_norms"]
+
+    def rebuild(self) -> None:
+        if self.quantizer.is_trained:
+            self.__encode(self._alive_slots())
+        elif len(self.storage) >= self.train_size:
+            self.train()
+
+    def add(self, slots: np.ndarray) -> None:
+        if len(slots) == 0:
+            return
+
+        if self.quantizer.is_trained:
+            self.__encode(slots)
+        elif len(self.storage) >= self.train_size:
+            self.train()
+
+    def search(self, queries: np.ndarray, n: int, params: SearchParams | None = None) -> tuple[np.ndarray, np.ndarray]:
+        if not self.quantizer.is_trained:
+            return self.__flat.search(queries, n)
+
+        rescore = self.__rescore(params)
+        candidates = n * rescore if rescore else n
+        slots, distances = self.__scan(queries, candidates)
+
+        if not rescore:
+            return slots, finalize_distances(distances, self.distance)
+
+        rows = []
+        for query, row_slots in zip(queries, slots, strict=True):
+            row_slots = row_slots[row_slots >= 0]
+            exact = pairwise_distances(
+                query.reshape(1, -1),
+                self.storage.embeddings[row_slots],
+                self.storage.norms[row_slots],
+                self.distance,
+            )
+            positions, exact = top_k(exact, n)
+            rows.append((row_slots[positions[0]], finalize_distances(exact[0], self.distance)))
+
+        return self._pad(rows, n)
+
+    def __rescore(self, params: SearchParams | None) -> int | None:
+        # rescore=False turns re-ranking off, oversampling overrides the candidate multiplier
+        if params is None:
+            return self.rescore
+        if params.rescore is False:
+            return None
+        if params.oversampling is not None:
+            return math.ceil(params.oversampling)
+        if params.rescore and not self.rescore:
+            return 1
+        return self.rescore
+
+    def __scan(self, queries: np.ndarray, n: int) -> tuple[np.ndarray, np.ndarray]:
+        """Approximate top `n` over all codes, scored block by block to bound memory."""
+        best_slots = np.empty((len(queries), 0), dtype=np.int64)
+        best_distances = np.empty((len(queries), 0), dtype=np.float32)
+
+        for start in range(0, self.storage.count, _SCAN_BLOCK):
+            end = min(start + _SCAN_BLOCK, self.storage.count)
+            distances = self.quantizer.distances(
+                queries, self.codes[start:end], self.code_norms[start:end], self.distance
+            )
+            distances[:, ~self.storage.alive[start:end]] = np.inf
+
+            positions, distances = top_k(distances, n)
+            best_slots = np.concatenate([best_slots, positions + start], axis=1)
+            best_distances = np.concatenate([best_distances, distances], axis=1)
+
+            positions, best_distances = top_k(best_distances, n)
+            best_slots = np.take_along_axis(best_slots, positions, axis=1)
+
+        best_slots[np.isinf(best_distances)] = -1
+        return best_slots, best_distances
+
+    def __quantizer_prefix(self) -> str:
+        return f"{type(self.quantizer).__name__}."
+
+    def __encode(self, slots: np.ndarray) -> None:
+        self.__reserve(int(np.max(slots, initial=-1)) + 1)
+
+        for start in range(0, len(slots), _SCAN_BLOCK):
+            block = slots[start : start + _SCAN_BLOCK]
+            codes = self.quantizer.encode(self.storage.embeddings[block])
+            self.codes[block] = codes
+            self.code_norms[block] = row_norms(self.quantizer.decode(codes))
+
+    def __reserve(self, size: int) -> None:
+        capacity = len(self.codes)
+        if size <= capacity:
+            return
+
+        capacity = max(size, capacity * 2)
+
+        codes = np.zeros((capacity, self.quantizer.code_size), dtype=np.uint8)
+        codes[: len(self.codes)] = self.codes
+        code_norms = np.zeros(capacity, dtype=np.float32)
+        code_norms[: len(self.code_norms)] = self.code_norms
+
+        self.codes, self.code_norms = codes, code_norms
@@ -0,0 +1,189 @@
+import json
+import mmap
+import os
+
+import numpy as np
+
+from .distance import row_norms
+
+METADATA_FILE = "metadata.jsonl"
+
+
+class MetadataFile:
+    """Read-only metadata of a saved collection, one json document per slot decoded on access."""
+
+    def __init__(self, path: str, offsets: np.ndarray) -> None:
+        self.__offsets = offsets
+        self.__data = b""
+
+        if os.path.getsize(path) > 0:
+            with open(path, "rb") as f:
+                self.__data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return len(self.__offsets) - 1
+
+    def __getitem__(self, slot: int) -> dict | None:
+        return json.loads(self.__data[self.__offsets[slot] : self.__offsets[slot + 1]])
+
+    def tolist(self) -> list[dict | None]:
+        return [self[slot] for slot in range(len(self))]
+
+
+class VectorStorage:
+    """Contiguous float32 embedding matrix with ids and metadata, addressed by row slot.
+
+    Deleted rows are tombstoned in `alive` and reclaimed by `compact`. A storage opened from disk keeps its arrays
+    memory-mapped copy-on-write, the id lookup table is only built when first needed.
+    """
+
+    def __init__(self, vector_size: int, capacity: int = 1024) -> None:
+        self.vector_size = vector_size
+        self.count = 0
+        self.size = 0
+
+        self.embeddings = np.empty((capacity, vector_size), dtype=np.float32)
+        self.norms = np.empty(capacity, dtype=np.float32)
+        self.alive = np.zeros(capacity, dtype=bool)
+
+        self.ids: list[str] | np.ndarray = []
+        self.metadata: list[dict | None] | MetadataFile = []
+        self.__slots: dict[str, int] | None = {}
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def dead(self) -> int:
+        return self.count - self.size
+
+    @property
+    def slots(self) -> dict[str, int]:
+        if self.__slots is None:
+            alive = np.flatnonzero(self.alive[: self.count])
+            self.__slots = {str(self.ids[slot]): slot for slot in alive.tolist()}
+        return self.__slots
+
+    def get_slot(self, id: str) -> int | None:
+        return self.slots.get(id)
+
+    def append(self, ids: list[str], embeddings: np.ndarray, metadata: list[dict | None]) -> np.ndarray:
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if embeddings.ndim != 2 or embeddings.shape[1] != self.vector_size:
+            raise ValueError(f"embedding size must be {self.vector_size}")
+
+        self.__materialize()
+        self.__reserve(self.count + len(ids))
+
+        start, end = self.count, self.count + len(ids)
+        self.embeddings[start:end] = embeddings
+        self.norms[start:end] = row_norms(self.embeddings[start:end])
+        self.alive[start:end] = True
+
+        self.ids.extend(ids)
+        self.metadata.extend(metadata)
+        for offset, id_ in enumerate(ids):
+            self.slots[id_] = start + offset
+
+        self.count = end
+        self.size += len(ids)
+        return np.arange(start, end)
+
+    def remove(self, ids: list[str]) -> np.ndarray:
+        self.__materialize()
+
+        slots = [self.slots.pop(id_) for id_ in ids if id_ in self.slots]
+        slots = np.asarray(slots, dtype=np.int64)
+
+        self.alive[slots] = False
+        for slot in slots:
+            self.metadata[slot] = None
+
+        self.size -= len(slots)
+        return slots
+
+    def compact(self) -> np.ndarray:
+        """Drop tombstoned rows, returns the new slot of every old slot (-1 when removed)."""
+        self.__materialize()
+
+        keep = np.flatnonzero(self.alive[: self.count])
+        mapping = np.full(self.count, -1, dtype=np.int64)
+        mapping[keep] = np.arange(len(keep))
+
+        self.embeddings[: len(keep)] = self.embeddings[keep]
+        self.norms[: len(keep)] = self.norms[keep]
+        self.alive[: len(keep)] = True
+        self.alive[len(keep) : self.count] = False
+
+        self.ids = [self.ids[slot] for slot in keep]
+        self.metadata = [self.metadata[slot] for slot in keep]
+        self.__slots = {id_: slot for slot, id_ in enumerate(self.ids)}
+
+        self.count = len(keep)
+        return mapping
+
+    def save(self, path: str) -> None:
+        """Writes the storage as `.npy` arrays (memory-mappable) plus a json lines metadata file."""
+        count = self.count
+
+        save_array(path, "embeddings", self.embeddings[:count])
+        save_array(path, "norms", self.norms[:count])
+        save_array(path, "alive", self.alive[:count])
+        save_array(path, "ids", np.asarray([str(id_) for id_ in self.ids[:count]], dtype=np.str_))
+
+        offsets = np.zeros(count + 1, dtype=np.int64)
+        with open(os.path.join(path, METADATA_FILE + ".tmp"), "wb") as f:
+            for slot in range(count):
+                offsets[slot + 1] = offsets[slot] + f.write(json.dumps(self.metadata[slot]).encode())
+        os.replace(os.path.join(path, METADATA_FILE + ".tmp"), os.path.join(path, METADATA_FILE))
+        save_array(path, "metadata_offsets", offsets)
+
+    @classmethod
+    def open(cls, path: str, vector_size: int) -> "VectorStorage":
+        storage = cls(vector_size, capacity=0)
+
+        storage.embeddings = load_array(path, "embeddings")
+        storage.norms = load_array(path, "norms")
+        storage.alive = load_array(path, "alive")
+        storage.ids = load_array(path, "ids")
+        storage.metadata = MetadataFile(os.path.join(path, METADATA_FILE), load_array(path, "metadata_offsets"))
+
+        storage.count = len(storage.embeddings)
+        storage.size = int(np.count_nonzero(storage.alive))
+        storage.__slots = None
+        return storage
+
+    def __materialize(self) -> None:
+        # ids and metadata of a storage opened from disk become python lists on the first write
+        if not isinstance(self.ids, list):
+            self.ids = self.ids.tolist()
+        if not isinstance(self.metadata, list):
+            self.metadata = self.metadata.tolist()
+
+    def __reserve(self, size: int) -> None:
+        capacity = self.embeddings.shape[0]
+        if size <= capacity:
+            return
+
+        capacity = max(size, capacity * 2)
+
+        embeddings = np.empty((capacity, self.vector_size), dtype=np.float32)
+        embeddings[: self.count] = self.embeddings[: self.count]
+        norms = np.empty(capacity, dtype=np.float32)
+        norms[: self.count] = self.norms[: self.count]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[: self.count] = self.alive[: self.count]
+
+        self.embeddings, self.norms, self.alive = embeddings, norms, alive
+
+
+def save_array(path: str, name: str, array: np.ndarray) -> None:
+    # written next to the target and swapped in, a collection opened from the same files keeps its mapping
+    target = os.path.join(path, f"{name}.npy")
+    with open(target + ".tmp", "wb") as f:
+        np.save(f, np.ascontiguousarray(array))
+    os.replace(target + ".tmp", target)
+
+
+def load_array(path: str, name: str) -> np.ndarray:
+    return np.load(os.path.join(path, f"{name}.npy"), mmap_mode="c")
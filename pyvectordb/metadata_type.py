@@ -0,0 +1,25 @@
+from enum import Enum
+
+
+class MetadataType(Enum):
+    """Value type of an indexed metadata field"""
+
+    KEYWORD = "keyword"
+    INTEGER = "integer"
+    FLOAT = "float"
+    BOOL = "bool"
+
+    @staticmethod
+    def from_str(text: str) -> "MetadataType":
+        text = text.lower()
+
+        if text in ("keyword", "str", "string"):
+            return MetadataType.KEYWORD
+        if text in ("integer", "int"):
+            return MetadataType.INTEGER
+        if text in ("float", "number"):
+            return MetadataType.FLOAT
+        if text in ("bool", "boolean"):
+            return MetadataType.BOOL
+
+        raise ValueError("invalid string for metadata type")
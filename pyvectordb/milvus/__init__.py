@@ -1,11 +1,22 @@
+from concurrent.futures import ThreadPoolExecutor
+
 from pymilvus import MilvusClient
 
 from pyvectordb.distance_function import DistanceFunction
 from pyvectordb.driver import VectorDB
+from pyvectordb.filter import Filter
+from pyvectordb.index_spec import IndexSpec
+from pyvectordb.metadata_type import MetadataType
+from pyvectordb.search_params import SearchParams
+from pyvectordb.search_result import SearchResult
 from pyvectordb.vector import Vector
+from pyvectordb.vector_batch import VectorBatch
 from pyvectordb.vector_distance import VectorDistance
 
+from .batch import MAX_CHUNK_BYTES, WRITE_WORKERS, chunk_rows
 from .distance import Distance
+from .filter import metadata_index_params, to_milvus_expr
+from .index import collection_schema, to_milvus_search_params, vector_index_params
 
 
 class MilvusDB(VectorDB):
@@ -16,6 +27,10 @@ class MilvusDB(VectorDB):
         collection: str = None,
         vector_size: int = None,
         distance_function: DistanceFunction | str = DistanceFunction.COSINE,
+        index_spec: IndexSpec | None = None,
+        max_chunk_bytes: int = MAX_CHUNK_BYTES,
+        write_workers: int = WRITE_WORKERS,
+        flush_on_write: bool = False,
         debug: bool = False,
     ) -> None:
         super().__init__(host, port, debug)
@@ -25,6 +40,10 @@ class MilvusDB(VectorDB):
         self.collection = collection or self.__raise_value_error("collection")
         self.vector_size = vector_size or self.__raise_value_error("vector_size")
         self.distance_function = distance_function or self.__raise_value_error("distance_function")
+        self.index_spec = index_spec
+        self.max_chunk_bytes = max_chunk_bytes or self.__raise_value_error("max_chunk_bytes")
+        self.write_workers = write_workers or self.__raise_value_error("write_workers")
+        self.flush_on_write = flush_on_write
 
         self.client: MilvusClient = None
 
@@ -43,10 +62,11 @@ class MilvusDB(VectorDB):
     def __init_collection(self) -> None:
         if not self.client.has_collection(self.collection):
             metric_type = self.__get_distance_function(self.distance_function)
+            # with index_params the collection is created, indexed and loaded in one call
             self.client.create_collection(
                 collection_name=self.collection,
-                dimension=self.vector_size,
-                metric_type=metric_type,
+                schema=collection_schema(self.vector_size),
+                index_params=vector_index_params(metric_type, self.index_spec),
             )
 
     def __get_distance_function(self, distance_function: DistanceFunction | str) -> str:
@@ -87,27 +107,33 @@ class MilvusDB(VectorDB):
             ],
         )
 
-    def insert_vectors(self, vectors: list[Vector]) -> None:
+    def insert_vectors(self, vectors: list[Vector] | VectorBatch) -> None:
         if len(vectors) == 0:
             return
 
-        data = []
-        for vector in vectors:
-            data.append(
-                {
-                    "id": vector.get_id(),
-                    "vector": vector.embedding,
-                    "metadata": vector.metadata,
-                }
-            )
+        self.__write_chunks(self.client.insert, self.__rows(vectors))
+
+    @staticmethod
+    def __output_fields(include_embedding: bool, include_metadata: bool) -> list[str]:
+        # ids and distances are always returned
+        return (["vector"] if include_embedding else []) + (["metadata"] if include_metadata else [])
+
+    @staticmethod
+    def __rows(vectors: list[Vector] | VectorBatch) -> list[dict]:
+        # MilvusClient only takes row based data, a batch is zipped from its columns without Vector objects
+        if isinstance(vectors, VectorBatch):
+            return [
+                {"id": id_, "vector": embedding, "metadata": metadata}
+                for id_, embedding, metadata in zip(vectors.ids, vectors.embeddings, vectors.metadata, strict=True)
+            ]
 
-        self.client.insert(collection_name=self.collection, data=data)
+        return [{"id": v.get_id(), "vector": v.embedding, "metadata": v.metadata} for v in vectors]
 
-    def read_vector(self, id: str) -> Vector | None:
+    def read_vector(self, id: str, include_embedding: bool = True, include_metadata: bool = True) -> Vector | None:
         results = self.client.query(
             collection_name=self.collection,
             ids=[id],
-            output_fields=["vector", "metadata"],
+            output_fields=self.__output_fields(include_embedding, include_metadata),
         )
 
         if len(results) == 0:
@@ -133,21 +159,11 @@ class MilvusDB(VectorDB):
             ],
         )
 
-    def update_vectors(self, vectors: list[Vector]) -> None:
+    def update_vectors(self, vectors: list[Vector] | VectorBatch) -> None:
         if len(vectors) == 0:
             return
 
-        data = []
-        for vector in vectors:
-            data.append(
-                {
-                    "id": vector.get_id(),
-                    "vector": vector.embedding,
-                    "metadata": vector.metadata,
-                }
-            )
-
-        self.client.upsert(collection_name=self.collection, data=data)
+        self.__write_chunks(self.client.upsert, self.__rows(vectors))
 
     def delete_vector(self, id: str) -> None:
         self.client.delete(
@@ -167,31 +183,101 @@ class MilvusDB(VectorDB):
             ids=ids,
         )
 
+    def flush(self) -> None:
+        """Seal the growing segments of the collection, milvus otherwise seals them by size or time."""
+        self.client.flush(collection_name=self.collection)
+
+    def __write_chunks(self, write, rows: list[dict]) -> None:
+        # chunks under the grpc message limit, written by write_workers threads sharing the client channel
+        chunks = chunk_rows(rows, self.max_chunk_bytes)
+        if len(chunks) == 1:
+            write(collection_name=self.collection, data=chunks[0])
+        else:
+            with ThreadPoolExecutor(max_workers=min(len(chunks), self.write_workers)) as executor:
+                list(executor.map(lambda chunk: write(collection_name=self.collection, data=chunk), chunks))
+
+        if self.flush_on_write:
+            self.flush()
+
     def get_neighbor_vectors(
         self,
         vector: Vector,
         n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
     ) -> list[VectorDistance]:
+        return self.get_neighbor_results(
+            vector, n, filter, include_embedding=include_embedding, include_metadata=include_metadata, params=params
+        ).to_vector_distances()
+
+    def get_neighbor_results(
+        self,
+        vector: Vector,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> SearchResult:
+        return self.get_neighbor_results_batch([vector], n, filter, include_embedding, include_metadata, params)[0]
+
+    def get_neighbor_vectors_batch(
+        self,
+        vectors: list[Vector] | VectorBatch,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[list[VectorDistance]]:
+        results = self.get_neighbor_results_batch(
+            vectors, n, filter, include_embedding=include_embedding, include_metadata=include_metadata, params=params
+        )
+        return [result.to_vector_distances() for result in results]
+
+    def get_neighbor_results_batch(
+        self,
+        vectors: list[Vector] | VectorBatch,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[SearchResult]:
+        if len(vectors) == 0:
+            return []
+
+        if isinstance(vectors, VectorBatch):
+            data = list(vectors.embeddings)
+        else:
+            data = [vector.embedding for vector in vectors]
+
         results = self.client.search(
             collection_name=self.collection,
-            data=[vector.embedding],
+            data=data,
             limit=n,
-            output_fields=["id", "vector", "metadata"],
+            filter=to_milvus_expr(filter) if filter is not None else "",
+            search_params=to_milvus_search_params(params),
+            output_fields=self.__output_fields(include_embedding, include_metadata),
         )
 
-        vector_distances = []
-        for hit in results[0]:
-            vector_distance = VectorDistance(
-                vector=Vector(
-                    embedding=hit.get("entity", {}).get("vector"),
-                    vector_id=hit.get("id"),
-                    metadata=hit.get("entity", {}).get("metadata"),
-                ),
-                distance=hit.get("distance", 0.0),
+        return [
+            SearchResult(
+                ids=[hit.get("id") for hit in hits],
+                distances=[hit.get("distance", 0.0) for hit in hits],
+                embeddings=[hit.get("entity", {}).get("vector") for hit in hits] if include_embedding else None,
+                metadata=[hit.get("entity", {}).get("metadata") for hit in hits] if include_metadata else None,
             )
-            vector_distances.append(vector_distance)
+            for hits in results
+        ]
 
-        return vector_distances
+    def create_metadata_index(self, field: str, type: MetadataType | str) -> None:
+        self.client.create_index(
+            collection_name=self.collection,
+            index_params=metadata_index_params(field, type),
+        )
 
 
 __all__ = ["MilvusDB"]
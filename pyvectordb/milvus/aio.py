@@ -0,0 +1,260 @@
+import asyncio
+
+from pymilvus import AsyncMilvusClient
+
+from pyvectordb.async_driver import AsyncVectorDB
+from pyvectordb.distance_function import DistanceFunction
+from pyvectordb.filter import Filter
+from pyvectordb.index_spec import IndexSpec
+from pyvectordb.metadata_type import MetadataType
+from pyvectordb.search_params import SearchParams
+from pyvectordb.search_result import SearchResult
+from pyvectordb.vector import Vector
+from pyvectordb.vector_batch import VectorBatch
+from pyvectordb.vector_distance import VectorDistance
+
+from .batch import MAX_CHUNK_BYTES, WRITE_WORKERS, chunk_rows
+from .distance import Distance
+from .filter import metadata_index_params, to_milvus_expr
+from .index import collection_schema, to_milvus_search_params, vector_index_params
+
+
+class AsyncMilvusDB(AsyncVectorDB):
+    def __init__(
+        self,
+        host: str,
+        port: int = 19530,
+        collection: str = None,
+        vector_size: int = None,
+        distance_function: DistanceFunction | str = DistanceFunction.COSINE,
+        index_spec: IndexSpec | None = None,
+        max_chunk_bytes: int = MAX_CHUNK_BYTES,
+        write_workers: int = WRITE_WORKERS,
+        flush_on_write: bool = False,
+        debug: bool = False,
+    ) -> None:
+        super().__init__(host, port, debug)
+
+        self.host = host or self.__raise_value_error("host")
+        self.port = port or self.__raise_value_error("port")
+        self.collection = collection or self.__raise_value_error("collection")
+        self.vector_size = vector_size or self.__raise_value_error("vector_size")
+        self.distance_function = distance_function or self.__raise_value_error("distance_function")
+        self.index_spec = index_spec
+        self.max_chunk_bytes = max_chunk_bytes or self.__raise_value_error("max_chunk_bytes")
+        self.write_workers = write_workers or self.__raise_value_error("write_workers")
+        self.flush_on_write = flush_on_write
+
+        self.client: AsyncMilvusClient = None
+
+    @staticmethod
+    def __raise_value_error(param: str):
+        raise ValueError(f"{param} is required")
+
+    async def _connect(self) -> None:
+        if self.client is None:
+            self.client = AsyncMilvusClient(uri=f"http://{self.host}:{self.port}")
+
+        if not await self.client.has_collection(self.collection):
+            await self.client.create_collection(
+                collection_name=self.collection,
+                schema=collection_schema(self.vector_size),
+                index_params=vector_index_params(self.__get_distance_function(self.distance_function), self.index_spec),
+            )
+
+    async def close(self) -> None:
+        if self.client is not None:
+            await self.client.close()
+            self.client = None
+
+    def __get_distance_function(self, distance_function: DistanceFunction | str) -> str:
+        if isinstance(distance_function, str):
+            distance_function = DistanceFunction.from_str(distance_function)
+
+        if distance_function == DistanceFunction.COSINE:
+            return Distance.COSINE.value
+        elif distance_function == DistanceFunction.EUCLIDEAN:
+            return Distance.L2.value
+        elif distance_function == DistanceFunction.DOT:
+            return Distance.IP.value
+        elif distance_function == DistanceFunction.HAMMING:
+            return Distance.HAMMING.value
+        elif distance_function == DistanceFunction.JACCARD:
+            return Distance.JACCARD.value
+        else:
+            d_ = [
+                "COSINE",
+                "EUCLIDEAN",
+                "DOT",
+                "HAMMING",
+                "JACCARD",
+            ]
+            raise ValueError(f"distance function unavailable on milvus: {d_}")
+
+    async def insert_vector(self, vector: Vector) -> None:
+        await self.insert_vectors([vector])
+
+    async def insert_vectors(self, vectors: list[Vector] | VectorBatch) -> None:
+        if len(vectors) == 0:
+            return
+
+        await self.__write_chunks(self.client.insert, self.__rows(vectors))
+
+    @staticmethod
+    def __output_fields(include_embedding: bool, include_metadata: bool) -> list[str]:
+        # ids and distances are always returned
+        return (["vector"] if include_embedding else []) + (["metadata"] if include_metadata else [])
+
+    @staticmethod
+    def __rows(vectors: list[Vector] | VectorBatch) -> list[dict]:
+        if isinstance(vectors, VectorBatch):
+            return [
+                {"id": id_, "vector": embedding, "metadata": metadata}
+                for id_, embedding, metadata in zip(vectors.ids, vectors.embeddings, vectors.metadata, strict=True)
+            ]
+
+        return [{"id": v.get_id(), "vector": v.embedding, "metadata": v.metadata} for v in vectors]
+
+    async def read_vector(
+        self, id: str, include_embedding: bool = True, include_metadata: bool = True
+    ) -> Vector | None:
+        results = await self.client.query(
+            collection_name=self.collection,
+            ids=[id],
+            output_fields=self.__output_fields(include_embedding, include_metadata),
+        )
+
+        if len(results) == 0:
+            return None
+
+        result = results[0]
+        return Vector(
+            embedding=result.get("vector"),
+            vector_id=result.get("id"),
+            metadata=result.get("metadata"),
+        )
+
+    async def update_vector(self, vector: Vector) -> None:
+        await self.update_vectors([vector])
+
+    async def update_vectors(self, vectors: list[Vector] | VectorBatch) -> None:
+        if len(vectors) == 0:
+            return
+
+        # Milvus uses upsert for both insert and update
+        await self.__write_chunks(self.client.upsert, self.__rows(vectors))
+
+    async def delete_vector(self, id: str) -> None:
+        await self.delete_vectors([id])
+
+    async def delete_vectors(self, ids: list[str] | list[Vector]) -> None:
+        if len(ids) == 0:
+            return
+
+        if isinstance(ids[0], Vector):
+            ids = [v.get_id() for v in ids]
+
+        await self.client.delete(
+            collection_name=self.collection,
+            ids=ids,
+        )
+
+    async def flush(self) -> None:
+        await self.client.flush(collection_name=self.collection)
+
+    async def __write_chunks(self, write, rows: list[dict]) -> None:
+        # chunks under the grpc message limit, at most write_workers requests in flight
+        semaphore = asyncio.Semaphore(self.write_workers)
+
+        async def write_chunk(chunk: list[dict]) -> None:
+            async with semaphore:
+                await write(collection_name=self.collection, data=chunk)
+
+        await asyncio.gather(*(write_chunk(chunk) for chunk in chunk_rows(rows, self.max_chunk_bytes)))
+
+        if self.flush_on_write:
+            await self.flush()
+
+    async def get_neighbor_vectors(
+        self,
+        vector: Vector,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[VectorDistance]:
+        return (
+            await self.get_neighbor_results(
+                vector, n, filter, include_embedding=include_embedding, include_metadata=include_metadata, params=params
+            )
+        ).to_vector_distances()
+
+    async def get_neighbor_results(
+        self,
+        vector: Vector,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> SearchResult:
+        return (
+            await self.get_neighbor_results_batch([vector], n, filter, include_embedding, include_metadata, params)
+        )[0]
+
+    async def get_neighbor_vectors_batch(
+        self,
+        vectors: list[Vector] | VectorBatch,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[list[VectorDistance]]:
+        results = await self.get_neighbor_results_batch(
+            vectors, n, filter, include_embedding=include_embedding, include_metadata=include_metadata, params=params
+        )
+        return [result.to_vector_distances() for result in results]
+
+    async def get_neighbor_results_batch(
+        self,
+        vectors: list[Vector] | VectorBatch,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[SearchResult]:
+        if len(vectors) == 0:
+            return []
+
+        if isinstance(vectors, VectorBatch):
+            data = list(vectors.embeddings)
+        else:
+            data = [vector.embedding for vector in vectors]
+
+        results = await self.client.search(
+            collection_name=self.collection,
+            data=data,
+            limit=n,
+            filter=to_milvus_expr(filter) if filter is not None else "",
+            search_params=to_milvus_search_params(params),
+            output_fields=self.__output_fields(include_embedding, include_metadata),
+        )
+
+        return [
+            SearchResult(
+                ids=[hit.get("id") for hit in hits],
+                distances=[hit.get("distance", 0.0) for hit in hits],
+                embeddings=[hit.get("entity", {}).get("vector") for hit in hits] if include_embedding else None,
+                metadata=[hit.get("entity", {}).get("metadata") for hit in hits] if include_metadata else None,
+            )
+            for hits in results
+        ]
+
+    async def create_metadata_index(self, field: str, type: MetadataType | str) -> None:
+        await self.client.create_index(
+            collection_name=self.collection,
+            index_params=metadata_index_params(field, type),
+        )
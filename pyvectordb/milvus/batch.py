@@ -0,0 +1,38 @@
+import json
+
+# milvus rejects insert requests above proxy.grpc.serverMaxRecvSize (64 MB by default), chunks stay well below it
+MAX_CHUNK_BYTES = 16 * 1024 * 1024
+
+# chunks sent at the same time by insert_vectors / update_vectors
+WRITE_WORKERS = 4
+
+# field names and protobuf framing of a row, on top of its values
+ROW_OVERHEAD_BYTES = 32
+
+
+def row_bytes(row: dict) -> int:
+    """Estimated request size of a row, float vectors are sent as 4 byte floats and metadata as JSON"""
+    metadata = row["metadata"]
+    metadata_bytes = len(json.dumps(metadata)) if metadata is not None else 0
+    return 4 * len(row["vector"]) + len(row["id"]) + metadata_bytes + ROW_OVERHEAD_BYTES
+
+
+def chunk_rows(rows: list[dict], max_chunk_bytes: int) -> list[list[dict]]:
+    """Consecutive chunks of `rows` of at most `max_chunk_bytes` estimated bytes, a larger row gets its own chunk."""
+    chunks = []
+    chunk = []
+    chunk_bytes = 0
+    for row in rows:
+        size = row_bytes(row)
+        if len(chunk) > 0 and chunk_bytes + size > max_chunk_bytes:
+            chunks.append(chunk)
+            chunk = []
+            chunk_bytes = 0
+
+        chunk.append(row)
+        chunk_bytes += size
+
+    if len(chunk) > 0:
+        chunks.append(chunk)
+
+    return chunks
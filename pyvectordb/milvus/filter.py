@@ -0,0 +1,66 @@
+import json
+import re
+
+from pymilvus import MilvusClient
+from pymilvus.milvus_client.index import IndexParams
+
+from pyvectordb.filter import And, Eq, Filter, In, Not, Range, push_down_not
+from pyvectordb.metadata_type import MetadataType
+
+OPERATORS = {"gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+INDEX_NAME_INVALID = re.compile(r"\W")
+
+
+def to_milvus_expr(filter: Filter) -> str:
+    """Compiles to a milvus boolean expression over the `metadata` JSON field, values are json literals."""
+    filter = push_down_not(filter)
+    if isinstance(filter, Eq):
+        return f"{_field(filter.key)} == {json.dumps(filter.value)}"
+    if isinstance(filter, In):
+        return f"{_field(filter.key)} in {json.dumps(filter.values)}"
+    if isinstance(filter, Range):
+        return " and ".join(
+            f"{_field(filter.key)} {OPERATORS[name]} {json.dumps(value)}" for name, value in filter.bounds()
+        )
+    if isinstance(filter, Not):
+        return f"not ({to_milvus_expr(filter.filter)})"
+
+    separator = " and " if isinstance(filter, And) else " or "
+    return separator.join(f"({to_milvus_expr(f)})" for f in filter.filters)
+
+
+def _field(key: str) -> str:
+    return f"metadata[{json.dumps(key)}]"
+
+
+def metadata_index_params(field: str, type: MetadataType | str) -> IndexParams:
+    """Inverted index on the `metadata[field]` JSON path, values are cast to `type` when indexed."""
+    index_params = MilvusClient.prepare_index_params()
+    index_params.add_index(
+        field_name="metadata",
+        index_type="INVERTED",
+        index_name=f"metadata_{INDEX_NAME_INVALID.sub('_', field)}_idx",
+        params={"json_path": _field(field), "json_cast_type": _json_cast_type(type)},
+    )
+    return index_params
+
+
+def _json_cast_type(type: MetadataType | str) -> str:
+    if isinstance(type, str):
+        type = MetadataType.from_str(type)
+
+    if type == MetadataType.KEYWORD:
+        return "varchar"
+    elif type in (MetadataType.INTEGER, MetadataType.FLOAT):
+        # JSON numbers are indexed as double
+        return "double"
+    elif type == MetadataType.BOOL:
+        return "bool"
+    else:
+        d_ = [
+            "KEYWORD",
+            "INTEGER",
+            "FLOAT",
+            "BOOL",
+        ]
+        raise ValueError(f"metadata type unavailable on milvus: {d_}")
@@ -0,0 +1,85 @@
+from pymilvus import CollectionSchema, DataType, MilvusClient
+from pymilvus.milvus_client.index import IndexParams
+
+from pyvectordb.index_spec import IndexSpec, IndexType, QuantizationType
+from pyvectordb.search_params import SearchParams
+
+# longest vector id, ids are strings (uuids unless given)
+MAX_ID_LENGTH = 512
+
+
+def collection_schema(vector_size: int) -> CollectionSchema:
+    """`id` string primary key, `vector` and a nullable `metadata` JSON field (metadata indexes and filters address
+    its paths). Dynamic fields stay enabled like the quick setup schema."""
+    schema = MilvusClient.create_schema(auto_id=False, enable_dynamic_field=True)
+    schema.add_field("id", DataType.VARCHAR, is_primary=True, max_length=MAX_ID_LENGTH)
+    schema.add_field("vector", DataType.FLOAT_VECTOR, dim=vector_size)
+    schema.add_field("metadata", DataType.JSON, nullable=True)
+    return schema
+
+
+def vector_index_params(metric_type: str, index_spec: IndexSpec | None) -> IndexParams:
+    index_params = MilvusClient.prepare_index_params()
+    if index_spec is None:
+        index_params.add_index(field_name="vector", index_type="AUTOINDEX", metric_type=metric_type)
+        return index_params
+
+    index_type, params = _index_type(index_spec)
+    if index_spec.on_disk:
+        # the index files are memory-mapped instead of loaded into memory
+        params["mmap.enabled"] = True
+
+    index_params.add_index(field_name="vector", index_type=index_type, metric_type=metric_type, params=params)
+    return index_params
+
+
+def _index_type(index_spec: IndexSpec) -> tuple[str, dict]:
+    quantization = index_spec.quantization
+    hnsw_params = _params(M=index_spec.m, efConstruction=index_spec.ef_construction)
+    ivf_params = _params(nlist=index_spec.nlist)
+
+    if index_spec.index_type == IndexType.DYNAMIC and quantization is None:
+        # milvus picks the index and its parameters for the collection
+        return "AUTOINDEX", {}
+    elif index_spec.index_type == IndexType.FLAT and quantization is None:
+        return "FLAT", {}
+    elif index_spec.index_type == IndexType.HNSW and quantization is None:
+        return "HNSW", hnsw_params
+    elif index_spec.index_type == IndexType.HNSW and quantization == QuantizationType.SCALAR:
+        return "HNSW_SQ", {**hnsw_params, "sq_type": "SQ8"}
+    elif index_spec.index_type == IndexType.HNSW and quantization == QuantizationType.PRODUCT:
+        return "HNSW_PQ", {**hnsw_params, **_pq_params(index_spec)}
+    elif index_spec.index_type == IndexType.IVF and quantization is None:
+        return "IVF_FLAT", ivf_params
+    elif index_spec.index_type == IndexType.IVF and quantization == QuantizationType.SCALAR:
+        return "IVF_SQ8", ivf_params
+    elif index_spec.index_type == IndexType.IVF and quantization == QuantizationType.BINARY:
+        return "IVF_RABITQ", ivf_params
+    elif index_spec.index_type == IndexType.IVF and quantization == QuantizationType.PRODUCT:
+        return "IVF_PQ", {**ivf_params, **_pq_params(index_spec)}
+    else:
+        d_ = [
+            "DYNAMIC",
+            "FLAT",
+            "HNSW (SCALAR, PRODUCT)",
+            "IVF (SCALAR, BINARY, PRODUCT)",
+        ]
+        raise ValueError(f"index type and quantization unavailable on milvus: {d_}")
+
+
+def _pq_params(index_spec: IndexSpec) -> dict:
+    if index_spec.pq_segments is None:
+        raise ValueError("pq_segments is required for product quantization on milvus")
+    # one byte codes per segment, like the other backends
+    return {"m": index_spec.pq_segments, "nbits": 8}
+
+
+def _params(**params) -> dict:
+    return {key: value for key, value in params.items() if value is not None}
+
+
+def to_milvus_search_params(params: SearchParams | None) -> dict:
+    """`search_params` of `MilvusClient.search`, milvus has no per query exact search or rescoring knob."""
+    if params is None:
+        return {}
+    return {"params": _params(ef=params.ef, nprobe=params.nprobe)}
@@ -1,15 +1,47 @@
-from collections.abc import Generator
-from typing import Any
+import io
+import re
+from collections.abc import Callable, Iterable
+from datetime import datetime
 
-from sqlalchemy import create_engine, select, text
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import Row, create_engine, text
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
 
 from pyvectordb.distance_function import DistanceFunction
 from pyvectordb.driver import VectorDB
+from pyvectordb.filter import Filter
+from pyvectordb.metadata_type import MetadataType
+from pyvectordb.search_params import SearchParams
+from pyvectordb.search_result import SearchResult
 from pyvectordb.vector import Vector
+from pyvectordb.vector_batch import VectorBatch
 from pyvectordb.vector_distance import VectorDistance
 
-from .model import VectorORM, get_vector_orm
+from .bulk import (
+    delete_statement,
+    delete_where_statement,
+    encode_copy_binary,
+    iter_batches,
+    upsert_parameters,
+    upsert_statement,
+    vector_texts,
+)
+from .filter import where_clause
+from .index import (
+    IndexType,
+    StorageType,
+    create_index_query,
+    create_metadata_index_query,
+    index_name,
+    metadata_index_name,
+    operator_class,
+    search_rerank,
+    search_settings,
+)
+from .model import VectorORM, get_vector_orm, read_statement
+from .raw import batch_search_query, decode_embeddings, distance_operator, search_query
+from .session import engine_options, psycopg_connect_args, scoped, track_engine
+
+LITERAL_PERCENT = re.compile(r"%(?!\(p\d+\)s)")
 
 
 class PgvectorDB(VectorDB):
@@ -22,6 +54,15 @@ class PgvectorDB(VectorDB):
         db_name: str,
         collection: str,
         distance_function: DistanceFunction | str = DistanceFunction.L2,
+        batch_size: int = 1000,
+        vector_size: int | None = None,
+        ef_search: int | None = None,
+        probes: int | None = None,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pgbouncer: bool = False,
+        storage: StorageType | str = StorageType.VECTOR,
+        rerank: int | None = None,
     ) -> None:
         super().__init__(host, port)
 
@@ -32,11 +73,26 @@ class PgvectorDB(VectorDB):
         self.db_name = db_name or self.__raise_value_error("db_name")
         self.collection = collection or self.__raise_value_error("collection")
         self.distance_function = distance_function or self.__raise_value_error("distance_function")
+        self.batch_size = batch_size or self.__raise_value_error("batch_size")
+        self.vector_size = vector_size
+        self.ef_search = ef_search
+        self.probes = probes
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.pgbouncer = pgbouncer
+        self.storage = StorageType(storage.lower()) if isinstance(storage, str) else storage
+        self.rerank = rerank
+        if self.storage != StorageType.VECTOR and not self.vector_size:
+            # halfvec / bit casts need the dimension
+            self.__raise_value_error("vector_size")
 
         self.__engine = None
 
         self.__init_engine()
-        self.conn = next(self.__get_db_session())
+        # one session per thread, each checks a pooled connection out only for the duration of a call
+        self.conn: scoped_session[Session] = scoped_session(
+            sessionmaker(bind=self.__engine, autoflush=False, expire_on_commit=False)
+        )
 
         self.__init_collection()
         self.__vector_orm: VectorORM = get_vector_orm(self.collection)
@@ -48,175 +104,439 @@ class PgvectorDB(VectorDB):
     def __init_engine(self) -> None:
         if self.__engine is None:
             # pgvector 0.4.x with SQLAlchemy 2.0
-            self.__engine = create_engine(
-                f"postgresql://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}",
-                echo=False,
-                pool_pre_ping=True,
-                connect_args={"options": "-c search_path=public"},
+            self.__engine = track_engine(
+                create_engine(
+                    f"postgresql://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}",
+                    connect_args=psycopg_connect_args(self.pgbouncer),
+                    **engine_options(self.pool_size, self.max_overflow, self.pgbouncer),
+                )
             )
 
-    def __get_db_session(self) -> Generator[Session]:
-        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.__engine)
-
-        db = SessionLocal()
-        try:
-            yield db
-        finally:
-            db.close()
+    def close(self) -> None:
+        if self.__engine is not None:
+            self.conn.remove()
+            self.__engine.dispose()
+            self.__engine = None
 
+    @scoped
     def __init_collection(self) -> None:
+        # only a typed vector(n) column can be indexed
+        embedding_type = f"vector({int(self.vector_size)})" if self.vector_size else "vector"
         query = f"""
 CREATE TABLE IF NOT EXISTS {self.collection} (
     id text PRIMARY KEY,
-    embedding vector,
+    embedding {embedding_type},
     metadata text,
     created_at timestamptz DEFAULT now()
 );
 """
         self.conn.execute(text(query))
+
+        if self.vector_size and self.__get_vector_size() is None:
+            # collections created before vector_size was given get their column typed
+            self.conn.execute(text(f"ALTER TABLE {self.collection} ALTER COLUMN embedding TYPE {embedding_type}"))
         self.conn.commit()
 
-    def insert_vector(self, vector: Vector) -> Vector:
-        v = self.__vector_orm(
-            id=vector.get_id(),
-            embedding=vector.embedding,
-            metadata_=vector.metadata_to_string(),
+    def __get_vector_size(self) -> int | None:
+        typmod = self.conn.execute(
+            text(
+                "SELECT atttypmod FROM pg_attribute "
+                "WHERE attrelid = CAST(:table AS regclass) AND attname = 'embedding' AND NOT attisdropped"
+            ),
+            {"table": self.collection},
+        ).scalar_one()
+        return typmod if typmod > 0 else None
+
+    @scoped
+    def create_index(
+        self,
+        index_type: IndexType | str = IndexType.HNSW,
+        m: int = 16,
+        ef_construction: int = 64,
+        lists: int = 100,
+        concurrently: bool = False,
+    ) -> str:
+        """Creates an HNSW (`m`, `ef_construction`) or IVFFlat (`lists`) index for the collection distance function.
+
+        Requires a typed column (`vector_size`). IVFFlat lists are computed from the rows present when it is built, so
+        create it after loading the data. `concurrently` builds without blocking writes. Returns the index name.
+        """
+        if isinstance(index_type, str):
+            index_type = IndexType(index_type.lower())
+        vector_size = self.__get_vector_size()
+        if vector_size is None:
+            self.__raise_value_error("vector_size")
+
+        query = create_index_query(
+            self.collection,
+            index_type,
+            operator_class(self.distance_function, index_type, self.storage),
+            m,
+            ef_construction,
+            lists,
+            concurrently,
+            self.storage,
+            vector_size,
         )
+        self.conn.commit()
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with self.__engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.execute(text(query))
+
+        return index_name(self.collection, index_type, self.storage)
 
-        self.conn.add(v)
+    @scoped
+    def drop_index(self, index_type: IndexType | str = IndexType.HNSW) -> None:
+        if isinstance(index_type, str):
+            index_type = IndexType(index_type.lower())
+
+        self.conn.execute(text(f"DROP INDEX IF EXISTS {index_name(self.collection, index_type, self.storage)}"))
         self.conn.commit()
 
-    def insert_vectors(self, vectors: list[Vector]) -> None:
+    def create_metadata_index(self, field: str, type: MetadataType | str, concurrently: bool = False) -> str:
+        """Creates a B-tree expression index on `metadata::jsonb -> field`, which serves the `Eq`, `In` and `Range`
+        filters on that key. jsonb values are ordered within their own type (numbers numerically), so any `type` is
+        indexed as is. `concurrently` builds without blocking writes. Returns the index name.
+        """
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with self.__engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.execute(text(create_metadata_index_query(self.collection, field, concurrently)))
+
+        return metadata_index_name(self.collection, field)
+
+    def __set_search_settings(self, params: SearchParams | None, ef_search: int | None, probes: int | None) -> None:
+        # explicit ef_search / probes arguments win over params
+        if params is not None:
+            ef_search = ef_search or params.ef
+            probes = probes or params.nprobe
+        settings = search_settings(
+            ef_search or self.ef_search, probes or self.probes, params is not None and params.exact
+        )
+        for name, value in settings.items():
+            self.conn.execute(text("SELECT set_config(:name, :value, true)"), {"name": name, "value": value})
+
+    def insert_vector(self, vector: Vector) -> None:
+        self.insert_vectors([vector])
+
+    @scoped
+    def insert_vectors(self, vectors: list[Vector] | VectorBatch) -> None:
+        """Inserts or overwrites vectors, one `INSERT ... SELECT FROM unnest(...) ON CONFLICT` per `batch_size`."""
         if len(vectors) == 0:
             return
 
-        v_orms = []
-        for vector in vectors:
-            v_orms.append(
-                self.__vector_orm(
-                    id=vector.get_id(),
-                    embedding=vector.embedding,
-                    metadata_=vector.metadata_to_string(),
+        for batch in iter_batches(vectors, self.batch_size):
+            self.conn.execute(upsert_statement(self.collection), upsert_parameters(batch))
+        self.conn.commit()
+
+    @scoped
+    def bulk_insert_vectors(
+        self,
+        vectors: list[Vector] | VectorBatch | Iterable[VectorBatch | list[Vector]],
+        batch_size: int = 50_000,
+        rebuild_indexes: bool = False,
+        maintenance_workers: int | None = None,
+        maintenance_work_mem: str | None = None,
+    ) -> int:
+        """Loads vectors with binary `COPY`, streamed in batches of `batch_size` rows. Returns the number of rows.
+
+        `vectors` may be an iterable (e.g. a generator) of batches so large loads are never held in memory at once.
+        With `rebuild_indexes` the hnsw / ivfflat indexes of the collection are dropped before the load and built
+        again afterwards using `maintenance_workers` parallel workers. Everything runs in one transaction, a failed
+        load leaves the table and its indexes untouched.
+        """
+        cursor = self.conn.connection().connection.cursor()
+        count = 0
+        try:
+            indexes = self.__drop_vector_indexes() if rebuild_indexes else []
+
+            for batch in iter_batches(vectors, batch_size):
+                cursor.copy_expert(
+                    f"COPY {self.collection} (id, embedding, metadata) FROM STDIN WITH (FORMAT binary)",
+                    io.BytesIO(encode_copy_binary(batch)),
                 )
-            )
+                count += len(batch)
 
-        self.conn.add_all(v_orms)
-        self.conn.commit()
+            if indexes:
+                self.__set_maintenance_settings(maintenance_workers, maintenance_work_mem)
+                for index_definition in indexes:
+                    self.conn.execute(text(index_definition))
 
-    def read_vector(self, id: str) -> Vector | None:
-        v_orm = self.__read_vector_orm(id)
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cursor.close()
 
-        if v_orm is None:
-            return None
+        self.conn.commit()
+        return count
+
+    def __drop_vector_indexes(self) -> list[str]:
+        indexes = self.conn.execute(
+            text(
+                "SELECT indexname, indexdef FROM pg_indexes "
+                "WHERE schemaname = current_schema() AND tablename = :table "
+                "AND (indexdef ILIKE '%USING hnsw%' OR indexdef ILIKE '%USING ivfflat%')"
+            ),
+            {"table": self.collection},
+        ).all()
+
+        for name, _ in indexes:
+            self.conn.execute(text(f'DROP INDEX "{name}"'))
+        return [index_definition for _, index_definition in indexes]
+
+    def __set_maintenance_settings(self, maintenance_workers: int | None, maintenance_work_mem: str | None) -> None:
+        # transaction scoped, the session settings are untouched after commit
+        if maintenance_workers is not None:
+            self.conn.execute(
+                text("SELECT set_config('max_parallel_maintenance_workers', :value, true)"),
+                {"value": str(maintenance_workers)},
+            )
+        if maintenance_work_mem is not None:
+            self.conn.execute(
+                text("SELECT set_config('maintenance_work_mem', :value, true)"),
+                {"value": maintenance_work_mem},
+            )
 
-        vector = Vector(
-            embedding=v_orm.embedding,
-            vector_id=v_orm.id,
-            metadata=v_orm.metadata_,
-        )
-        return vector
+    @scoped
+    def read_vector(self, id: str, include_embedding: bool = True, include_metadata: bool = True) -> Vector | None:
+        row = self.__read_vector_row(id, include_embedding, include_metadata)
 
-    def update_vector(self, vector: Vector) -> Vector:
-        v = self.__read_vector_orm(vector.id)
-        if v is None:
-            raise ValueError("vector not found in database")
+        if row is None:
+            return None
 
-        v.embedding = vector.embedding
-        v.metadata_ = vector.metadata_to_string()
+        return Vector(embedding=row.embedding, vector_id=row.id, metadata=row.metadata)
 
-        self.conn.add(v)
-        self.conn.commit()
+    def update_vector(self, vector: Vector) -> None:
+        self.update_vectors([vector])
 
-    def update_vectors(self, vectors: list[Vector]) -> None:
+    def update_vectors(self, vectors: list[Vector] | VectorBatch) -> None:
         if len(vectors) == 0:
             return
 
-        v_orms = []
-        for vector in vectors:
-            v = self.__read_vector_orm(vector.id)
-            if v is None:
-                raise ValueError(f"vector {vector.id} not found in database")
-
-            v.embedding = vector.embedding
-            v.metadata_ = vector.metadata_to_string()
-            v_orms.append(v)
+        if not isinstance(vectors, VectorBatch) and any(vector.id is None for vector in vectors):
+            self.__raise_value_error("vector id")
 
-        self.conn.add_all(v_orms)
-        self.conn.commit()
+        # same set based upsert as insert, no read per vector
+        self.insert_vectors(vectors)
 
     def delete_vector(self, id: str) -> None:
-        v = self.__read_vector_orm(id)
-        self.conn.delete(v)
-        self.conn.commit()
+        self.delete_vectors([id])
 
+    @scoped
     def delete_vectors(self, ids: list[str] | list[Vector]) -> None:
         if len(ids) == 0:
             return
 
         if isinstance(ids[0], Vector):
-            [self.delete_vector(v.id) for v in ids]
-        else:
-            [self.delete_vector(id_) for id_ in ids]
+            ids = [v.id for v in ids]
+
+        # chunks of `= ANY(:ids)` deletes, committed together
+        for start in range(0, len(ids), self.batch_size):
+            self.conn.execute(delete_statement(self.collection), {"ids": ids[start : start + self.batch_size]})
+        self.conn.commit()
+
+    @scoped
+    def delete_vectors_where(
+        self,
+        metadata: dict | None = None,
+        created_before: datetime | None = None,
+        created_after: datetime | None = None,
+    ) -> int:
+        """Deletes every vector whose metadata contains `metadata` and / or created in the given range.
+
+        Rows are deleted `batch_size` at a time, each chunk in its own transaction so locks are held only briefly.
+        Returns the number of deleted vectors.
+        """
+        statement, parameters = delete_where_statement(self.collection, metadata, created_before, created_after)
+
+        deleted = 0
+        while True:
+            count = self.conn.execute(statement, {**parameters, "limit": self.batch_size}).rowcount
+            self.conn.commit()
+
+            deleted += count
+            if count < self.batch_size:
+                return deleted
 
     def get_neighbor_vectors(
         self,
         vector: Vector,
         n: int = 5,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+        ef_search: int | None = None,
+        probes: int | None = None,
     ) -> list[VectorDistance]:
-        vectordistances = []
-        distance_func = self.__get_distance_function(self.distance_function)
+        return self.get_neighbor_results(
+            vector,
+            n,
+            filter,
+            include_embedding=include_embedding,
+            include_metadata=include_metadata,
+            params=params,
+            ef_search=ef_search,
+            probes=probes,
+        ).to_vector_distances()
+
+    @scoped
+    def get_neighbor_results(
+        self,
+        vector: Vector,
+        n: int = 5,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+        ef_search: int | None = None,
+        probes: int | None = None,
+    ) -> SearchResult:
+        # index settings are transaction local, the read transaction ends with the query
+        self.__set_search_settings(params, ef_search, probes)
+        rows = self.__fetch_prepared(
+            search_query,
+            "text",
+            vector_texts([vector.embedding_to_list()])[0],
+            n,
+            filter,
+            self.__search_options(include_embedding, include_metadata, params),
+        )
+        self.conn.commit()
 
-        q = self.conn.execute(
-            select(self.__vector_orm, distance_func(vector.embedding).label("distance"))
-            .order_by(distance_func(vector.embedding))
-            .limit(n)
+        return self.__to_search_result(rows, include_embedding, include_metadata)
+
+    def get_neighbor_vectors_batch(
+        self,
+        vectors: list[Vector] | VectorBatch,
+        n: int = 5,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+        ef_search: int | None = None,
+        probes: int | None = None,
+    ) -> list[list[VectorDistance]]:
+        results = self.get_neighbor_results_batch(
+            vectors,
+            n,
+            filter,
+            include_embedding=include_embedding,
+            include_metadata=include_metadata,
+            params=params,
+            ef_search=ef_search,
+            probes=probes,
         )
-        results: tuple[list[VectorORM]] = q.all()
+        return [result.to_vector_distances() for result in results]
 
-        for r in results:
-            vector = Vector(
-                embedding=r[0].embedding,
-                vector_id=r[0].id,
-                metadata=r[0].metadata_,
-            )
-            distance = r[1]
-            vectordistances.append(VectorDistance(vector, distance))
-        return vectordistances
-
-    def __get_distance_function(self, distance_function: DistanceFunction | str) -> Any:
-        if isinstance(distance_function, str):
-            distance_function = DistanceFunction.from_str(distance_function)
-
-        if distance_function == DistanceFunction.L2:
-            return self.__vector_orm.embedding.l2_distance
-        elif distance_function == DistanceFunction.MAX_INNER_PRODUCT:
-            return self.__vector_orm.embedding.max_inner_product
-        elif distance_function == DistanceFunction.COSINE:
-            return self.__vector_orm.embedding.cosine_distance
-        elif distance_function == DistanceFunction.L1:
-            return self.__vector_orm.embedding.l1_distance
-        elif distance_function == DistanceFunction.HAMMING:
-            return self.__vector_orm.embedding.hamming_distance
-        elif distance_function == DistanceFunction.JACCARD:
-            return self.__vector_orm.embedding.jaccard_distance
+    @scoped
+    def get_neighbor_results_batch(
+        self,
+        vectors: list[Vector] | VectorBatch,
+        n: int = 5,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+        ef_search: int | None = None,
+        probes: int | None = None,
+    ) -> list[SearchResult]:
+        if len(vectors) == 0:
+            return []
+
+        if isinstance(vectors, VectorBatch):
+            embeddings = vectors.embeddings_to_list()
         else:
-            d_ = [
-                "L2",
-                "MAX_INNER_PRODUCT",
-                "COSINE",
-                "L1",
-                "HAMMING",
-                "JACCARD",
-            ]
-            raise ValueError(f"distance function unavailable on pgvector: : {d_}")
-
-    def __read_vector_orm(self, id: str) -> VectorORM | None:
-        v = self.conn.execute(select(self.__vector_orm).where(self.__vector_orm.id == id)).one_or_none()
-
-        if v is None:
-            return None
+            embeddings = [vector.embedding_to_list() for vector in vectors]
+
+        # every query is answered by one LATERAL top-n subquery, all in a single round trip
+        self.__set_search_settings(params, ef_search, probes)
+        rows = self.__fetch_prepared(
+            batch_search_query,
+            "text[]",
+            vector_texts(embeddings),
+            n,
+            filter,
+            self.__search_options(include_embedding, include_metadata, params),
+        )
+        self.conn.commit()
+
+        neighbors = [[] for _ in embeddings]
+        for row in rows:
+            neighbors[row[0] - 1].append(row[1:])
+        return [self.__to_search_result(query_rows, include_embedding, include_metadata) for query_rows in neighbors]
+
+    def __fetch_prepared(
+        self,
+        build_query: Callable[..., str],
+        embeddings_type: str,
+        embeddings: str | list[str],
+        n: int,
+        filter: Filter | None,
+        options: dict,
+    ) -> list[tuple]:
+        """Runs the search on the raw DBAPI connection, as a server side prepared statement created once per pooled
+        connection (planned once, no SQLAlchemy compilation or ORM hydration per call)."""
+        if self.pgbouncer:
+            # transaction pooling, a statement prepared on one server connection is gone on the next
+            placeholder = "%(p{})s".format
+        else:
+            placeholder = "${}".format
+
+        parameters = [(embeddings, embeddings_type), (n, "int")]
+        if filter is not None:
+            options["where"], filter_parameters = where_clause(filter, placeholder, 3)
+            parameters.extend(filter_parameters)
+        query = build_query(self.collection, placeholder(1), placeholder(2), **options)
+
+        connection = self.conn.connection().connection
+        cursor = connection.cursor()
+        try:
+            if self.pgbouncer:
+                # literal % (the jaccard operator, metadata keys) escaped from the pyformat placeholders
+                cursor.execute(
+                    LITERAL_PERCENT.sub("%%", query), {f"p{i}": value for i, (value, _) in enumerate(parameters, 1)}
+                )
+                return cursor.fetchall()
+
+            # statements prepared on this connection, kept with the pool record of the DBAPI connection
+            prepared = connection.info.setdefault("pyvectordb_prepared", {})
+            statement = prepared.get(query)
+            if statement is None:
+                statement = f"pyvectordb_search_{len(prepared)}"
+                cursor.execute(f"PREPARE {statement}({', '.join(type_ for _, type_ in parameters)}) AS {query}")
+                prepared[query] = statement
+
+            cursor.execute(
+                f"EXECUTE {statement}({', '.join(['%s'] * len(parameters))})", [value for value, _ in parameters]
+            )
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def __search_options(self, include_embedding: bool, include_metadata: bool, params: SearchParams | None) -> dict:
+        return {
+            "operator": distance_operator(self.distance_function),
+            "storage": self.storage,
+            "vector_size": self.vector_size,
+            "rerank": search_rerank(self.rerank, params),
+            "include_embedding": include_embedding,
+            "include_metadata": include_metadata,
+        }
+
+    @staticmethod
+    def __to_search_result(rows: list[tuple], include_embedding: bool, include_metadata: bool) -> SearchResult:
+        return SearchResult(
+            ids=[row[0] for row in rows],
+            distances=[row[3] for row in rows],
+            embeddings=decode_embeddings([row[1] for row in rows]) if include_embedding else None,
+            # json text is only decoded when the metadata of the result is read
+            metadata=[row[2] for row in rows] if include_metadata else None,
+        )
 
-        return v[0]
+    def __read_vector_row(self, id: str, include_embedding: bool, include_metadata: bool) -> Row | None:
+        statement = read_statement(self.__vector_orm, id, include_embedding, include_metadata)
+        return self.conn.execute(statement).one_or_none()
 
 
-__all__ = ["PgvectorDB"]
+__all__ = ["PgvectorDB", "IndexType", "StorageType"]
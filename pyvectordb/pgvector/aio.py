@@ -0,0 +1,419 @@
+from asyncio import current_task
+from datetime import datetime
+
+from sqlalchemy import Row, text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_scoped_session,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from pyvectordb.async_driver import AsyncVectorDB
+from pyvectordb.distance_function import DistanceFunction
+from pyvectordb.filter import Filter
+from pyvectordb.metadata_type import MetadataType
+from pyvectordb.search_params import SearchParams
+from pyvectordb.search_result import SearchResult
+from pyvectordb.vector import Vector
+from pyvectordb.vector_batch import VectorBatch
+from pyvectordb.vector_distance import VectorDistance
+
+from .bulk import (
+    delete_statement,
+    delete_where_statement,
+    iter_batches,
+    upsert_parameters,
+    upsert_statement,
+    vector_texts,
+)
+from .filter import where_clause
+from .index import (
+    IndexType,
+    StorageType,
+    create_index_query,
+    create_metadata_index_query,
+    index_name,
+    metadata_index_name,
+    operator_class,
+    search_rerank,
+    search_settings,
+)
+from .model import VectorORM, get_vector_orm, read_statement
+from .raw import batch_search_query, decode_embeddings, distance_operator
+from .session import async_scoped, asyncpg_connect_args, engine_options, track_engine
+
+
+class AsyncPgvectorDB(AsyncVectorDB):
+    def __init__(
+        self,
+        host: str,
+        port: str,
+        user: str,
+        password: str,
+        db_name: str,
+        collection: str,
+        distance_function: DistanceFunction | str = DistanceFunction.L2,
+        batch_size: int = 1000,
+        vector_size: int | None = None,
+        ef_search: int | None = None,
+        probes: int | None = None,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pgbouncer: bool = False,
+        storage: StorageType | str = StorageType.VECTOR,
+        rerank: int | None = None,
+        debug: bool = False,
+    ) -> None:
+        super().__init__(host, port, debug)
+
+        self.db_user = user or self.__raise_value_error("db_user")
+        self.db_password = password or self.__raise_value_error("db_password")
+        self.db_host = host or self.__raise_value_error("db_host")
+        self.db_port = port or self.__raise_value_error("db_port")
+        self.db_name = db_name or self.__raise_value_error("db_name")
+        self.collection = collection or self.__raise_value_error("collection")
+        self.distance_function = distance_function or self.__raise_value_error("distance_function")
+        self.batch_size = batch_size or self.__raise_value_error("batch_size")
+        self.vector_size = vector_size
+        self.ef_search = ef_search
+        self.probes = probes
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.pgbouncer = pgbouncer
+        self.storage = StorageType(storage.lower()) if isinstance(storage, str) else storage
+        self.rerank = rerank
+        if self.storage != StorageType.VECTOR and not self.vector_size:
+            # halfvec / bit casts need the dimension
+            self.__raise_value_error("vector_size")
+
+        self.__engine: AsyncEngine = None
+        self.conn: async_scoped_session[AsyncSession] = None
+        self.__vector_orm: VectorORM = get_vector_orm(self.collection)
+
+    @staticmethod
+    def __raise_value_error(param: str):
+        raise ValueError(f"{param} is required")
+
+    async def _connect(self) -> None:
+        if self.__engine is None:
+            # vectors are bound as text and cast server side, asyncpg needs no vector codec
+            self.__engine = create_async_engine(
+                f"postgresql+asyncpg://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
+                + ("?prepared_statement_cache_size=0" if self.pgbouncer else ""),
+                connect_args=asyncpg_connect_args(self.pgbouncer),
+                **engine_options(self.pool_size, self.max_overflow, self.pgbouncer),
+            )
+            track_engine(self.__engine.sync_engine)
+            # one session per task, concurrent tasks (asyncio.gather) each get their own pooled connection
+            self.conn = async_scoped_session(
+                async_sessionmaker(self.__engine, autoflush=False, expire_on_commit=False),
+                scopefunc=current_task,
+            )
+
+        await self.__init_collection()
+
+    async def close(self) -> None:
+        if self.conn is not None:
+            await self.conn.remove()
+            self.conn = None
+        if self.__engine is not None:
+            await self.__engine.dispose()
+            self.__engine = None
+
+    @async_scoped
+    async def __init_collection(self) -> None:
+        embedding_type = f"vector({int(self.vector_size)})" if self.vector_size else "vector"
+        query = f"""
+CREATE TABLE IF NOT EXISTS {self.collection} (
+    id text PRIMARY KEY,
+    embedding {embedding_type},
+    metadata text,
+    created_at timestamptz DEFAULT now()
+);
+"""
+        await self.conn.execute(text(query))
+
+        if self.vector_size and await self.__get_vector_size() is None:
+            await self.conn.execute(text(f"ALTER TABLE {self.collection} ALTER COLUMN embedding TYPE {embedding_type}"))
+        await self.conn.commit()
+
+    async def __get_vector_size(self) -> int | None:
+        typmod = (
+            await self.conn.execute(
+                text(
+                    "SELECT atttypmod FROM pg_attribute "
+                    "WHERE attrelid = CAST(:table AS regclass) AND attname = 'embedding' AND NOT attisdropped"
+                ),
+                {"table": self.collection},
+            )
+        ).scalar_one()
+        return typmod if typmod > 0 else None
+
+    @async_scoped
+    async def create_index(
+        self,
+        index_type: IndexType | str = IndexType.HNSW,
+        m: int = 16,
+        ef_construction: int = 64,
+        lists: int = 100,
+        concurrently: bool = False,
+    ) -> str:
+        """Async counterpart of `PgvectorDB.create_index`."""
+        if isinstance(index_type, str):
+            index_type = IndexType(index_type.lower())
+        vector_size = await self.__get_vector_size()
+        if vector_size is None:
+            self.__raise_value_error("vector_size")
+
+        query = create_index_query(
+            self.collection,
+            index_type,
+            operator_class(self.distance_function, index_type, self.storage),
+            m,
+            ef_construction,
+            lists,
+            concurrently,
+            self.storage,
+            vector_size,
+        )
+        await self.conn.commit()
+        async with self.__engine.connect() as connection:
+            connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+            await connection.execute(text(query))
+
+        return index_name(self.collection, index_type, self.storage)
+
+    @async_scoped
+    async def drop_index(self, index_type: IndexType | str = IndexType.HNSW) -> None:
+        if isinstance(index_type, str):
+            index_type = IndexType(index_type.lower())
+
+        await self.conn.execute(text(f"DROP INDEX IF EXISTS {index_name(self.collection, index_type, self.storage)}"))
+        await self.conn.commit()
+
+    async def create_metadata_index(self, field: str, type: MetadataType | str, concurrently: bool = False) -> str:
+        """Async counterpart of `PgvectorDB.create_metadata_index`."""
+        async with self.__engine.connect() as connection:
+            connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+            await connection.execute(text(create_metadata_index_query(self.collection, field, concurrently)))
+
+        return metadata_index_name(self.collection, field)
+
+    async def __set_search_settings(
+        self, params: SearchParams | None, ef_search: int | None, probes: int | None
+    ) -> None:
+        # explicit ef_search / probes arguments win over params
+        if params is not None:
+            ef_search = ef_search or params.ef
+            probes = probes or params.nprobe
+        settings = search_settings(
+            ef_search or self.ef_search, probes or self.probes, params is not None and params.exact
+        )
+        for name, value in settings.items():
+            await self.conn.execute(text("SELECT set_config(:name, :value, true)"), {"name": name, "value": value})
+
+    async def insert_vector(self, vector: Vector) -> None:
+        await self.insert_vectors([vector])
+
+    @async_scoped
+    async def insert_vectors(self, vectors: list[Vector] | VectorBatch) -> None:
+        if len(vectors) == 0:
+            return
+
+        for batch in iter_batches(vectors, self.batch_size):
+            await self.conn.execute(upsert_statement(self.collection), upsert_parameters(batch))
+        await self.conn.commit()
+
+    @async_scoped
+    async def read_vector(
+        self, id: str, include_embedding: bool = True, include_metadata: bool = True
+    ) -> Vector | None:
+        row = await self.__read_vector_row(id, include_embedding, include_metadata)
+
+        if row is None:
+            return None
+
+        return Vector(embedding=row.embedding, vector_id=row.id, metadata=row.metadata)
+
+    async def update_vector(self, vector: Vector) -> None:
+        await self.update_vectors([vector])
+
+    async def update_vectors(self, vectors: list[Vector] | VectorBatch) -> None:
+        if len(vectors) == 0:
+            return
+
+        if not isinstance(vectors, VectorBatch) and any(vector.id is None for vector in vectors):
+            self.__raise_value_error("vector id")
+
+        await self.insert_vectors(vectors)
+
+    async def delete_vector(self, id: str) -> None:
+        await self.delete_vectors([id])
+
+    @async_scoped
+    async def delete_vectors(self, ids: list[str] | list[Vector]) -> None:
+        if len(ids) == 0:
+            return
+
+        if isinstance(ids[0], Vector):
+            ids = [v.id for v in ids]
+
+        for start in range(0, len(ids), self.batch_size):
+            await self.conn.execute(delete_statement(self.collection), {"ids": ids[start : start + self.batch_size]})
+        await self.conn.commit()
+
+    @async_scoped
+    async def delete_vectors_where(
+        self,
+        metadata: dict | None = None,
+        created_before: datetime | None = None,
+        created_after: datetime | None = None,
+    ) -> int:
+        statement, parameters = delete_where_statement(self.collection, metadata, created_before, created_after)
+
+        deleted = 0
+        while True:
+            count = (await self.conn.execute(statement, {**parameters, "limit": self.batch_size})).rowcount
+            await self.conn.commit()
+
+            deleted += count
+            if count < self.batch_size:
+                return deleted
+
+    async def get_neighbor_vectors(
+        self,
+        vector: Vector,
+        n: int = 5,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+        ef_search: int | None = None,
+        probes: int | None = None,
+    ) -> list[VectorDistance]:
+        return (
+            await self.get_neighbor_results(
+                vector,
+                n,
+                filter,
+                include_embedding=include_embedding,
+                include_metadata=include_metadata,
+                params=params,
+                ef_search=ef_search,
+                probes=probes,
+            )
+        ).to_vector_distances()
+
+    async def get_neighbor_results(
+        self,
+        vector: Vector,
+        n: int = 5,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+        ef_search: int | None = None,
+        probes: int | None = None,
+    ) -> SearchResult:
+        return (
+            await self.get_neighbor_results_batch(
+                [vector],
+                n,
+                filter,
+                include_embedding,
+                include_metadata,
+                params,
+                ef_search=ef_search,
+                probes=probes,
+            )
+        )[0]
+
+    async def get_neighbor_vectors_batch(
+        self,
+        vectors: list[Vector] | VectorBatch,
+        n: int = 5,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+        ef_search: int | None = None,
+        probes: int | None = None,
+    ) -> list[list[VectorDistance]]:
+        results = await self.get_neighbor_results_batch(
+            vectors,
+            n,
+            filter,
+            include_embedding=include_embedding,
+            include_metadata=include_metadata,
+            params=params,
+            ef_search=ef_search,
+            probes=probes,
+        )
+        return [result.to_vector_distances() for result in results]
+
+    @async_scoped
+    async def get_neighbor_results_batch(
+        self,
+        vectors: list[Vector] | VectorBatch,
+        n: int = 5,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+        ef_search: int | None = None,
+        probes: int | None = None,
+    ) -> list[SearchResult]:
+        if len(vectors) == 0:
+            return []
+
+        if isinstance(vectors, VectorBatch):
+            embeddings = vectors.embeddings_to_list()
+        else:
+            embeddings = [vector.embedding_to_list() for vector in vectors]
+
+        # same single round trip LATERAL top-n query as PgvectorDB.get_neighbor_vectors_batch
+        options = self.__search_options(include_embedding, include_metadata, params)
+        parameters = [vector_texts(embeddings), n]
+        if filter is not None:
+            options["where"], filter_parameters = where_clause(filter, "${}".format, 3)
+            parameters.extend(value for value, _ in filter_parameters)
+
+        await self.__set_search_settings(params, ef_search, probes)
+        connection = await (await self.conn.connection()).get_raw_connection()
+        # straight on the asyncpg connection, which prepares the statement once and caches it per connection
+        records = await connection.driver_connection.fetch(
+            batch_search_query(self.collection, **options),
+            *parameters,
+        )
+        await self.conn.commit()
+
+        neighbors = [[] for _ in embeddings]
+        for record in records:
+            neighbors[record[0] - 1].append(tuple(record)[1:])
+        return [self.__to_search_result(query_rows, include_embedding, include_metadata) for query_rows in neighbors]
+
+    def __search_options(self, include_embedding: bool, include_metadata: bool, params: SearchParams | None) -> dict:
+        return {
+            "operator": distance_operator(self.distance_function),
+            "storage": self.storage,
+            "vector_size": self.vector_size,
+            "rerank": search_rerank(self.rerank, params),
+            "include_embedding": include_embedding,
+            "include_metadata": include_metadata,
+        }
+
+    @staticmethod
+    def __to_search_result(rows: list[tuple], include_embedding: bool, include_metadata: bool) -> SearchResult:
+        return SearchResult(
+            ids=[row[0] for row in rows],
+            distances=[row[3] for row in rows],
+            embeddings=decode_embeddings([row[1] for row in rows]) if include_embedding else None,
+            # json text is only decoded when the metadata of the result is read
+            metadata=[row[2] for row in rows] if include_metadata else None,
+        )
+
+    async def __read_vector_row(self, id: str, include_embedding: bool, include_metadata: bool) -> Row | None:
+        statement = read_statement(self.__vector_orm, id, include_embedding, include_metadata)
+        return (await self.conn.execute(statement)).one_or_none()
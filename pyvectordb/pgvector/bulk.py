@@ -0,0 +1,135 @@
+import json
+import struct
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+
+from sqlalchemy import DateTime, String, TextClause, bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from pyvectordb.vector import Vector
+from pyvectordb.vector_batch import VectorBatch
+
+# PGCOPY signature, flags and header extension length of the binary COPY format
+COPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+COPY_TRAILER = struct.pack(">h", -1)
+
+
+def iter_batches(
+    vectors: list[Vector] | VectorBatch | Iterable[VectorBatch | list[Vector]], batch_size: int
+) -> Iterator[VectorBatch]:
+    """Splits the input into `VectorBatch` chunks of at most `batch_size` rows, iterables are consumed lazily."""
+    if isinstance(vectors, VectorBatch) or (isinstance(vectors, list) and vectors and isinstance(vectors[0], Vector)):
+        vectors = [vectors]
+
+    for batch in vectors:
+        if len(batch) == 0:
+            continue
+        if not isinstance(batch, VectorBatch):
+            batch = VectorBatch.from_vectors(batch)
+
+        for start in range(0, len(batch), batch_size):
+            end = start + batch_size
+            yield VectorBatch(batch.embeddings[start:end], batch.ids[start:end], batch.metadata[start:end])
+
+
+def encode_copy_binary(batch: VectorBatch) -> bytes:
+    """Encodes `(id, embedding, metadata)` rows in the binary COPY format, embeddings in pgvector's `vector_recv`
+    layout (int16 dim, int16 unused, big-endian float32 values)."""
+    dim = batch.embeddings.shape[1]
+
+    # the embedding field (length, dim, unused, values) is the same size for every row, encoded in one pass
+    embedding_prefix = struct.pack(">ihh", 4 + 4 * dim, dim, 0)
+    embeddings = batch.embeddings.astype(">f4").tobytes()
+    row_bytes = 4 * dim
+
+    chunks = [COPY_HEADER]
+    for i, (id_, metadata) in enumerate(zip(batch.ids, batch.metadata_to_strings(), strict=True)):
+        id_ = str(id_).encode()
+        metadata = metadata.encode()
+        chunks.append(struct.pack(">hi", 3, len(id_)))
+        chunks.append(id_)
+        chunks.append(embedding_prefix)
+        chunks.append(embeddings[i * row_bytes : (i + 1) * row_bytes])
+        chunks.append(struct.pack(">i", len(metadata)))
+        chunks.append(metadata)
+    chunks.append(COPY_TRAILER)
+
+    return b"".join(chunks)
+
+
+def vector_texts(embeddings: list[list[float]]) -> list[str]:
+    """Embeddings in pgvector's text format, bound as `text[]` and cast server side (no vector codec needed)."""
+    return ["[" + ",".join(map(str, embedding)) + "]" for embedding in embeddings]
+
+
+def upsert_statement(table: str) -> TextClause:
+    """Set based upsert of one batch, the columns are bound as three arrays and zipped back into rows by `unnest`."""
+    return text(
+        f"""
+INSERT INTO {table} (id, embedding, metadata)
+SELECT id, embedding::vector, metadata
+FROM unnest(CAST(:ids AS text[]), CAST(:embeddings AS text[]), CAST(:metadata AS text[])) AS rows(id, embedding, metadata)
+ON CONFLICT (id) DO UPDATE SET embedding = EXCLUDED.embedding, metadata = EXCLUDED.metadata
+"""
+    ).bindparams(
+        bindparam("ids", type_=ARRAY(String)),
+        bindparam("embeddings", type_=ARRAY(String)),
+        bindparam("metadata", type_=ARRAY(String)),
+    )
+
+
+def upsert_parameters(batch: VectorBatch) -> dict[str, list]:
+    """Bound arrays of `upsert_statement`. ON CONFLICT can not touch a row twice in one statement, so a repeated id
+    keeps its last row, like the same rows upserted one by one."""
+    ids = [str(id_) for id_ in batch.ids]
+    last = {id_: i for i, id_ in enumerate(ids)}
+    if len(last) != len(ids):
+        batch = VectorBatch(
+            batch.embeddings[list(last.values())], list(last), [batch.metadata[i] for i in last.values()]
+        )
+        ids = list(last)
+
+    return {
+        "ids": ids,
+        "embeddings": vector_texts(batch.embeddings.tolist()),
+        "metadata": batch.metadata_to_strings(),
+    }
+
+
+def delete_statement(table: str) -> TextClause:
+    return text(f"DELETE FROM {table} WHERE id = ANY(CAST(:ids AS text[]))").bindparams(
+        bindparam("ids", type_=ARRAY(String))
+    )
+
+
+def delete_where_statement(
+    table: str,
+    metadata: dict | None = None,
+    created_before: datetime | None = None,
+    created_after: datetime | None = None,
+) -> tuple[TextClause, dict]:
+    """Deletes up to `:limit` rows matching every given predicate, metadata is matched by jsonb containment."""
+    conditions, parameters = [], {}
+    if metadata is not None:
+        conditions.append("metadata::jsonb @> CAST(:metadata AS jsonb)")
+        parameters["metadata"] = json.dumps(metadata)
+    if created_before is not None:
+        conditions.append("created_at < :created_before")
+        parameters["created_before"] = created_before
+    if created_after is not None:
+        conditions.append("created_at >= :created_after")
+        parameters["created_after"] = created_after
+
+    if not conditions:
+        raise ValueError("at least one of metadata, created_before or created_after is required")
+
+    statement = text(
+        f"DELETE FROM {table} WHERE id IN (SELECT id FROM {table} WHERE {' AND '.join(conditions)} LIMIT :limit)"
+    ).bindparams(
+        *[
+            bindparam(name, type_=DateTime(timezone=True))
+            for name in ("created_before", "created_after")
+            if name in parameters
+        ]
+    )
+    return statement, parameters
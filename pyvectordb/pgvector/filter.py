@@ -0,0 +1,65 @@
+import json
+from collections.abc import Callable
+
+from pyvectordb.filter import And, Eq, Filter, In, Not, Range, push_down_not
+
+OPERATORS = {"gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+
+def where_clause(
+    filter: Filter,
+    placeholder: Callable[[int], str],
+    start: int,
+) -> tuple[str, list[tuple[str | list[str], str]]]:
+    """Compiles to a condition on `metadata::jsonb`, returns the SQL and its (value, type) parameters, numbered from
+    `start` with `placeholder`.
+
+    Every condition compares the `metadata::jsonb -> 'key'` value with the key as a literal, so the expression index
+    of `create_metadata_index` serves equality, membership and ranges. Missing keys never match.
+    """
+    parameters = []
+
+    def bind(value: str | list[str], type_: str) -> str:
+        parameters.append((value, type_))
+        return placeholder(start + len(parameters) - 1)
+
+    def compile_(filter: Filter) -> str:
+        if isinstance(filter, Eq):
+            return f"{metadata_field(filter.key)} = CAST({bind(json.dumps(filter.value), 'text')} AS jsonb)"
+        if isinstance(filter, In):
+            values = [json.dumps(value) for value in filter.values]
+            return f"{metadata_field(filter.key)} = ANY(CAST({bind(values, 'text[]')} AS jsonb[]))"
+        if isinstance(filter, Range):
+            # jsonb orders values of different types too, a numeric bound would also match strings, booleans, ...
+            guards = sorted({jsonb_type(value) for _, value in filter.bounds()} - {None})
+            return " AND ".join(
+                [f"jsonb_typeof({metadata_field(filter.key)}) = '{type_}'" for type_ in guards]
+                + [
+                    f"{metadata_field(filter.key)} {OPERATORS[name]} CAST({bind(json.dumps(value), 'text')} AS jsonb)"
+                    for name, value in filter.bounds()
+                ]
+            )
+        if isinstance(filter, Not):
+            # a missing key compares as NULL, which NOT would keep NULL
+            return f"NOT coalesce({compile_(filter.filter)}, false)"
+
+        separator = " AND " if isinstance(filter, And) else " OR "
+        return separator.join(f"({compile_(f)})" for f in filter.filters)
+
+    return compile_(push_down_not(filter)), parameters
+
+
+def metadata_field(key: str) -> str:
+    """The jsonb value of a metadata key, the same expression in queries and in the metadata index."""
+    return f"(metadata::jsonb -> '{key.replace("'", "''")}')"
+
+
+def jsonb_type(value) -> str | None:
+    """`jsonb_typeof` of a range bound, None for bounds that are not numbers or strings."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    return None
@@ -0,0 +1,156 @@
+import math
+import re
+from enum import Enum
+
+from pyvectordb.distance_function import DistanceFunction
+from pyvectordb.search_params import SearchParams
+
+from .filter import metadata_field
+
+INDEX_NAME_INVALID = re.compile(r"\W")
+
+
+class IndexType(Enum):
+    """pgvector approximate nearest neighbor index methods"""
+
+    HNSW = "hnsw"
+    IVFFLAT = "ivfflat"
+
+
+class StorageType(Enum):
+    """Representation searched by the index, `halfvec` (half precision) and `bit` (binary quantization) are indexed
+    expressions over the full precision `embedding` column, which is kept for re-ranking."""
+
+    VECTOR = "vector"
+    HALFVEC = "halfvec"
+    BIT = "bit"
+
+
+class OperatorClass(Enum):
+    """pgvector operator classes, an index only serves queries using the distance of its operator class"""
+
+    L2 = "vector_l2_ops"
+    INNER_PRODUCT = "vector_ip_ops"
+    COSINE = "vector_cosine_ops"
+    L1 = "vector_l1_ops"
+    HALFVEC_L2 = "halfvec_l2_ops"
+    HALFVEC_INNER_PRODUCT = "halfvec_ip_ops"
+    HALFVEC_COSINE = "halfvec_cosine_ops"
+    HALFVEC_L1 = "halfvec_l1_ops"
+    BIT_HAMMING = "bit_hamming_ops"
+
+
+def compact(expression: str, storage: StorageType, vector_size: int | None) -> str:
+    """`expression` (a `vector`) in the representation of `storage`."""
+    if storage == StorageType.HALFVEC:
+        return f"({expression})::halfvec({int(vector_size)})"
+    elif storage == StorageType.BIT:
+        return f"binary_quantize({expression})::bit({int(vector_size)})"
+    return expression
+
+
+def index_name(table: str, index_type: IndexType, storage: StorageType = StorageType.VECTOR) -> str:
+    if storage == StorageType.VECTOR:
+        return f"{table}_embedding_{index_type.value}_idx"
+    return f"{table}_embedding_{storage.value}_{index_type.value}_idx"
+
+
+def create_index_query(
+    table: str,
+    index_type: IndexType,
+    operator_class: OperatorClass,
+    m: int,
+    ef_construction: int,
+    lists: int,
+    concurrently: bool,
+    storage: StorageType = StorageType.VECTOR,
+    vector_size: int | None = None,
+) -> str:
+    if index_type == IndexType.HNSW:
+        options = f"m = {int(m)}, ef_construction = {int(ef_construction)}"
+    else:
+        options = f"lists = {int(lists)}"
+
+    # expression indexes need the expression in parentheses
+    key = "embedding" if storage == StorageType.VECTOR else f"({compact('embedding', storage, vector_size)})"
+
+    return (
+        f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS {index_name(table, index_type, storage)} "
+        f"ON {table} USING {index_type.value} ({key} {operator_class.value}) WITH ({options})"
+    )
+
+
+def metadata_index_name(table: str, field: str) -> str:
+    return f"{table}_metadata_{INDEX_NAME_INVALID.sub('_', field)}_idx"
+
+
+def create_metadata_index_query(table: str, field: str, concurrently: bool) -> str:
+    """B-tree index on the jsonb value of one metadata key, it serves equality, membership and range filters."""
+    return (
+        f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS {metadata_index_name(table, field)} "
+        f"ON {table} ({metadata_field(field)})"
+    )
+
+
+def search_settings(ef_search: int | None, probes: int | None, exact: bool = False) -> dict[str, str]:
+    """Index search settings of one query, applied with `set_config(..., is_local => true)` (`SET LOCAL`).
+
+    `exact` turns index scans off, the planner then orders every (filtered) row by its exact distance.
+    """
+    settings = {}
+    if ef_search is not None:
+        settings["hnsw.ef_search"] = str(int(ef_search))
+    if probes is not None:
+        settings["ivfflat.probes"] = str(int(probes))
+    if exact:
+        settings["enable_indexscan"] = "off"
+    return settings
+
+
+def search_rerank(rerank: int | None, params: SearchParams | None) -> int | None:
+    """Re-rank factor of one query over compact storage, `rescore=False` turns re-ranking off and `oversampling`
+    overrides the factor."""
+    if params is None:
+        return rerank
+    if params.rescore is False:
+        return None
+    if params.oversampling is not None:
+        return math.ceil(params.oversampling)
+    if params.rescore and not rerank:
+        # the n compact candidates ordered by their exact distance
+        return 1
+    return rerank
+
+
+def operator_class(
+    distance_function: DistanceFunction | str,
+    index_type: IndexType,
+    storage: StorageType = StorageType.VECTOR,
+) -> OperatorClass:
+    if isinstance(distance_function, str):
+        distance_function = DistanceFunction.from_str(distance_function)
+
+    # binary quantized candidates are always ordered by hamming distance, distance_function applies to the re-rank
+    if storage == StorageType.BIT:
+        return OperatorClass.BIT_HAMMING
+
+    if distance_function == DistanceFunction.L2:
+        operator_class_ = OperatorClass.L2
+    elif distance_function == DistanceFunction.MAX_INNER_PRODUCT:
+        operator_class_ = OperatorClass.INNER_PRODUCT
+    elif distance_function == DistanceFunction.COSINE:
+        operator_class_ = OperatorClass.COSINE
+    elif distance_function == DistanceFunction.L1 and index_type == IndexType.HNSW:
+        operator_class_ = OperatorClass.L1
+    else:
+        d_ = [
+            "L2",
+            "MAX_INNER_PRODUCT",
+            "COSINE",
+            "L1 (hnsw only)",
+        ]
+        raise ValueError(f"distance function unavailable on pgvector {index_type.value} index: {d_}")
+
+    if storage == StorageType.HALFVEC:
+        return OperatorClass[f"HALFVEC_{operator_class_.name}"]
+    return operator_class_
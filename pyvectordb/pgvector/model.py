@@ -1,7 +1,8 @@
 from datetime import datetime
+from functools import cache
 
 from pgvector.sqlalchemy import Vector
-from sqlalchemy import Column, DateTime, String
+from sqlalchemy import Column, DateTime, Select, String, null, select
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -21,8 +22,19 @@ class VectorORM(Base):
     created_at: Mapped[datetime] = Column(DateTime, nullable=False, default=datetime.now())
 
 
+# one mapped class per table, a table can only be declared once per metadata
+@cache
 def get_vector_orm(tablename: str) -> "VectorORM":
     class VectorORMreal(VectorORM):
         __tablename__ = tablename
 
     return VectorORMreal
+
+
+def read_statement(vector_orm: type[VectorORM], id: str, include_embedding: bool, include_metadata: bool) -> Select:
+    """Selects the `id`, `embedding` and `metadata` columns of one row, the ones left out as NULL."""
+    return select(
+        vector_orm.id,
+        vector_orm.embedding if include_embedding else null().label("embedding"),
+        vector_orm.metadata_.label("metadata") if include_metadata else null().label("metadata"),
+    ).where(vector_orm.id == id)
@@ -0,0 +1,115 @@
+from collections.abc import Sequence
+
+import numpy as np
+
+from pyvectordb.distance_function import DistanceFunction
+
+from .index import StorageType, compact
+
+
+def distance_operator(distance_function: DistanceFunction | str) -> str:
+    if isinstance(distance_function, str):
+        distance_function = DistanceFunction.from_str(distance_function)
+
+    if distance_function == DistanceFunction.L2:
+        return "<->"
+    elif distance_function == DistanceFunction.MAX_INNER_PRODUCT:
+        return "<#>"
+    elif distance_function == DistanceFunction.COSINE:
+        return "<=>"
+    elif distance_function == DistanceFunction.L1:
+        return "<+>"
+    elif distance_function == DistanceFunction.HAMMING:
+        return "<~>"
+    elif distance_function == DistanceFunction.JACCARD:
+        return "<%>"
+    else:
+        d_ = [
+            "L2",
+            "MAX_INNER_PRODUCT",
+            "COSINE",
+            "L1",
+            "HAMMING",
+            "JACCARD",
+        ]
+        raise ValueError(f"distance function unavailable on pgvector: : {d_}")
+
+
+def neighbors_query(
+    table: str,
+    query: str,
+    n: str,
+    operator: str,
+    storage: StorageType = StorageType.VECTOR,
+    vector_size: int | None = None,
+    rerank: int | None = None,
+    where: str | None = None,
+    include_embedding: bool = True,
+    include_metadata: bool = True,
+) -> str:
+    """Top-n rows of `table` for the `query` vector expression. Embeddings are selected in `vector_send` binary form,
+    ordering by the `distance` output column computes the distance once per row.
+
+    With a compact `storage` the candidates are ordered by the `halfvec` / `bit` (hamming) distance the index is built
+    on, `rerank` fetches `n * rerank` of them and orders those by the exact distance of the full precision column.
+    `where` restricts the rows the index scan returns. Embeddings and metadata left out are selected as NULL, the rows
+    keep their shape.
+    """
+    where = f" WHERE {where}" if where else ""
+    columns = ", ".join(
+        [
+            "id",
+            "vector_send(embedding)" if include_embedding else "NULL AS embedding",
+            "metadata" if include_metadata else "NULL AS metadata",
+        ]
+    )
+    if storage == StorageType.VECTOR:
+        return (
+            f"SELECT {columns}, embedding {operator} {query} AS distance "
+            f"FROM {table}{where} ORDER BY distance LIMIT {n}"
+        )
+
+    compact_operator = "<~>" if storage == StorageType.BIT else operator
+    compact_distance = (
+        f"{compact('embedding', storage, vector_size)} {compact_operator} {compact(query, storage, vector_size)}"
+    )
+    if not rerank:
+        return f"SELECT {columns}, {compact_distance} AS distance FROM {table}{where} ORDER BY distance LIMIT {n}"
+
+    return (
+        f"SELECT {columns}, embedding {operator} {query} AS distance FROM ("
+        f"SELECT id, embedding, metadata FROM {table}{where} ORDER BY {compact_distance} LIMIT {n} * {int(rerank)}"
+        f") AS candidates ORDER BY distance LIMIT {n}"
+    )
+
+
+def search_query(table: str, embedding: str = "$1", n: str = "$2", **options) -> str:
+    """`neighbors_query` of one text bound embedding."""
+    return neighbors_query(table, f"CAST({embedding} AS text)::vector", n, **options)
+
+
+def batch_search_query(table: str, embeddings: str = "$1", n: str = "$2", **options) -> str:
+    """`neighbors_query` of every embedding of a `text[]`, one LATERAL subquery per query vector in a single
+    statement."""
+    return (
+        f"SELECT q.ord, neighbors.* FROM unnest(CAST({embeddings} AS text[])::vector[]) WITH ORDINALITY AS q(embedding, ord) "
+        f"CROSS JOIN LATERAL ({neighbors_query(table, 'q.embedding', n, **options)}) AS neighbors "
+        "ORDER BY q.ord, neighbors.distance"
+    )
+
+
+def decode_embeddings(buffers: Sequence[bytes | memoryview]) -> Sequence[np.ndarray]:
+    """Decodes `vector_send` buffers (int16 dim, int16 unused, big-endian float32 values) to float32 arrays.
+
+    Same sized vectors are decoded together from one buffer into the rows of a 2d array.
+    """
+    if len(buffers) == 0:
+        return []
+
+    sizes = {len(buffer) for buffer in buffers}
+    if len(sizes) > 1:
+        return [np.frombuffer(buffer, dtype=">f4", offset=4).astype(np.float32) for buffer in buffers]
+
+    dim = (sizes.pop() - 4) // 4
+    rows = np.frombuffer(b"".join(buffers), dtype=np.dtype([("header", ">i4"), ("values", ">f4", (dim,))]))
+    return rows["values"].astype(np.float32)
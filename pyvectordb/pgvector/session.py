@@ -0,0 +1,88 @@
+import os
+import uuid
+import weakref
+from collections.abc import Awaitable, Callable
+from functools import wraps
+from typing import Any
+
+from sqlalchemy import Engine
+
+# engines of the process, their pooled connections must not be shared with forked children
+_engines: "weakref.WeakSet[Engine]" = weakref.WeakSet()
+
+
+def _dispose_engines_in_child() -> None:
+    # close=False drops the inherited connections without closing the sockets the parent still uses
+    for engine in list(_engines):
+        engine.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_dispose_engines_in_child)
+
+
+def track_engine(engine: Engine) -> Engine:
+    """Registers the engine for pool disposal in forked children (gunicorn / uwsgi pre-fork workers)."""
+    _engines.add(engine)
+    return engine
+
+
+def engine_options(pool_size: int, max_overflow: int, pgbouncer: bool) -> dict[str, Any]:
+    return {
+        "echo": False,
+        "pool_pre_ping": True,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        # pgbouncer drops idle server connections, recycle before it does
+        "pool_recycle": 300 if pgbouncer else -1,
+    }
+
+
+def psycopg_connect_args(pgbouncer: bool) -> dict[str, Any]:
+    # pgbouncer rejects the `options` startup parameter
+    return {} if pgbouncer else {"options": "-c search_path=public"}
+
+
+def asyncpg_connect_args(pgbouncer: bool) -> dict[str, Any]:
+    if not pgbouncer:
+        return {"server_settings": {"search_path": "public"}}
+
+    # transaction pooling hands every transaction to any server connection, named prepared statements must be unique
+    # and never cached
+    return {
+        "statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+    }
+
+
+def scoped(method: Callable) -> Callable:
+    """Runs the method on the session of the calling thread (`self.conn`, a `scoped_session`) and releases it after,
+    rolled back on error, so a failed call never leaves a broken transaction behind."""
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            self.conn.remove()
+
+    return wrapper
+
+
+def async_scoped(method: Callable[..., Awaitable]) -> Callable[..., Awaitable]:
+    """`scoped` for coroutines, `self.conn` is an `async_scoped_session` bound to the current task."""
+
+    @wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        try:
+            return await method(self, *args, **kwargs)
+        except Exception:
+            await self.conn.rollback()
+            raise
+        finally:
+            await self.conn.remove()
+
+    return wrapper
@@ -1,10 +1,20 @@
+from concurrent.futures import ThreadPoolExecutor
+
 from pinecone import AwsRegion, CloudProvider, Metric, Pinecone, ServerlessSpec
 
 from pyvectordb.distance_function import DistanceFunction
 from pyvectordb.driver import VectorDB
+from pyvectordb.filter import Filter, to_operator_dict
+from pyvectordb.metadata_type import MetadataType
+from pyvectordb.search_params import SearchParams
+from pyvectordb.search_result import SearchResult
 from pyvectordb.vector import Vector
+from pyvectordb.vector_batch import VectorBatch
 from pyvectordb.vector_distance import VectorDistance
 
+# pinecone has no multi-query endpoint, a batch runs this many queries concurrently
+MAX_QUERY_WORKERS = 8
+
 
 class PineconeDB(VectorDB):
     def __init__(
@@ -116,34 +126,38 @@ class PineconeDB(VectorDB):
             raise ValueError(f"distance function unavailable on pinecone: {d_}")
 
     def insert_vector(self, vector: Vector) -> None:
-        self.index.upsert(vectors=[(vector.get_id(), vector.embedding, vector.metadata)])
+        self.index.upsert(vectors=[(vector.get_id(), vector.embedding_to_list(), vector.metadata)])
 
-    def insert_vectors(self, vectors: list[Vector]) -> None:
+    def insert_vectors(self, vectors: list[Vector] | VectorBatch) -> None:
         if len(vectors) == 0:
             return
 
-        vectors_data = [(vector.get_id(), vector.embedding, vector.metadata) for vector in vectors]
+        if isinstance(vectors, VectorBatch):
+            vectors_data = list(zip(vectors.ids, vectors.embeddings_to_list(), vectors.metadata, strict=True))
+        else:
+            vectors_data = [(vector.get_id(), vector.embedding_to_list(), vector.metadata) for vector in vectors]
 
         self.index.upsert(vectors=vectors_data)
 
-    def read_vector(self, id: str) -> Vector | None:
+    def read_vector(self, id: str, include_embedding: bool = True, include_metadata: bool = True) -> Vector | None:
         fetch_response = self.index.fetch(ids=[id])
 
         if id not in fetch_response.vectors:
             return None
 
+        # fetch has no projection, the fields are only dropped from the result
         vector_data = fetch_response.vectors[id]
         return Vector(
-            embedding=vector_data.values,
+            embedding=vector_data.values if include_embedding else None,
             vector_id=vector_data.id,
-            metadata=vector_data.metadata,
+            metadata=vector_data.metadata if include_metadata else None,
         )
 
     def update_vector(self, vector: Vector) -> None:
         # Pinecone uses upsert for both insert and update
         self.insert_vector(vector)
 
-    def update_vectors(self, vectors: list[Vector]) -> None:
+    def update_vectors(self, vectors: list[Vector] | VectorBatch) -> None:
         # Pinecone uses upsert for both insert and update
         self.insert_vectors(vectors)
 
@@ -163,27 +177,93 @@ class PineconeDB(VectorDB):
         self,
         vector: Vector,
         n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
     ) -> list[VectorDistance]:
-        query_response = self.index.query(
-            vector=vector.embedding,
-            top_k=n,
-            include_metadata=True,
-            include_values=True,
+        return self.get_neighbor_results(
+            vector, n, filter, include_embedding=include_embedding, include_metadata=include_metadata, params=params
+        ).to_vector_distances()
+
+    def get_neighbor_results(
+        self,
+        vector: Vector,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> SearchResult:
+        # pinecone takes no search time index settings, params do not apply
+        return self.__query(vector.embedding_to_list(), n, filter, include_embedding, include_metadata)
+
+    def get_neighbor_vectors_batch(
+        self,
+        vectors: list[Vector] | VectorBatch,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[list[VectorDistance]]:
+        results = self.get_neighbor_results_batch(
+            vectors, n, filter, include_embedding=include_embedding, include_metadata=include_metadata, params=params
         )
+        return [result.to_vector_distances() for result in results]
+
+    def get_neighbor_results_batch(
+        self,
+        vectors: list[Vector] | VectorBatch,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[SearchResult]:
+        if len(vectors) == 0:
+            return []
 
-        vector_distances = []
-        for match in query_response.matches:
-            vector_distance = VectorDistance(
-                vector=Vector(
-                    embedding=match.values,
-                    vector_id=match.id,
-                    metadata=match.metadata,
-                ),
-                distance=match.score,
+        if isinstance(vectors, VectorBatch):
+            embeddings = vectors.embeddings_to_list()
+        else:
+            embeddings = [vector.embedding_to_list() for vector in vectors]
+
+        with ThreadPoolExecutor(max_workers=min(len(embeddings), MAX_QUERY_WORKERS)) as executor:
+            return list(
+                executor.map(
+                    lambda embedding: self.__query(embedding, n, filter, include_embedding, include_metadata),
+                    embeddings,
+                )
             )
-            vector_distances.append(vector_distance)
 
-        return vector_distances
+    def create_metadata_index(self, field: str, type: MetadataType | str) -> None:
+        # serverless indexes index every metadata key, selective indexing is only configured when a pod index is created
+        pass
+
+    def __query(
+        self,
+        embedding: list[float],
+        n: int,
+        filter: Filter | None,
+        include_embedding: bool,
+        include_metadata: bool,
+    ) -> SearchResult:
+        query_response = self.index.query(
+            vector=embedding,
+            top_k=n,
+            filter=to_operator_dict(filter) if filter is not None else None,
+            include_metadata=include_metadata,
+            include_values=include_embedding,
+        )
+
+        matches = query_response.matches
+        return SearchResult(
+            ids=[match.id for match in matches],
+            distances=[match.score for match in matches],
+            embeddings=[match.values for match in matches] if include_embedding else None,
+            metadata=[match.metadata for match in matches] if include_metadata else None,
+        )
 
 
 __all__ = ["PineconeDB"]
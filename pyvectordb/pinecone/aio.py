@@ -0,0 +1,256 @@
+import asyncio
+
+from pinecone import AwsRegion, CloudProvider, Metric, PineconeAsyncio, ServerlessSpec
+
+from pyvectordb.async_driver import AsyncVectorDB
+from pyvectordb.distance_function import DistanceFunction
+from pyvectordb.filter import Filter, to_operator_dict
+from pyvectordb.metadata_type import MetadataType
+from pyvectordb.search_params import SearchParams
+from pyvectordb.search_result import SearchResult
+from pyvectordb.vector import Vector
+from pyvectordb.vector_batch import VectorBatch
+from pyvectordb.vector_distance import VectorDistance
+
+
+class AsyncPineconeDB(AsyncVectorDB):
+    def __init__(
+        self,
+        api_key: str,
+        host: str = None,
+        index_name: str = None,
+        dimension: int = None,
+        cloud: str = "aws",
+        region: str = "us-east-1",
+        distance_function: DistanceFunction | str = DistanceFunction.COSINE,
+        debug: bool = False,
+    ) -> None:
+        # Pinecone is a managed service, so we use a dummy port for the base class
+        super().__init__(host or "pinecone.io", 443, debug)
+
+        self.api_key = api_key or self.__raise_value_error("api_key")
+        self.host = host
+        self.index_name = index_name
+        self.dimension = dimension
+        self.cloud = cloud
+        self.region = region
+        self.distance_function = distance_function or self.__raise_value_error("distance_function")
+
+        self.client: PineconeAsyncio = None
+        self.index = None
+
+    @staticmethod
+    def __raise_value_error(param: str):
+        raise ValueError(f"{param} is required")
+
+    async def _connect(self) -> None:
+        if self.client is None:
+            self.client = PineconeAsyncio(api_key=self.api_key)
+
+        # the asyncio index client is addressed by host only, it is looked up (or the index created) by name
+        if self.index_name and not self.host:
+            if await self.client.has_index(self.index_name):
+                self.host = (await self.client.describe_index(self.index_name)).host
+            elif self.dimension:
+                await self.__create_index()
+
+        if not self.host:
+            self.__raise_value_error("host")
+
+        if self.index is None:
+            self.index = self.client.IndexAsyncio(host=self.host)
+
+    async def __create_index(self) -> None:
+        await self.client.create_index(
+            name=self.index_name,
+            dimension=self.dimension,
+            metric=self.__get_distance_function(self.distance_function),
+            spec=ServerlessSpec(cloud=self.__get_cloud_provider(self.cloud), region=self.__get_aws_region(self.region)),
+        )
+        self.host = (await self.client.describe_index(self.index_name)).host
+
+    async def close(self) -> None:
+        if self.index is not None:
+            await self.index.close()
+            self.index = None
+        if self.client is not None:
+            await self.client.close()
+            self.client = None
+
+    def __get_cloud_provider(self, cloud: str) -> CloudProvider:
+        cloud = cloud.lower()
+        if cloud == "aws":
+            return CloudProvider.AWS
+        elif cloud == "gcp":
+            return CloudProvider.GCP
+        elif cloud == "azure":
+            return CloudProvider.AZURE
+        else:
+            return CloudProvider.AWS
+
+    def __get_aws_region(self, region: str) -> AwsRegion:
+        try:
+            return AwsRegion(region)
+        except ValueError:
+            # Return the region string as-is, Pinecone accepts it
+            return region
+
+    def __get_distance_function(self, distance_function: DistanceFunction | str) -> Metric:
+        if isinstance(distance_function, str):
+            distance_function = DistanceFunction.from_str(distance_function)
+
+        if distance_function == DistanceFunction.COSINE:
+            return Metric.COSINE
+        elif distance_function == DistanceFunction.EUCLIDEAN:
+            return Metric.EUCLIDEAN
+        elif distance_function == DistanceFunction.DOT:
+            return Metric.DOTPRODUCT
+        else:
+            d_ = [
+                "COSINE",
+                "EUCLIDEAN",
+                "DOT",
+            ]
+            raise ValueError(f"distance function unavailable on pinecone: {d_}")
+
+    async def insert_vector(self, vector: Vector) -> None:
+        await self.insert_vectors([vector])
+
+    async def insert_vectors(self, vectors: list[Vector] | VectorBatch) -> None:
+        if len(vectors) == 0:
+            return
+
+        if isinstance(vectors, VectorBatch):
+            vectors_data = list(zip(vectors.ids, vectors.embeddings_to_list(), vectors.metadata, strict=True))
+        else:
+            vectors_data = [(vector.get_id(), vector.embedding_to_list(), vector.metadata) for vector in vectors]
+
+        await self.index.upsert(vectors=vectors_data, show_progress=False)
+
+    async def read_vector(
+        self, id: str, include_embedding: bool = True, include_metadata: bool = True
+    ) -> Vector | None:
+        fetch_response = await self.index.fetch(ids=[id])
+
+        if id not in fetch_response.vectors:
+            return None
+
+        # fetch has no projection, the fields are only dropped from the result
+        vector_data = fetch_response.vectors[id]
+        return Vector(
+            embedding=vector_data.values if include_embedding else None,
+            vector_id=vector_data.id,
+            metadata=vector_data.metadata if include_metadata else None,
+        )
+
+    async def update_vector(self, vector: Vector) -> None:
+        # Pinecone uses upsert for both insert and update
+        await self.insert_vector(vector)
+
+    async def update_vectors(self, vectors: list[Vector] | VectorBatch) -> None:
+        # Pinecone uses upsert for both insert and update
+        await self.insert_vectors(vectors)
+
+    async def delete_vector(self, id: str) -> None:
+        await self.index.delete(ids=[id])
+
+    async def delete_vectors(self, ids: list[str] | list[Vector]) -> None:
+        if len(ids) == 0:
+            return
+
+        if isinstance(ids[0], Vector):
+            ids = [v.get_id() for v in ids]
+
+        await self.index.delete(ids=ids)
+
+    async def get_neighbor_vectors(
+        self,
+        vector: Vector,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[VectorDistance]:
+        return (
+            await self.get_neighbor_results(
+                vector, n, filter, include_embedding=include_embedding, include_metadata=include_metadata, params=params
+            )
+        ).to_vector_distances()
+
+    async def get_neighbor_results(
+        self,
+        vector: Vector,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> SearchResult:
+        # pinecone takes no search time index settings, params do not apply
+        return await self.__query(vector.embedding_to_list(), n, filter, include_embedding, include_metadata)
+
+    async def get_neighbor_vectors_batch(
+        self,
+        vectors: list[Vector] | VectorBatch,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[list[VectorDistance]]:
+        results = await self.get_neighbor_results_batch(
+            vectors, n, filter, include_embedding=include_embedding, include_metadata=include_metadata, params=params
+        )
+        return [result.to_vector_distances() for result in results]
+
+    async def get_neighbor_results_batch(
+        self,
+        vectors: list[Vector] | VectorBatch,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[SearchResult]:
+        if len(vectors) == 0:
+            return []
+
+        if isinstance(vectors, VectorBatch):
+            embeddings = vectors.embeddings_to_list()
+        else:
+            embeddings = [vector.embedding_to_list() for vector in vectors]
+
+        return list(
+            await asyncio.gather(
+                *(self.__query(embedding, n, filter, include_embedding, include_metadata) for embedding in embeddings)
+            )
+        )
+
+    async def create_metadata_index(self, field: str, type: MetadataType | str) -> None:
+        # serverless indexes index every metadata key, selective indexing is only configured when a pod index is created
+        pass
+
+    async def __query(
+        self,
+        embedding: list[float],
+        n: int,
+        filter: Filter | None,
+        include_embedding: bool,
+        include_metadata: bool,
+    ) -> SearchResult:
+        query_response = await self.index.query(
+            vector=embedding,
+            top_k=n,
+            filter=to_operator_dict(filter) if filter is not None else None,
+            include_metadata=include_metadata,
+            include_values=include_embedding,
+        )
+
+        matches = query_response.matches
+        return SearchResult(
+            ids=[match.id for match in matches],
+            distances=[match.score for match in matches],
+            embeddings=[match.values for match in matches] if include_embedding else None,
+            metadata=[match.metadata for match in matches] if include_metadata else None,
+        )
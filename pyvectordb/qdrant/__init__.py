@@ -1,11 +1,20 @@
 from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, PointStruct, ScoredPoint, VectorParams
+from qdrant_client.models import Distance, PointIdsList, PointStruct, QueryRequest, ScoredPoint
 
 from pyvectordb.distance_function import DistanceFunction
 from pyvectordb.driver import VectorDB
+from pyvectordb.filter import Filter
+from pyvectordb.index_spec import IndexSpec
+from pyvectordb.metadata_type import MetadataType
+from pyvectordb.search_params import SearchParams
+from pyvectordb.search_result import SearchResult
 from pyvectordb.vector import Vector
+from pyvectordb.vector_batch import VectorBatch
 from pyvectordb.vector_distance import VectorDistance
 
+from .filter import payload_schema, to_qdrant_filter
+from .index import to_qdrant_search_params, vector_params
+
 
 class QdrantDB(VectorDB):
     def __init__(
@@ -16,6 +25,13 @@ class QdrantDB(VectorDB):
         collection: str = None,
         vector_size: int = None,
         distance_function: DistanceFunction | str = DistanceFunction.EUCLIDEAN,
+        index_spec: IndexSpec | None = None,
+        prefer_grpc: bool = False,
+        grpc_port: int = 6334,
+        timeout: int = 10,
+        batch_size: int = 256,
+        parallel: int = 1,
+        max_retries: int = 3,
     ) -> None:
         super().__init__(host, port)
 
@@ -25,6 +41,13 @@ class QdrantDB(VectorDB):
         self.collection = collection or self.__raise_value_error("collection")
         self.vector_size = vector_size or self.__raise_value_error("vector_size")
         self.distance_function = distance_function or self.__raise_value_error("distance_function")
+        self.index_spec = index_spec
+        self.prefer_grpc = prefer_grpc
+        self.grpc_port = grpc_port
+        self.timeout = timeout
+        self.batch_size = batch_size or self.__raise_value_error("batch_size")
+        self.parallel = parallel or self.__raise_value_error("parallel")
+        self.max_retries = max_retries
 
         self.client: QdrantClient = None
 
@@ -41,17 +64,19 @@ class QdrantDB(VectorDB):
             self.client = QdrantClient(
                 host=self.host,
                 port=self.port,
+                grpc_port=self.grpc_port,
+                prefer_grpc=self.prefer_grpc,
                 api_key=self.api_key,
                 https=False,
-                timeout=10,
+                timeout=self.timeout,
             )
 
     def __init_collection(self) -> None:
         if not self.client.collection_exists(self.collection):
             self.client.create_collection(
                 collection_name=self.collection,
-                vectors_config=VectorParams(
-                    size=self.vector_size, distance=self.__get_distance_function(self.distance_function)
+                vectors_config=vector_params(
+                    self.vector_size, self.__get_distance_function(self.distance_function), self.index_spec
                 ),
             )
 
@@ -83,31 +108,50 @@ class QdrantDB(VectorDB):
 
         self.client.upsert(
             collection_name=self.collection,
-            points=[PointStruct(id=vector_id, vector=vector.embedding, payload={"metadata": vector.metadata})],
+            points=[
+                PointStruct(id=vector_id, vector=vector.embedding_to_list(), payload={"metadata": vector.metadata})
+            ],
             wait=True,
         )
 
-    def insert_vectors(self, vectors: list[Vector]) -> None:
+    def insert_vectors(self, vectors: list[Vector] | VectorBatch) -> None:
         if len(vectors) == 0:
             return
 
-        points = [
-            PointStruct(
-                id=vector.get_id(),
-                vector=vector.embedding,
-                payload=vector.metadata,
+        # chunks of batch_size are upserted by `parallel` workers, each chunk retried up to max_retries times
+        # and points are consumed lazily so at most a few chunks per worker are in flight
+        if isinstance(vectors, VectorBatch):
+            self.client.upload_collection(
+                collection_name=self.collection,
+                vectors=vectors.embeddings,
+                payload=({"metadata": metadata} for metadata in vectors.metadata),
+                ids=vectors.ids,
+                batch_size=self.batch_size,
+                parallel=self.parallel,
+                max_retries=self.max_retries,
+            )
+        else:
+            self.client.upload_points(
+                collection_name=self.collection,
+                points=(
+                    PointStruct(
+                        id=vector.get_id(),
+                        vector=vector.embedding_to_list(),
+                        payload={"metadata": vector.metadata},
+                    )
+                    for vector in vectors
+                ),
+                batch_size=self.batch_size,
+                parallel=self.parallel,
+                max_retries=self.max_retries,
             )
-            for vector in vectors
-        ]
-
-        self.client.upsert(collection_name=self.collection, points=points, wait=False)
 
-    def read_vector(self, id: str) -> Vector | None:
+    def read_vector(self, id: str, include_embedding: bool = True, include_metadata: bool = True) -> Vector | None:
         records = self.client.retrieve(
             collection_name=self.collection,
             ids=[id],
-            with_payload=True,
-            with_vectors=True,
+            with_payload=include_metadata,
+            with_vectors=include_embedding,
         )
         if len(records) == 0:
             return None
@@ -116,14 +160,14 @@ class QdrantDB(VectorDB):
         return Vector(
             embedding=record.vector,
             vector_id=record.id,
-            metadata=record.payload.get("metadata"),
+            metadata=(record.payload or {}).get("metadata"),
         )
 
     def update_vector(self, vector: Vector) -> None:
         # we use qdrant upsert, so...
         self.insert_vector(vector)
 
-    def update_vectors(self, vectors: list[Vector]) -> None:
+    def update_vectors(self, vectors: list[Vector] | VectorBatch) -> None:
         # we use qdrant upsert, so...
         self.insert_vectors(vectors)
 
@@ -135,34 +179,111 @@ class QdrantDB(VectorDB):
             return
 
         if isinstance(ids[0], Vector):
-            [self.delete_vector(v.id) for v in ids]
-        else:
-            [self.delete_vector(id_) for id_ in ids]
+            ids = [v.id for v in ids]
+
+        self.client.delete(collection_name=self.collection, points_selector=PointIdsList(points=ids), wait=False)
 
     def get_neighbor_vectors(
         self,
         vector: Vector,
         n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
     ) -> list[VectorDistance]:
-        scored_points: list[ScoredPoint] = self.client.search(
+        return self.get_neighbor_results(
+            vector, n, filter, include_embedding=include_embedding, include_metadata=include_metadata, params=params
+        ).to_vector_distances()
+
+    def get_neighbor_results(
+        self,
+        vector: Vector,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> SearchResult:
+        response = self.client.query_points(
             collection_name=self.collection,
-            query_vector=vector.embedding,
-            with_payload=True,
-            with_vectors=True,
+            query=vector.embedding_to_list(),
+            query_filter=to_qdrant_filter(filter) if filter is not None else None,
+            with_payload=include_metadata,
+            with_vectors=include_embedding,
+            search_params=to_qdrant_search_params(params) if params is not None else None,
             limit=n,
         )
-        vector_distances = []
-        for point in scored_points:
-            vector_distance = VectorDistance(
-                vector=Vector(
-                    embedding=point.vector,
-                    vector_id=point.id,
-                    metadata=point.payload.get("metadata"),
-                ),
-                distance=point.score,
-            )
-            vector_distances.append(vector_distance)
-        return vector_distances
+        return self.__to_search_result(response.points, include_embedding, include_metadata)
+
+    def get_neighbor_vectors_batch(
+        self,
+        vectors: list[Vector] | VectorBatch,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[list[VectorDistance]]:
+        results = self.get_neighbor_results_batch(
+            vectors, n, filter, include_embedding=include_embedding, include_metadata=include_metadata, params=params
+        )
+        return [result.to_vector_distances() for result in results]
+
+    def get_neighbor_results_batch(
+        self,
+        vectors: list[Vector] | VectorBatch,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[SearchResult]:
+        if len(vectors) == 0:
+            return []
+
+        if isinstance(vectors, VectorBatch):
+            embeddings = vectors.embeddings_to_list()
+        else:
+            embeddings = [vector.embedding_to_list() for vector in vectors]
+
+        query_filter = to_qdrant_filter(filter) if filter is not None else None
+        search_params = to_qdrant_search_params(params) if params is not None else None
+        responses = self.client.query_batch_points(
+            collection_name=self.collection,
+            requests=[
+                QueryRequest(
+                    query=embedding,
+                    filter=query_filter,
+                    params=search_params,
+                    limit=n,
+                    with_payload=include_metadata,
+                    with_vector=include_embedding,
+                )
+                for embedding in embeddings
+            ],
+        )
+        return [self.__to_search_result(response.points, include_embedding, include_metadata) for response in responses]
+
+    def create_metadata_index(self, field: str, type: MetadataType | str) -> None:
+        # without a payload index filtered searches check the payload of every candidate point
+        self.client.create_payload_index(
+            collection_name=self.collection,
+            field_name=f"metadata.{field}",
+            field_schema=payload_schema(type),
+            wait=True,
+        )
+
+    @staticmethod
+    def __to_search_result(
+        scored_points: list[ScoredPoint], include_embedding: bool, include_metadata: bool
+    ) -> SearchResult:
+        return SearchResult(
+            ids=[point.id for point in scored_points],
+            distances=[point.score for point in scored_points],
+            embeddings=[point.vector for point in scored_points] if include_embedding else None,
+            metadata=[(point.payload or {}).get("metadata") for point in scored_points] if include_metadata else None,
+        )
 
 
 __all__ = ["QdrantDB"]
@@ -0,0 +1,297 @@
+import asyncio
+
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.models import Distance, PointIdsList, PointStruct, QueryRequest, ScoredPoint
+
+from pyvectordb.async_driver import AsyncVectorDB
+from pyvectordb.distance_function import DistanceFunction
+from pyvectordb.filter import Filter
+from pyvectordb.index_spec import IndexSpec
+from pyvectordb.metadata_type import MetadataType
+from pyvectordb.search_params import SearchParams
+from pyvectordb.search_result import SearchResult
+from pyvectordb.vector import Vector
+from pyvectordb.vector_batch import VectorBatch
+from pyvectordb.vector_distance import VectorDistance
+
+from .filter import payload_schema, to_qdrant_filter
+from .index import to_qdrant_search_params, vector_params
+
+
+class AsyncQdrantDB(AsyncVectorDB):
+    def __init__(
+        self,
+        host: str,
+        api_key: str = None,
+        port: int = 6333,
+        collection: str = None,
+        vector_size: int = None,
+        distance_function: DistanceFunction | str = DistanceFunction.EUCLIDEAN,
+        index_spec: IndexSpec | None = None,
+        prefer_grpc: bool = False,
+        grpc_port: int = 6334,
+        timeout: int = 10,
+        batch_size: int = 256,
+        parallel: int = 1,
+        max_retries: int = 3,
+        debug: bool = False,
+    ) -> None:
+        super().__init__(host, port, debug)
+
+        self.host = host or self.__raise_value_error("host")
+        self.api_key = api_key
+        self.port = port or self.__raise_value_error("port")
+        self.collection = collection or self.__raise_value_error("collection")
+        self.vector_size = vector_size or self.__raise_value_error("vector_size")
+        self.distance_function = distance_function or self.__raise_value_error("distance_function")
+        self.index_spec = index_spec
+        self.prefer_grpc = prefer_grpc
+        self.grpc_port = grpc_port
+        self.timeout = timeout
+        self.batch_size = batch_size or self.__raise_value_error("batch_size")
+        self.parallel = parallel or self.__raise_value_error("parallel")
+        self.max_retries = max_retries
+
+        self.client: AsyncQdrantClient = None
+
+    @staticmethod
+    def __raise_value_error(param: str):
+        raise ValueError(f"{param} is required")
+
+    async def _connect(self) -> None:
+        if self.client is None:
+            self.client = AsyncQdrantClient(
+                host=self.host,
+                port=self.port,
+                grpc_port=self.grpc_port,
+                prefer_grpc=self.prefer_grpc,
+                api_key=self.api_key,
+                https=False,
+                timeout=self.timeout,
+            )
+
+        if not await self.client.collection_exists(self.collection):
+            await self.client.create_collection(
+                collection_name=self.collection,
+                vectors_config=vector_params(
+                    self.vector_size, self.__get_distance_function(self.distance_function), self.index_spec
+                ),
+            )
+
+    async def close(self) -> None:
+        if self.client is not None:
+            await self.client.close()
+            self.client = None
+
+    def __get_distance_function(self, distance_function: DistanceFunction | str) -> Distance:
+        if isinstance(distance_function, str):
+            distance_function = DistanceFunction.from_str(distance_function)
+
+        if distance_function == DistanceFunction.COSINE:
+            distance_func = Distance.COSINE
+        elif distance_function == DistanceFunction.EUCLIDEAN:
+            distance_func = Distance.EUCLID
+        elif distance_function == DistanceFunction.DOT:
+            distance_func = Distance.DOT
+        elif distance_function == DistanceFunction.MANHATTAN:
+            distance_func = Distance.MANHATTAN
+        else:
+            d_ = [
+                "COSINE",
+                "EUCLIDEAN",
+                "DOT",
+                "MANHATTAN",
+            ]
+            raise ValueError(f"distance function unavailable on qdrant: {d_}")
+
+        return distance_func
+
+    async def insert_vector(self, vector: Vector) -> None:
+        await self.client.upsert(
+            collection_name=self.collection,
+            points=[
+                PointStruct(
+                    id=vector.get_id(), vector=vector.embedding_to_list(), payload={"metadata": vector.metadata}
+                )
+            ],
+            wait=True,
+        )
+
+    async def insert_vectors(self, vectors: list[Vector] | VectorBatch) -> None:
+        if len(vectors) == 0:
+            return
+
+        # the client uploads in blocking worker processes, keep them off the event loop
+        await asyncio.to_thread(self.__upload, vectors)
+
+    def __upload(self, vectors: list[Vector] | VectorBatch) -> None:
+        # chunks of batch_size are upserted by `parallel` workers, each chunk retried up to max_retries times
+        # and points are consumed lazily so at most a few chunks per worker are in flight
+        if isinstance(vectors, VectorBatch):
+            self.client.upload_collection(
+                collection_name=self.collection,
+                vectors=vectors.embeddings,
+                payload=({"metadata": metadata} for metadata in vectors.metadata),
+                ids=vectors.ids,
+                batch_size=self.batch_size,
+                parallel=self.parallel,
+                max_retries=self.max_retries,
+            )
+        else:
+            self.client.upload_points(
+                collection_name=self.collection,
+                points=(
+                    PointStruct(
+                        id=vector.get_id(),
+                        vector=vector.embedding_to_list(),
+                        payload={"metadata": vector.metadata},
+                    )
+                    for vector in vectors
+                ),
+                batch_size=self.batch_size,
+                parallel=self.parallel,
+                max_retries=self.max_retries,
+            )
+
+    async def read_vector(
+        self, id: str, include_embedding: bool = True, include_metadata: bool = True
+    ) -> Vector | None:
+        records = await self.client.retrieve(
+            collection_name=self.collection,
+            ids=[id],
+            with_payload=include_metadata,
+            with_vectors=include_embedding,
+        )
+        if len(records) == 0:
+            return None
+
+        record = records[0]
+        return Vector(
+            embedding=record.vector,
+            vector_id=record.id,
+            metadata=(record.payload or {}).get("metadata"),
+        )
+
+    async def update_vector(self, vector: Vector) -> None:
+        # we use qdrant upsert, so...
+        await self.insert_vector(vector)
+
+    async def update_vectors(self, vectors: list[Vector] | VectorBatch) -> None:
+        # we use qdrant upsert, so...
+        await self.insert_vectors(vectors)
+
+    async def delete_vector(self, id: str) -> None:
+        await self.client.delete(collection_name=self.collection, points_selector=[id], wait=False)
+
+    async def delete_vectors(self, ids: list[str] | list[Vector]) -> None:
+        if len(ids) == 0:
+            return
+
+        if isinstance(ids[0], Vector):
+            ids = [v.id for v in ids]
+
+        await self.client.delete(collection_name=self.collection, points_selector=PointIdsList(points=ids), wait=False)
+
+    async def get_neighbor_vectors(
+        self,
+        vector: Vector,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[VectorDistance]:
+        return (
+            await self.get_neighbor_results(
+                vector, n, filter, include_embedding=include_embedding, include_metadata=include_metadata, params=params
+            )
+        ).to_vector_distances()
+
+    async def get_neighbor_results(
+        self,
+        vector: Vector,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> SearchResult:
+        response = await self.client.query_points(
+            collection_name=self.collection,
+            query=vector.embedding_to_list(),
+            query_filter=to_qdrant_filter(filter) if filter is not None else None,
+            with_payload=include_metadata,
+            with_vectors=include_embedding,
+            search_params=to_qdrant_search_params(params) if params is not None else None,
+            limit=n,
+        )
+        return self.__to_search_result(response.points, include_embedding, include_metadata)
+
+    async def get_neighbor_vectors_batch(
+        self,
+        vectors: list[Vector] | VectorBatch,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[list[VectorDistance]]:
+        results = await self.get_neighbor_results_batch(
+            vectors, n, filter, include_embedding=include_embedding, include_metadata=include_metadata, params=params
+        )
+        return [result.to_vector_distances() for result in results]
+
+    async def get_neighbor_results_batch(
+        self,
+        vectors: list[Vector] | VectorBatch,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[SearchResult]:
+        if len(vectors) == 0:
+            return []
+
+        if isinstance(vectors, VectorBatch):
+            embeddings = vectors.embeddings_to_list()
+        else:
+            embeddings = [vector.embedding_to_list() for vector in vectors]
+
+        query_filter = to_qdrant_filter(filter) if filter is not None else None
+        search_params = to_qdrant_search_params(params) if params is not None else None
+        responses = await self.client.query_batch_points(
+            collection_name=self.collection,
+            requests=[
+                QueryRequest(
+                    query=embedding,
+                    filter=query_filter,
+                    params=search_params,
+                    limit=n,
+                    with_payload=include_metadata,
+                    with_vector=include_embedding,
+                )
+                for embedding in embeddings
+            ],
+        )
+        return [self.__to_search_result(response.points, include_embedding, include_metadata) for response in responses]
+
+    async def create_metadata_index(self, field: str, type: MetadataType | str) -> None:
+        # without a payload index filtered searches check the payload of every candidate point
+        await self.client.create_payload_index(
+            collection_name=self.collection,
+            field_name=f"metadata.{field}",
+            field_schema=payload_schema(type),
+            wait=True,
+        )
+
+    @staticmethod
+    def __to_search_result(
+        scored_points: list[ScoredPoint], include_embedding: bool, include_metadata: bool
+    ) -> SearchResult:
+        return SearchResult(
+            ids=[point.id for point in scored_points],
+            distances=[point.score for point in scored_points],
+            embeddings=[point.vector for point in scored_points] if include_embedding else None,
+            metadata=[(point.payload or {}).get("metadata") for point in scored_points] if include_metadata else None,
+        )
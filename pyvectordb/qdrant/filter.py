@@ -0,0 +1,52 @@
+from qdrant_client import models
+
+from pyvectordb.filter import And, Eq, Filter, In, Not, Or, Range, push_down_not
+from pyvectordb.metadata_type import MetadataType
+
+
+def to_qdrant_filter(filter: Filter) -> models.Filter:
+    """Compiles to a qdrant `Filter`, metadata is stored under the `metadata` payload key."""
+    # must_not of a range would also keep points without the key
+    filter = push_down_not(filter)
+    if isinstance(filter, And):
+        return models.Filter(must=[to_qdrant_condition(f) for f in filter.filters])
+    if isinstance(filter, Or):
+        return models.Filter(should=[to_qdrant_condition(f) for f in filter.filters])
+    if isinstance(filter, Not):
+        return models.Filter(must_not=[to_qdrant_condition(filter.filter)])
+    return models.Filter(must=[to_qdrant_condition(filter)])
+
+
+def to_qdrant_condition(filter: Filter) -> models.Condition:
+    if isinstance(filter, Eq):
+        # match only takes keywords, integers and booleans, floats are matched by a closed range
+        if isinstance(filter.value, float):
+            return to_qdrant_condition(Range(filter.key, gte=filter.value, lte=filter.value))
+        return models.FieldCondition(key=f"metadata.{filter.key}", match=models.MatchValue(value=filter.value))
+    if isinstance(filter, In):
+        return models.FieldCondition(key=f"metadata.{filter.key}", match=models.MatchAny(any=filter.values))
+    if isinstance(filter, Range):
+        return models.FieldCondition(key=f"metadata.{filter.key}", range=models.Range(**dict(filter.bounds())))
+    return to_qdrant_filter(filter)
+
+
+def payload_schema(type: MetadataType | str) -> models.PayloadSchemaType:
+    if isinstance(type, str):
+        type = MetadataType.from_str(type)
+
+    if type == MetadataType.KEYWORD:
+        return models.PayloadSchemaType.KEYWORD
+    elif type == MetadataType.INTEGER:
+        return models.PayloadSchemaType.INTEGER
+    elif type == MetadataType.FLOAT:
+        return models.PayloadSchemaType.FLOAT
+    elif type == MetadataType.BOOL:
+        return models.PayloadSchemaType.BOOL
+    else:
+        d_ = [
+            "KEYWORD",
+            "INTEGER",
+            "FLOAT",
+            "BOOL",
+        ]
+        raise ValueError(f"metadata type unavailable on qdrant: {d_}")
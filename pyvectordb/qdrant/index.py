@@ -0,0 +1,91 @@
+from qdrant_client import models
+
+from pyvectordb.index_spec import IndexSpec, IndexType, QuantizationType
+from pyvectordb.search_params import SearchParams
+
+# float32 values are 4 bytes, a product quantization segment is encoded in 1 byte
+COMPRESSION_RATIOS = {
+    4: models.CompressionRatio.X4,
+    8: models.CompressionRatio.X8,
+    16: models.CompressionRatio.X16,
+    32: models.CompressionRatio.X32,
+    64: models.CompressionRatio.X64,
+}
+
+
+def vector_params(size: int, distance: models.Distance, index_spec: IndexSpec | None) -> models.VectorParams:
+    """`VectorParams` of a new collection with the hnsw and quantization config of `index_spec`."""
+    if index_spec is None:
+        return models.VectorParams(size=size, distance=distance)
+
+    return models.VectorParams(
+        size=size,
+        distance=distance,
+        hnsw_config=hnsw_config(index_spec),
+        quantization_config=quantization_config(index_spec, size),
+        on_disk=index_spec.on_disk,
+    )
+
+
+def hnsw_config(index_spec: IndexSpec) -> models.HnswConfigDiff:
+    if index_spec.index_type == IndexType.FLAT:
+        # m = 0 skips building the graph, every search is an exact scan
+        return models.HnswConfigDiff(m=0, on_disk=index_spec.on_disk)
+    elif index_spec.index_type in (IndexType.HNSW, IndexType.DYNAMIC):
+        # segments below full_scan_threshold are already searched exactly, hnsw is qdrant's dynamic index
+        return models.HnswConfigDiff(
+            m=index_spec.m,
+            ef_construct=index_spec.ef_construction,
+            on_disk=index_spec.on_disk,
+        )
+    else:
+        d_ = [
+            "HNSW",
+            "FLAT",
+            "DYNAMIC",
+        ]
+        raise ValueError(f"index type unavailable on qdrant: {d_}")
+
+
+def quantization_config(index_spec: IndexSpec, size: int) -> models.QuantizationConfig | None:
+    always_ram = index_spec.quantization_always_ram
+
+    if index_spec.quantization is None:
+        return None
+    elif index_spec.quantization == QuantizationType.SCALAR:
+        return models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(type=models.ScalarType.INT8, always_ram=always_ram)
+        )
+    elif index_spec.quantization == QuantizationType.BINARY:
+        return models.BinaryQuantization(binary=models.BinaryQuantizationConfig(always_ram=always_ram))
+    elif index_spec.quantization == QuantizationType.PRODUCT:
+        return models.ProductQuantization(
+            product=models.ProductQuantizationConfig(
+                compression=compression_ratio(size, index_spec.pq_segments), always_ram=always_ram
+            )
+        )
+    else:
+        d_ = [
+            "SCALAR",
+            "BINARY",
+            "PRODUCT",
+        ]
+        raise ValueError(f"quantization unavailable on qdrant: {d_}")
+
+
+def compression_ratio(size: int, pq_segments: int | None) -> models.CompressionRatio:
+    """Qdrant sets product quantization by compression ratio, the nearest one to `pq_segments` segments."""
+    if pq_segments is None:
+        return models.CompressionRatio.X16
+
+    ratio = 4 * size / pq_segments
+    return COMPRESSION_RATIOS[min(COMPRESSION_RATIOS, key=lambda r: abs(r - ratio))]
+
+
+def to_qdrant_search_params(params: SearchParams) -> models.SearchParams:
+    """Per query `SearchParams`, qdrant has no IVF index and `nprobe` does not apply."""
+    quantization = None
+    if params.rescore is not None or params.oversampling is not None:
+        quantization = models.QuantizationSearchParams(rescore=params.rescore, oversampling=params.oversampling)
+
+    return models.SearchParams(hnsw_ef=params.ef, exact=params.exact, quantization=quantization)
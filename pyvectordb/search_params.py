@@ -0,0 +1,43 @@
+class SearchParams:
+    """Search time settings of one query, to trade recall for latency per call:
+
+    - `ef`: HNSW candidate list size (Qdrant `hnsw_ef`, Milvus `ef`, pgvector `hnsw.ef_search`, local `HNSWIndex`)
+    - `nprobe`: IVF lists scanned (Milvus `nprobe`, pgvector `ivfflat.probes`, local `IVFIndex`)
+    - `exact`: bypass the ANN index for an exact scan (Qdrant, pgvector, local)
+    - `rescore` / `oversampling`: re-rank `n * oversampling` quantized candidates with the full precision vectors
+      (Qdrant quantization search params, pgvector compact storage `rerank`, local `QuantizedIndex`)
+
+    Settings a backend has no per query equivalent for are ignored there, None keeps the collection default.
+
+        SearchParams(ef=16)  # autocomplete
+        SearchParams(ef=512, rescore=True, oversampling=4.0)  # high recall batch jobs
+    """
+
+    __slots__ = ("ef", "nprobe", "exact", "rescore", "oversampling")
+
+    def __init__(
+        self,
+        ef: int | None = None,
+        nprobe: int | None = None,
+        exact: bool = False,
+        rescore: bool | None = None,
+        oversampling: float | None = None,
+    ) -> None:
+        if ef is not None and ef < 1:
+            raise ValueError("ef must be positive")
+        if nprobe is not None and nprobe < 1:
+            raise ValueError("nprobe must be positive")
+        if oversampling is not None and oversampling < 1.0:
+            raise ValueError("oversampling must be at least 1.0")
+
+        self.ef = ef
+        self.nprobe = nprobe
+        self.exact = exact
+        self.rescore = rescore
+        self.oversampling = oversampling
+
+    def __repr__(self) -> str:
+        return f"SearchParams({', '.join(f'{s}={getattr(self, s)!r}' for s in self.__slots__)})"
+
+
+__all__ = ["SearchParams"]
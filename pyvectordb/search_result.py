@@ -0,0 +1,73 @@
+import json
+from collections.abc import Iterator, Sequence
+from typing import Any
+
+from .vector import Vector
+from .vector_distance import VectorDistance
+
+
+class SearchResult:
+    """Neighbors of one query as columns: an id array, a float distance array, an optional float32 embedding matrix
+    (one row per neighbor) and the metadata list, json strings are only decoded when `metadata` is first accessed.
+
+    Returned by `get_neighbor_results` / `get_neighbor_results_batch`, no `Vector` or `VectorDistance` is built per
+    neighbor until `to_vector_distances` asks for the list form.
+    """
+
+    __slots__ = ("ids", "distances", "embeddings", "_metadata")
+
+    def __init__(
+        self,
+        ids: Sequence[Any],
+        distances: Sequence[float],
+        embeddings: Any | None = None,
+        metadata: list[dict | str | None] | None = None,
+    ) -> None:
+        # numpy ships with every backend client but is not a dependency of the base package
+        import numpy as np
+
+        self.ids = np.asarray(ids)
+        self.distances = np.asarray(distances, dtype=np.float64)
+        if len(self.ids) != len(self.distances):
+            raise ValueError(f"expected {len(self.ids)} distances, got {len(self.distances)}")
+
+        self.embeddings = None
+        if embeddings is not None:
+            if len(self.ids) == 0:
+                self.embeddings = np.empty((0, 0), dtype=np.float32)
+            else:
+                self.embeddings = np.asarray(embeddings, dtype=np.float32).reshape(len(self.ids), -1)
+
+        if metadata is not None and len(metadata) != len(self.ids):
+            raise ValueError(f"expected {len(self.ids)} metadata, got {len(metadata)}")
+        self._metadata = metadata
+
+    @property
+    def metadata(self) -> list[dict | None] | None:
+        if self._metadata is not None and any(isinstance(m, str) for m in self._metadata):
+            self._metadata = [json.loads(m) if isinstance(m, str) else m for m in self._metadata]
+        return self._metadata
+
+    def to_vector_distances(self) -> list[VectorDistance]:
+        # undecoded metadata strings are handed over as is, Vector decodes them lazily too
+        metadata = self._metadata if self._metadata is not None else [None] * len(self)
+        embeddings = self.embeddings if self.embeddings is not None else [None] * len(self)
+        return [
+            VectorDistance(Vector(embedding=embedding, vector_id=id_, metadata=metadata_), distance)
+            for id_, distance, embedding, metadata_ in zip(
+                self.ids.tolist(), self.distances.tolist(), embeddings, metadata, strict=True
+            )
+        ]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[VectorDistance]:
+        return iter(self.to_vector_distances())
+
+    def __str__(self) -> str:
+        embedding_length = self.embeddings.shape[1] if self.embeddings is not None else None
+        return f"SearchResult[size: {len(self)}, embedding_length: {embedding_length}]"
+
+    def __repr__(self) -> str:
+        return self.__str__()
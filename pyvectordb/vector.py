@@ -1,22 +1,37 @@
 import json
+from collections.abc import Sequence
 from uuid import uuid4
 
 
 class Vector:
+    """Embedding with its id and metadata.
+
+    `embedding` is kept as given: a list, an `array.array("f")` or a numpy array are stored without conversion. It is
+    None on vectors read or searched with `include_embedding=False`. Metadata given as a json string is only decoded
+    when `metadata` is first accessed.
+    """
+
+    __slots__ = ("embedding", "id", "_metadata", "_metadata_string")
+
     def __init__(
         self,
-        embedding: list[float],
+        embedding: Sequence[float] | None,
         vector_id: str | None = None,
         metadata: dict | str | None = None,
         init_id: bool = False,
     ) -> None:
 
-        if embedding is None or len(embedding) == 0:
+        if embedding is not None and len(embedding) == 0:
             self.__raise_value_error("embedding")
-        self.embedding = embedding if embedding is not None else {}
+        self.embedding = embedding
 
         self.id = vector_id
-        self.metadata = self.metadata_from_string(metadata) if isinstance(metadata, str) else metadata
+        self._metadata = None
+        self._metadata_string = None
+        if isinstance(metadata, str):
+            self._metadata_string = metadata
+        else:
+            self._metadata = metadata
 
         if init_id:
             self.get_id()
@@ -25,20 +40,45 @@ class Vector:
     def __raise_value_error(param: str):
         raise ValueError(f"{param} is required")
 
+    @property
+    def metadata(self) -> dict | None:
+        if self._metadata_string is not None:
+            self._metadata = json.loads(self._metadata_string)
+            self._metadata_string = None
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, metadata: dict | str | None) -> None:
+        if isinstance(metadata, str):
+            self._metadata, self._metadata_string = None, metadata
+        else:
+            self._metadata, self._metadata_string = metadata, None
+
     def get_id(self) -> str:
         if self.id is None:
             self.id = str(uuid4())
         return self.id
 
+    def embedding_to_list(self) -> list[float]:
+        """Embedding as a python list, for clients that do not accept arrays."""
+        if isinstance(self.embedding, list):
+            return self.embedding
+        if hasattr(self.embedding, "tolist"):
+            return self.embedding.tolist()
+        return list(self.embedding)
+
     def metadata_to_string(self) -> str:
-        return json.dumps(self.metadata)
+        # metadata that was never decoded is returned as received
+        if self._metadata_string is not None:
+            return self._metadata_string
+        return json.dumps(self._metadata)
 
     def metadata_from_string(self, metadata: str) -> dict:
         self.metadata = json.loads(metadata)
         return self.metadata
 
     def __len__(self) -> int:
-        return len(self.embedding)
+        return len(self.embedding) if self.embedding is not None else 0
 
     def __str__(self) -> str:
         if self.embedding is not None and len(self.embedding) > 10:
@@ -51,7 +91,7 @@ class Vector:
         else:
             metadata = self.metadata
 
-        return f"""Vector[id: {self.id}, embedding: {embedding}, embedding_length: {len(self.embedding)}, metadata: {metadata}]"""
+        return f"""Vector[id: {self.id}, embedding: {embedding}, embedding_length: {len(self)}, metadata: {metadata}]"""
 
     def __repr__(self) -> str:
         return self.__str__()
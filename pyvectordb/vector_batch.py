@@ -0,0 +1,70 @@
+import json
+from collections.abc import Iterator
+from typing import Any
+from uuid import uuid4
+
+from .vector import Vector
+
+
+class VectorBatch:
+    """Columnar batch of vectors: ids, a 2-D float32 embedding matrix and one metadata entry per row.
+
+    Accepted by every `insert_vectors` / `update_vectors`, backends read the columns directly instead of
+    building one object per vector. Missing ids are generated like `Vector.get_id`.
+    """
+
+    __slots__ = ("ids", "embeddings", "metadata")
+
+    def __init__(
+        self,
+        embeddings: Any,
+        ids: list[str] | None = None,
+        metadata: list[dict | None] | None = None,
+    ) -> None:
+        # numpy ships with every backend client but is not a dependency of the base package
+        import numpy as np
+
+        self.embeddings = np.asarray(embeddings, dtype=np.float32)
+        if self.embeddings.ndim != 2 or self.embeddings.shape[0] == 0:
+            raise ValueError("embeddings must be a non empty 2-D matrix")
+
+        rows = self.embeddings.shape[0]
+        self.ids = list(ids) if ids is not None else [str(uuid4()) for _ in range(rows)]
+        self.metadata = list(metadata) if metadata is not None else [None] * rows
+
+        if len(self.ids) != rows:
+            raise ValueError(f"expected {rows} ids, got {len(self.ids)}")
+        if len(self.metadata) != rows:
+            raise ValueError(f"expected {rows} metadata, got {len(self.metadata)}")
+
+    @classmethod
+    def from_vectors(cls, vectors: list[Vector]) -> "VectorBatch":
+        import numpy as np
+
+        return cls(
+            embeddings=np.stack([np.asarray(v.embedding, dtype=np.float32) for v in vectors]),
+            ids=[v.get_id() for v in vectors],
+            metadata=[v.metadata for v in vectors],
+        )
+
+    def to_vectors(self) -> list[Vector]:
+        return list(self)
+
+    def embeddings_to_list(self) -> list[list[float]]:
+        return self.embeddings.tolist()
+
+    def metadata_to_strings(self) -> list[str]:
+        return [json.dumps(m) for m in self.metadata]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[Vector]:
+        for id_, embedding, metadata in zip(self.ids, self.embeddings, self.metadata, strict=True):
+            yield Vector(embedding=embedding, vector_id=id_, metadata=metadata)
+
+    def __str__(self) -> str:
+        return f"VectorBatch[size: {len(self)}, embedding_length: {self.embeddings.shape[1]}]"
+
+    def __repr__(self) -> str:
+        return self.__str__()
@@ -1,13 +1,27 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import weaviate
 import weaviate.classes.config as wvc
 from weaviate.classes.query import MetadataQuery
 
 from pyvectordb.distance_function import DistanceFunction
 from pyvectordb.driver import VectorDB
+from pyvectordb.filter import Filter
+from pyvectordb.index_spec import IndexSpec
+from pyvectordb.metadata_type import MetadataType
+from pyvectordb.search_params import SearchParams
+from pyvectordb.search_result import SearchResult
 from pyvectordb.vector import Vector
+from pyvectordb.vector_batch import VectorBatch
 from pyvectordb.vector_distance import VectorDistance
 
+from .batch import id_filters, raise_failed_deletes, raise_failed_objects
 from .distance import Distance
+from .filter import metadata_properties, metadata_property, to_weaviate_filter
+from .index import vector_index_config
+
+# weaviate has no multi-vector near_vector query, a batch runs this many queries concurrently
+MAX_QUERY_WORKERS = 8
 
 
 class WeaviateDB(VectorDB):
@@ -20,6 +34,9 @@ class WeaviateDB(VectorDB):
         collection: str = None,
         vector_size: int = None,
         distance_function: DistanceFunction | str = DistanceFunction.COSINE,
+        index_spec: IndexSpec | None = None,
+        batch_size: int | None = None,
+        concurrent_requests: int = 2,
         debug: bool = False,
     ) -> None:
         super().__init__(host, port, debug)
@@ -31,6 +48,9 @@ class WeaviateDB(VectorDB):
         self.collection_name = collection or self.__raise_value_error("collection")
         self.vector_size = vector_size or self.__raise_value_error("vector_size")
         self.distance_function = distance_function or self.__raise_value_error("distance_function")
+        self.index_spec = index_spec
+        self.batch_size = batch_size
+        self.concurrent_requests = concurrent_requests or self.__raise_value_error("concurrent_requests")
 
         self.client = None
         self.collection = None
@@ -74,7 +94,7 @@ class WeaviateDB(VectorDB):
                 self.client.collections.create(
                     name=self.collection_name,
                     vectorizer_config=wvc.Configure.Vectorizer.none(),
-                    vector_index_config=wvc.Configure.VectorIndex.flat(distance_metric=distance_metric),
+                    vector_index_config=vector_index_config(distance_metric, self.index_spec),
                     properties=[wvc.Property(name="metadata", data_type=wvc.DataType.OBJECT)],
                 )
                 self.collection = self.client.collections.get(self.collection_name)
@@ -108,50 +128,34 @@ class WeaviateDB(VectorDB):
 
         self.collection.data.insert(
             uuid=vector_id,
-            properties={"metadata": vector.metadata},
+            properties=metadata_properties(vector.metadata),
             vector=vector.embedding,
         )
 
-    def insert_vectors(self, vectors: list[Vector]) -> None:
+    def insert_vectors(self, vectors: list[Vector] | VectorBatch) -> None:
         if len(vectors) == 0:
             return
 
-        data = []
-        for vector in vectors:
-            data.append(
-                {
-                    "uuid": vector.get_id(),
-                    "properties": {"metadata": vector.metadata},
-                    "vector": vector.embedding,
-                }
-            )
-
-        # Use insert_many for batch insert
-        objects = []
-        for item in data:
-            from weaviate.classes.data import DataObject
-
-            obj = DataObject(
-                uuid=item["uuid"],
-                properties=item["properties"],
-                vector=item["vector"],
-            )
-            objects.append(obj)
+        if isinstance(vectors, VectorBatch):
+            columns = zip(vectors.ids, vectors.embeddings, vectors.metadata, strict=True)
+        else:
+            columns = ((v.get_id(), v.embedding, v.metadata) for v in vectors)
 
-        self.collection.data.insert_many(objects)
+        self.__write_batch(columns, len(vectors))
 
-    def read_vector(self, id: str) -> Vector | None:
+    def read_vector(self, id: str, include_embedding: bool = True, include_metadata: bool = True) -> Vector | None:
         try:
             result = self.collection.query.fetch_object_by_id(
                 uuid=id,
-                include_vector=True,
+                include_vector=include_embedding,
+                return_properties=None if include_metadata else False,
             )
 
             if result is None:
                 return None
 
             return Vector(
-                embedding=result.vector,
+                embedding=result.vector.get("default"),
                 vector_id=result.uuid,
                 metadata=result.properties.get("metadata") if result.properties else None,
             )
@@ -161,16 +165,16 @@ class WeaviateDB(VectorDB):
     def update_vector(self, vector: Vector) -> None:
         vector_id = vector.get_id()
 
-        self.collection.data.update(
+        # replace, a merge would keep the filter properties of removed metadata keys
+        self.collection.data.replace(
             uuid=vector_id,
-            properties={"metadata": vector.metadata},
+            properties=metadata_properties(vector.metadata),
             vector=vector.embedding,
         )
 
-    def update_vectors(self, vectors: list[Vector]) -> None:
-        # Weaviate doesn't have a direct batch update, so we update one by one
-        for vector in vectors:
-            self.update_vector(vector)
+    def update_vectors(self, vectors: list[Vector] | VectorBatch) -> None:
+        # a batch import replaces the objects whose uuid exists, like update_vector
+        self.insert_vectors(vectors)
 
     def delete_vector(self, id: str) -> None:
         self.collection.data.delete_by_id(uuid=id)
@@ -182,33 +186,129 @@ class WeaviateDB(VectorDB):
         if isinstance(ids[0], Vector):
             ids = [v.get_id() for v in ids]
 
-        for id_ in ids:
-            self.delete_vector(id_)
+        failed = 0
+        for where in id_filters(ids):
+            failed += self.collection.data.delete_many(where=where).failed
+
+        raise_failed_deletes(failed, len(ids))
 
     def get_neighbor_vectors(
         self,
         vector: Vector,
         n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
     ) -> list[VectorDistance]:
+        return self.get_neighbor_results(
+            vector, n, filter, include_embedding=include_embedding, include_metadata=include_metadata, params=params
+        ).to_vector_distances()
+
+    def get_neighbor_results(
+        self,
+        vector: Vector,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> SearchResult:
+        # ef is a collection setting on weaviate (dynamic by default), params have no per query equivalent
+        return self.__near_vector(vector.embedding, n, filter, include_embedding, include_metadata)
+
+    def get_neighbor_vectors_batch(
+        self,
+        vectors: list[Vector] | VectorBatch,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[list[VectorDistance]]:
+        results = self.get_neighbor_results_batch(
+            vectors, n, filter, include_embedding=include_embedding, include_metadata=include_metadata, params=params
+        )
+        return [result.to_vector_distances() for result in results]
+
+    def get_neighbor_results_batch(
+        self,
+        vectors: list[Vector] | VectorBatch,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[SearchResult]:
+        if len(vectors) == 0:
+            return []
+
+        if isinstance(vectors, VectorBatch):
+            embeddings = vectors.embeddings_to_list()
+        else:
+            embeddings = [vector.embedding for vector in vectors]
+
+        with ThreadPoolExecutor(max_workers=min(len(embeddings), MAX_QUERY_WORKERS)) as executor:
+            return list(
+                executor.map(
+                    lambda embedding: self.__near_vector(embedding, n, filter, include_embedding, include_metadata),
+                    embeddings,
+                )
+            )
+
+    def create_metadata_index(self, field: str, type: MetadataType | str) -> None:
+        prop = metadata_property(field, type)
+
+        # index settings are fixed once a property exists, call before inserting objects with this key (auto schema
+        # would otherwise create it as a filterable property without range index)
+        config = self.collection.config.get()
+        if any(p.name == prop.name for p in config.properties):
+            return
+
+        self.collection.config.add_property(prop)
+
+    def __write_batch(self, columns, total: int) -> None:
+        # without batch_size the client sizes batches and concurrent requests from the server load
+        if self.batch_size is None:
+            batch_context = self.collection.batch.dynamic()
+        else:
+            batch_context = self.collection.batch.fixed_size(
+                batch_size=self.batch_size, concurrent_requests=self.concurrent_requests
+            )
+
+        with batch_context as batch:
+            for id_, embedding, metadata in columns:
+                batch.add_object(properties=metadata_properties(metadata), uuid=id_, vector=embedding)
+
+        raise_failed_objects(self.collection.batch.failed_objects, total)
+
+    def __near_vector(
+        self,
+        embedding,
+        n: int,
+        filter: Filter | None,
+        include_embedding: bool,
+        include_metadata: bool,
+    ) -> SearchResult:
         results = self.collection.query.near_vector(
-            near_vector=vector.embedding,
+            near_vector=embedding,
+            filters=to_weaviate_filter(filter) if filter is not None else None,
             limit=n,
+            include_vector=include_embedding,
+            # an object property is only selectable by listing its sub-properties, all properties are returned
+            return_properties=None if include_metadata else False,
             return_metadata=MetadataQuery(distance=True),
         )
 
-        vector_distances = []
-        for obj in results.objects:
-            vector_distance = VectorDistance(
-                vector=Vector(
-                    embedding=obj.vector,
-                    vector_id=obj.uuid,
-                    metadata=obj.properties.get("metadata") if obj.properties else None,
-                ),
-                distance=obj.metadata.distance if obj.metadata else 0.0,
-            )
-            vector_distances.append(vector_distance)
-
-        return vector_distances
+        objects = results.objects
+        return SearchResult(
+            ids=[obj.uuid for obj in objects],
+            distances=[obj.metadata.distance if obj.metadata else 0.0 for obj in objects],
+            embeddings=[obj.vector.get("default") for obj in objects] if include_embedding else None,
+            metadata=[obj.properties.get("metadata") if obj.properties else None for obj in objects]
+            if include_metadata
+            else None,
+        )
 
 
 __all__ = ["WeaviateDB"]
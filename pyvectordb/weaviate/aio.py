@@ -0,0 +1,308 @@
+import asyncio
+
+import weaviate
+import weaviate.classes.config as wvc
+from weaviate.classes.data import DataObject
+from weaviate.classes.query import MetadataQuery
+
+from pyvectordb.async_driver import AsyncVectorDB
+from pyvectordb.distance_function import DistanceFunction
+from pyvectordb.filter import Filter
+from pyvectordb.index_spec import IndexSpec
+from pyvectordb.metadata_type import MetadataType
+from pyvectordb.search_params import SearchParams
+from pyvectordb.search_result import SearchResult
+from pyvectordb.vector import Vector
+from pyvectordb.vector_batch import VectorBatch
+from pyvectordb.vector_distance import VectorDistance
+
+from .batch import DEFAULT_BATCH_SIZE, id_filters, raise_failed_deletes, raise_failed_objects
+from .distance import Distance
+from .filter import metadata_properties, metadata_property, to_weaviate_filter
+from .index import vector_index_config
+
+
+class AsyncWeaviateDB(AsyncVectorDB):
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 8080,
+        grpc_port: int = 50051,
+        api_key: str = None,
+        collection: str = None,
+        vector_size: int = None,
+        distance_function: DistanceFunction | str = DistanceFunction.COSINE,
+        index_spec: IndexSpec | None = None,
+        batch_size: int | None = None,
+        concurrent_requests: int = 2,
+        debug: bool = False,
+    ) -> None:
+        super().__init__(host, port, debug)
+
+        self.host = host or self.__raise_value_error("host")
+        self.port = port or self.__raise_value_error("port")
+        self.grpc_port = grpc_port
+        self.api_key = api_key
+        self.collection_name = collection or self.__raise_value_error("collection")
+        self.vector_size = vector_size or self.__raise_value_error("vector_size")
+        self.distance_function = distance_function or self.__raise_value_error("distance_function")
+        self.index_spec = index_spec
+        self.batch_size = batch_size
+        self.concurrent_requests = concurrent_requests or self.__raise_value_error("concurrent_requests")
+
+        self.client: weaviate.WeaviateAsyncClient = None
+        self.collection = None
+
+    @staticmethod
+    def __raise_value_error(param: str):
+        raise ValueError(f"{param} is required")
+
+    async def _connect(self) -> None:
+        if self.client is None:
+            if self.api_key:
+                # Connect to Weaviate Cloud
+                self.client = weaviate.use_async_with_weaviate_cloud(
+                    cluster_url=self.host,
+                    auth_credentials=weaviate.classes.init.Auth.api_key(self.api_key),
+                )
+            else:
+                # Connect to local/custom Weaviate instance
+                self.client = weaviate.use_async_with_custom(
+                    http_host=self.host,
+                    http_port=self.port,
+                    http_secure=False,
+                    grpc_host=self.host,
+                    grpc_port=self.grpc_port,
+                    grpc_secure=False,
+                )
+            await self.client.connect()
+
+        if self.collection is None:
+            if not await self.client.collections.exists(self.collection_name):
+                distance_metric = self.__get_distance_function(self.distance_function)
+                await self.client.collections.create(
+                    name=self.collection_name,
+                    vectorizer_config=wvc.Configure.Vectorizer.none(),
+                    vector_index_config=vector_index_config(distance_metric, self.index_spec),
+                    properties=[wvc.Property(name="metadata", data_type=wvc.DataType.OBJECT)],
+                )
+            self.collection = self.client.collections.get(self.collection_name)
+
+    async def close(self) -> None:
+        if self.client is not None:
+            await self.client.close()
+            self.client = None
+            self.collection = None
+
+    def __get_distance_function(self, distance_function: DistanceFunction | str) -> str:
+        if isinstance(distance_function, str):
+            distance_function = DistanceFunction.from_str(distance_function)
+
+        if distance_function == DistanceFunction.COSINE:
+            return Distance.COSINE.value
+        elif distance_function == DistanceFunction.EUCLIDEAN:
+            return Distance.L2_SQUARED.value
+        elif distance_function == DistanceFunction.DOT:
+            return Distance.DOT.value
+        elif distance_function == DistanceFunction.MANHATTAN:
+            return Distance.MANHATTAN.value
+        elif distance_function == DistanceFunction.HAMMING:
+            return Distance.HAMMING.value
+        else:
+            d_ = [
+                "COSINE",
+                "EUCLIDEAN",
+                "DOT",
+                "MANHATTAN",
+                "HAMMING",
+            ]
+            raise ValueError(f"distance function unavailable on weaviate: {d_}")
+
+    async def insert_vector(self, vector: Vector) -> None:
+        await self.collection.data.insert(
+            uuid=vector.get_id(),
+            properties=metadata_properties(vector.metadata),
+            vector=vector.embedding_to_list(),
+        )
+
+    async def insert_vectors(self, vectors: list[Vector] | VectorBatch) -> None:
+        if len(vectors) == 0:
+            return
+
+        if isinstance(vectors, VectorBatch):
+            columns = zip(vectors.ids, vectors.embeddings_to_list(), vectors.metadata, strict=True)
+        else:
+            columns = ((v.get_id(), v.embedding_to_list(), v.metadata) for v in vectors)
+
+        objects = [
+            DataObject(uuid=id_, properties=metadata_properties(metadata), vector=embedding)
+            for id_, embedding, metadata in columns
+        ]
+
+        await self.__write_batch(objects)
+
+    async def read_vector(
+        self, id: str, include_embedding: bool = True, include_metadata: bool = True
+    ) -> Vector | None:
+        try:
+            result = await self.collection.query.fetch_object_by_id(
+                uuid=id,
+                include_vector=include_embedding,
+                return_properties=None if include_metadata else False,
+            )
+
+            if result is None:
+                return None
+
+            return Vector(
+                embedding=result.vector.get("default"),
+                vector_id=result.uuid,
+                metadata=result.properties.get("metadata") if result.properties else None,
+            )
+        except Exception:
+            return None
+
+    async def update_vector(self, vector: Vector) -> None:
+        # replace, a merge would keep the filter properties of removed metadata keys
+        await self.collection.data.replace(
+            uuid=vector.get_id(),
+            properties=metadata_properties(vector.metadata),
+            vector=vector.embedding_to_list(),
+        )
+
+    async def update_vectors(self, vectors: list[Vector] | VectorBatch) -> None:
+        # a batch import replaces the objects whose uuid exists, like update_vector
+        await self.insert_vectors(vectors)
+
+    async def delete_vector(self, id: str) -> None:
+        await self.collection.data.delete_by_id(uuid=id)
+
+    async def delete_vectors(self, ids: list[str] | list[Vector]) -> None:
+        if len(ids) == 0:
+            return
+
+        if isinstance(ids[0], Vector):
+            ids = [v.get_id() for v in ids]
+
+        results = await asyncio.gather(*(self.collection.data.delete_many(where=where) for where in id_filters(ids)))
+        raise_failed_deletes(sum(result.failed for result in results), len(ids))
+
+    async def get_neighbor_vectors(
+        self,
+        vector: Vector,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[VectorDistance]:
+        return (
+            await self.get_neighbor_results(
+                vector, n, filter, include_embedding=include_embedding, include_metadata=include_metadata, params=params
+            )
+        ).to_vector_distances()
+
+    async def get_neighbor_results(
+        self,
+        vector: Vector,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> SearchResult:
+        # ef is a collection setting on weaviate (dynamic by default), params have no per query equivalent
+        return await self.__near_vector(vector.embedding_to_list(), n, filter, include_embedding, include_metadata)
+
+    async def get_neighbor_vectors_batch(
+        self,
+        vectors: list[Vector] | VectorBatch,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[list[VectorDistance]]:
+        results = await self.get_neighbor_results_batch(
+            vectors, n, filter, include_embedding=include_embedding, include_metadata=include_metadata, params=params
+        )
+        return [result.to_vector_distances() for result in results]
+
+    async def get_neighbor_results_batch(
+        self,
+        vectors: list[Vector] | VectorBatch,
+        n: int,
+        filter: Filter | None = None,
+        include_embedding: bool = True,
+        include_metadata: bool = True,
+        params: SearchParams | None = None,
+    ) -> list[SearchResult]:
+        if len(vectors) == 0:
+            return []
+
+        if isinstance(vectors, VectorBatch):
+            embeddings = vectors.embeddings_to_list()
+        else:
+            embeddings = [vector.embedding_to_list() for vector in vectors]
+
+        return list(
+            await asyncio.gather(
+                *(
+                    self.__near_vector(embedding, n, filter, include_embedding, include_metadata)
+                    for embedding in embeddings
+                )
+            )
+        )
+
+    async def create_metadata_index(self, field: str, type: MetadataType | str) -> None:
+        prop = metadata_property(field, type)
+
+        # index settings are fixed once a property exists, call before inserting objects with this key (auto schema
+        # would otherwise create it as a filterable property without range index)
+        config = await self.collection.config.get()
+        if any(p.name == prop.name for p in config.properties):
+            return
+
+        await self.collection.config.add_property(prop)
+
+    async def __write_batch(self, objects: list[DataObject]) -> None:
+        # the async client has no client side batching, chunks of batch_size go out as concurrent insert_many calls
+        batch_size = self.batch_size or DEFAULT_BATCH_SIZE
+        semaphore = asyncio.Semaphore(self.concurrent_requests)
+
+        async def insert_chunk(chunk: list[DataObject]):
+            async with semaphore:
+                return await self.collection.data.insert_many(chunk)
+
+        results = await asyncio.gather(
+            *(insert_chunk(objects[i : i + batch_size]) for i in range(0, len(objects), batch_size))
+        )
+        raise_failed_objects([error for result in results for error in result.errors.values()], len(objects))
+
+    async def __near_vector(
+        self,
+        embedding: list[float],
+        n: int,
+        filter: Filter | None,
+        include_embedding: bool,
+        include_metadata: bool,
+    ) -> SearchResult:
+        results = await self.collection.query.near_vector(
+            near_vector=embedding,
+            filters=to_weaviate_filter(filter) if filter is not None else None,
+            limit=n,
+            include_vector=include_embedding,
+            # an object property is only selectable by listing its sub-properties, all properties are returned
+            return_properties=None if include_metadata else False,
+            return_metadata=MetadataQuery(distance=True),
+        )
+
+        objects = results.objects
+        return SearchResult(
+            ids=[obj.uuid for obj in objects],
+            distances=[obj.metadata.distance if obj.metadata else 0.0 for obj in objects],
+            embeddings=[obj.vector.get("default") for obj in objects] if include_embedding else None,
+            metadata=[obj.properties.get("metadata") if obj.properties else None for obj in objects]
+            if include_metadata
+            else None,
+        )
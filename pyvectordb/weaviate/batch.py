@@ -0,0 +1,35 @@
+from weaviate.classes.query import Filter as WeaviateFilter
+from weaviate.collections.classes.batch import ErrorObject
+
+# objects per request of a fixed size batch (the client default), also the chunk size of the async writes
+DEFAULT_BATCH_SIZE = 100
+
+# delete_many matches at most QUERY_MAXIMUM_RESULTS objects per call, 10000 unless the server raises it
+MAX_DELETE_IDS = 10000
+
+# failed objects listed in the error message, the rest are counted
+MAX_REPORTED_ERRORS = 10
+
+
+def id_filters(ids: list[str]) -> list[WeaviateFilter]:
+    """`delete_many` filters matching `ids`, in chunks the server deletes in one call"""
+    return [
+        WeaviateFilter.by_id().contains_any(ids[i : i + MAX_DELETE_IDS]) for i in range(0, len(ids), MAX_DELETE_IDS)
+    ]
+
+
+def raise_failed_objects(failed_objects: list[ErrorObject], total: int) -> None:
+    """Raise after the whole batch was sent, so one bad object does not stop the others from being written."""
+    if len(failed_objects) == 0:
+        return
+
+    errors = [f"{error.original_uuid}: {error.message}" for error in failed_objects[:MAX_REPORTED_ERRORS]]
+    if len(failed_objects) > MAX_REPORTED_ERRORS:
+        errors.append(f"... {len(failed_objects) - MAX_REPORTED_ERRORS} more")
+
+    raise RuntimeError(f"{len(failed_objects)} of {total} objects failed on weaviate: {'; '.join(errors)}")
+
+
+def raise_failed_deletes(failed: int, total: int) -> None:
+    if failed > 0:
+        raise RuntimeError(f"{failed} of {total} objects failed to delete on weaviate")
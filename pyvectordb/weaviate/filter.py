@@ -0,0 +1,83 @@
+import re
+
+import weaviate.classes.config as wvc
+from weaviate.classes.query import Filter as WeaviateFilter
+
+from pyvectordb.filter import And, Eq, Filter, In, Not, Range, push_down_not
+from pyvectordb.metadata_type import MetadataType
+
+# weaviate cannot filter on the fields of an object property, metadata keys are also stored as top level properties
+PROPERTY_PREFIX = "metadata_"
+PROPERTY_NAME = re.compile(r"[_A-Za-z][_0-9A-Za-z]*")
+
+
+def metadata_properties(metadata: dict | None) -> dict:
+    """Object properties: `metadata` as is, plus every scalar (or list of scalars) metadata value as a filterable
+    `metadata_<key>` property."""
+    properties = {"metadata": metadata}
+    for key, value in (metadata or {}).items():
+        if PROPERTY_NAME.fullmatch(key) and _is_filterable(value):
+            properties[f"{PROPERTY_PREFIX}{key}"] = value
+    return properties
+
+
+def metadata_property(field: str, type: MetadataType | str) -> wvc.Property:
+    """Schema of the `metadata_<field>` property: filterable, range indexed when numeric, and keywords are not split
+    into words so equality matches the whole value."""
+    if not PROPERTY_NAME.fullmatch(field):
+        raise ValueError(f"metadata field is not a valid weaviate property name: {field}")
+
+    if isinstance(type, str):
+        type = MetadataType.from_str(type)
+
+    name = f"{PROPERTY_PREFIX}{field}"
+    if type == MetadataType.KEYWORD:
+        return wvc.Property(
+            name=name,
+            data_type=wvc.DataType.TEXT,
+            tokenization=wvc.Tokenization.FIELD,
+            index_filterable=True,
+        )
+    elif type == MetadataType.INTEGER:
+        return wvc.Property(name=name, data_type=wvc.DataType.INT, index_filterable=True, index_range_filters=True)
+    elif type == MetadataType.FLOAT:
+        return wvc.Property(name=name, data_type=wvc.DataType.NUMBER, index_filterable=True, index_range_filters=True)
+    elif type == MetadataType.BOOL:
+        return wvc.Property(name=name, data_type=wvc.DataType.BOOL, index_filterable=True)
+    else:
+        d_ = [
+            "KEYWORD",
+            "INTEGER",
+            "FLOAT",
+            "BOOL",
+        ]
+        raise ValueError(f"metadata type unavailable on weaviate: {d_}")
+
+
+def _is_filterable(value) -> bool:
+    if isinstance(value, list):
+        return len(value) > 0 and all(isinstance(v, str | int | float | bool) for v in value)
+    return isinstance(value, str | int | float | bool)
+
+
+def to_weaviate_filter(filter: Filter):
+    filter = push_down_not(filter)
+    if isinstance(filter, Eq):
+        return WeaviateFilter.by_property(f"{PROPERTY_PREFIX}{filter.key}").equal(filter.value)
+    if isinstance(filter, In):
+        return WeaviateFilter.by_property(f"{PROPERTY_PREFIX}{filter.key}").contains_any(filter.values)
+    if isinstance(filter, Range):
+        prop = WeaviateFilter.by_property(f"{PROPERTY_PREFIX}{filter.key}")
+        methods = {
+            "gt": prop.greater_than,
+            "gte": prop.greater_or_equal,
+            "lt": prop.less_than,
+            "lte": prop.less_or_equal,
+        }
+        conditions = [methods[name](value) for name, value in filter.bounds()]
+        return conditions[0] if len(conditions) == 1 else WeaviateFilter.all_of(conditions)
+    if isinstance(filter, Not):
+        return WeaviateFilter.not_(to_weaviate_filter(filter.filter))
+    if isinstance(filter, And):
+        return WeaviateFilter.all_of([to_weaviate_filter(f) for f in filter.filters])
+    return WeaviateFilter.any_of([to_weaviate_filter(f) for f in filter.filters])
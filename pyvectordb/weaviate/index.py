@@ -0,0 +1,68 @@
+import weaviate.classes.config as wvc
+
+from pyvectordb.index_spec import IndexSpec, IndexType, QuantizationType
+
+
+def vector_index_config(distance_metric: str, index_spec: IndexSpec | None):
+    """Vector index config of a new collection, a flat (brute force) index without `index_spec`.
+
+    Weaviate keeps the full precision vectors in its on disk object store either way, `on_disk` does not apply.
+    """
+    # the client only accepts the VectorDistances enum
+    distance_metric = wvc.VectorDistances(distance_metric)
+    if index_spec is None:
+        return wvc.Configure.VectorIndex.flat(distance_metric=distance_metric)
+
+    if index_spec.index_type == IndexType.FLAT:
+        return _flat(distance_metric, index_spec)
+    elif index_spec.index_type == IndexType.HNSW:
+        return _hnsw(distance_metric, index_spec)
+    elif index_spec.index_type == IndexType.DYNAMIC:
+        # starts flat and switches to hnsw past the threshold, needs ASYNC_INDEXING on the server
+        return wvc.Configure.VectorIndex.dynamic(
+            distance_metric=distance_metric,
+            hnsw=_hnsw(None, index_spec),
+            flat=_flat(None, index_spec) if index_spec.quantization in (None, QuantizationType.BINARY) else None,
+        )
+    else:
+        d_ = [
+            "FLAT",
+            "HNSW",
+            "DYNAMIC",
+        ]
+        raise ValueError(f"index type unavailable on weaviate: {d_}")
+
+
+def _hnsw(distance_metric: str | None, index_spec: IndexSpec):
+    return wvc.Configure.VectorIndex.hnsw(
+        distance_metric=distance_metric,
+        max_connections=index_spec.m,
+        ef_construction=index_spec.ef_construction,
+        quantizer=_quantizer(index_spec),
+    )
+
+
+def _flat(distance_metric: str | None, index_spec: IndexSpec):
+    if index_spec.quantization not in (None, QuantizationType.BINARY):
+        raise ValueError("weaviate flat indexes only take binary quantization")
+
+    return wvc.Configure.VectorIndex.flat(distance_metric=distance_metric, quantizer=_quantizer(index_spec))
+
+
+def _quantizer(index_spec: IndexSpec):
+    # cache keeps the compressed vectors in memory
+    if index_spec.quantization is None:
+        return None
+    elif index_spec.quantization == QuantizationType.SCALAR:
+        return wvc.Configure.VectorIndex.Quantizer.sq(cache=index_spec.quantization_always_ram)
+    elif index_spec.quantization == QuantizationType.BINARY:
+        return wvc.Configure.VectorIndex.Quantizer.bq(cache=index_spec.quantization_always_ram)
+    elif index_spec.quantization == QuantizationType.PRODUCT:
+        return wvc.Configure.VectorIndex.Quantizer.pq(segments=index_spec.pq_segments)
+    else:
+        d_ = [
+            "SCALAR",
+            "BINARY",
+            "PRODUCT",
+        ]
+        raise ValueError(f"quantization unavailable on weaviate: {d_}")
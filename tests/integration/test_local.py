@@ -0,0 +1,398 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from pyvectordb import Vector, VectorBatch
+from pyvectordb.distance_function import DistanceFunction
+from pyvectordb.filter import Eq, In, Not, Range, push_down_not
+from pyvectordb.local import (
+    BinaryQuantizer,
+    HNSWIndex,
+    IVFIndex,
+    NumpyVectorDB,
+    ProductQuantizer,
+    QuantizedIndex,
+    ScalarQuantizer,
+)
+from pyvectordb.local.aio import AsyncNumpyVectorDB
+from pyvectordb.metadata_type import MetadataType
+from pyvectordb.search_params import SearchParams
+
+
+def test_integration():
+    v1 = Vector(embedding=[2.0, 2.0, 1.0], metadata={"text": "hellow from pyvectordb"})
+    v2 = Vector(embedding=[2.0, 2.0, 2.0], metadata={"text": "hi"})
+    v3 = Vector(embedding=[2.0, 2.0, 3.0], metadata={"text": "good morning!"})
+
+    vector_db = NumpyVectorDB(
+        vector_size=3,
+        distance_function=DistanceFunction.L2,
+    )
+
+    # insert new vector
+    vector_db.insert_vector(v1)
+    vector_db.insert_vectors([v2, v3])
+
+    # read v1
+    v_from_db = vector_db.read_vector(v1.get_id())
+
+    # update v1 embedding
+    new_embedding = [2.0, 2.0, 4.0]
+    v_from_db.embedding = new_embedding
+    vector_db.update_vector(v_from_db)
+
+    # read updated embedding and check
+    v_from_db_updated = vector_db.read_vector(v1.get_id())
+    assert list(v_from_db_updated.embedding) == list(new_embedding), "updated embedding not equal"
+
+    # re-update v1 embedding to the v1, check
+    vector_db.update_vectors([v1, v2, v3])
+    re_updated_embedding = vector_db.read_vector(v1.get_id()).embedding
+    assert list(re_updated_embedding) == list(v1.embedding), "re-updated embedding not equal"
+
+    neighbors = vector_db.get_neighbor_vectors(v1, 3)
+    assert [x.vector.id for x in neighbors] == [v1.id, v2.id, v3.id], "neighbors not ordered by distance"
+    assert [x.distance for x in neighbors] == [0.0, 1.0, 2.0], "unexpected l2 distances"
+
+    vector_db.delete_vector(v1.get_id())
+    vector_db.delete_vectors([v2, v3])
+    assert vector_db.read_vector(v1.get_id()) is None, "deleted vector still readable"
+    assert vector_db.get_neighbor_vectors(v1, 3) == [], "deleted vectors still searchable"
+
+
+def test_update_repeated_ids():
+    vector_db = NumpyVectorDB(vector_size=2, distance_function=DistanceFunction.L2)
+    vector_db.insert_vector(Vector(embedding=[0.0, 0.0], vector_id="a"))
+
+    with pytest.raises(ValueError):
+        vector_db.update_vectors(
+            [Vector(embedding=[1.0, 1.0], vector_id="a"), Vector(embedding=[2.0, 2.0], vector_id="a")]
+        )
+
+    neighbors = vector_db.get_neighbor_vectors(Vector(embedding=[0.0, 0.0]), 5)
+    assert [x.vector.id for x in neighbors] == ["a"], "rejected update changed the collection"
+
+    vector_db.delete_vector("a")
+    assert vector_db.get_neighbor_vectors(Vector(embedding=[0.0, 0.0]), 5) == [], "deleted vector still returned"
+
+
+def test_hnsw_index():
+    rng = np.random.default_rng(0)
+    vectors = [Vector(embedding=e, vector_id=str(i)) for i, e in enumerate(rng.standard_normal((1000, 16)).tolist())]
+
+    flat_db = NumpyVectorDB(vector_size=16, distance_function=DistanceFunction.COSINE)
+    hnsw_db = NumpyVectorDB(
+        vector_size=16,
+        distance_function=DistanceFunction.COSINE,
+        index=HNSWIndex(m=8, ef_construction=64, ef_search=64, seed=0),
+    )
+    flat_db.insert_vectors(vectors)
+    hnsw_db.insert_vectors(vectors)
+
+    # deleted vectors stay in the graph but must never be returned
+    flat_db.delete_vectors(vectors[:100])
+    hnsw_db.delete_vectors(vectors[:100])
+
+    recall = []
+    for query in rng.standard_normal((20, 16)).tolist():
+        expected = {x.vector.id for x in flat_db.get_neighbor_vectors(Vector(embedding=query), 10)}
+        found = {x.vector.id for x in hnsw_db.get_neighbor_vectors(Vector(embedding=query), 10)}
+        recall.append(len(expected & found) / 10)
+
+    assert np.mean(recall) >= 0.9, "hnsw recall too low"
+
+
+def test_ivf_index():
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((20, 16))
+    embeddings = centers[rng.integers(0, 20, 2000)] + 0.2 * rng.standard_normal((2000, 16))
+    vectors = [Vector(embedding=e, vector_id=str(i)) for i, e in enumerate(embeddings.tolist())]
+
+    flat_db = NumpyVectorDB(vector_size=16, distance_function=DistanceFunction.L2)
+    ivf_index = IVFIndex(nlist=16, nprobe=4, seed=0)
+    ivf_db = NumpyVectorDB(vector_size=16, distance_function=DistanceFunction.L2, index=ivf_index)
+
+    # exact search until enough vectors are stored to train the coarse quantizer
+    ivf_db.insert_vectors(vectors[:100])
+    assert not ivf_index.is_trained, "ivf index trained too early"
+    assert ivf_db.get_neighbor_vectors(vectors[0], 1)[0].vector.id == vectors[0].id, "untrained ivf search failed"
+
+    flat_db.insert_vectors(vectors)
+    ivf_db.insert_vectors(vectors[100:])
+    assert ivf_index.is_trained, "ivf index not trained"
+
+    recall = []
+    for query in (embeddings[:20] + 0.05 * rng.standard_normal((20, 16))).tolist():
+        expected = {x.vector.id for x in flat_db.get_neighbor_vectors(Vector(embedding=query), 10)}
+        found = {x.vector.id for x in ivf_db.get_neighbor_vectors(Vector(embedding=query), 10)}
+        recall.append(len(expected & found) / 10)
+
+    assert np.mean(recall) >= 0.9, "ivf recall too low"
+
+
+def test_quantized_index():
+    rng = np.random.default_rng(0)
+    embeddings = rng.standard_normal((2000, 32))
+    vectors = [Vector(embedding=e, vector_id=str(i)) for i, e in enumerate(embeddings.tolist())]
+
+    flat_db = NumpyVectorDB(vector_size=32, distance_function=DistanceFunction.L2)
+    flat_db.insert_vectors(vectors)
+    queries = rng.standard_normal((20, 32)).tolist()
+    expected = [{x.vector.id for x in flat_db.get_neighbor_vectors(Vector(embedding=q), 10)} for q in queries]
+
+    for quantizer, code_size in [
+        (ScalarQuantizer(), 32),
+        (BinaryQuantizer(), 4),
+        (ProductQuantizer(m=8, seed=0), 8),
+    ]:
+        index = QuantizedIndex(quantizer, rescore=None, train_size=1000)
+        vector_db = NumpyVectorDB(vector_size=32, distance_function=DistanceFunction.L2, index=index)
+        vector_db.insert_vectors(vectors)
+        assert index.codes.shape[1] == code_size, "unexpected code size"
+
+        # exact re-ranking over the approximate candidates can only improve recall
+        recall = {}
+        for rescore in [None, 10]:
+            index.rescore = rescore
+            found = [{x.vector.id for x in vector_db.get_neighbor_vectors(Vector(embedding=q), 10)} for q in queries]
+            recall[rescore] = np.mean([len(e & f) / 10 for e, f in zip(expected, found, strict=True)])
+
+        assert recall[10] >= recall[None], "rescoring lowered recall"
+        if isinstance(quantizer, ScalarQuantizer):
+            assert recall[None] >= 0.9, "sq8 recall too low"
+
+
+def test_quantized_index_small_train_size():
+    rng = np.random.default_rng(0)
+    vectors = [Vector(embedding=e) for e in rng.standard_normal((150, 8)).tolist()]
+
+    # product quantization trains 256 centroids per sub-space
+    with pytest.raises(ValueError):
+        QuantizedIndex(ProductQuantizer(m=2), train_size=100)
+
+    index = QuantizedIndex(ScalarQuantizer(), train_size=100)
+    vector_db = NumpyVectorDB(vector_size=8, distance_function=DistanceFunction.L2, index=index)
+    for vector in vectors:
+        vector_db.insert_vector(vector)
+
+    assert index.quantizer.is_trained and len(index.codes) >= 150, "quantizer not trained on insert"
+    assert vector_db.get_neighbor_vectors(vectors[0], 1)[0].vector.id == vectors[0].id, "nearest neighbor not found"
+
+
+def test_persistence(tmp_path):
+    rng = np.random.default_rng(0)
+    vectors = [
+        Vector(embedding=e, vector_id=str(i), metadata={"i": i})
+        for i, e in enumerate(rng.standard_normal((500, 16)).tolist())
+    ]
+
+    vector_db = NumpyVectorDB(
+        vector_size=16,
+        distance_function=DistanceFunction.COSINE,
+        index=HNSWIndex(m=8, seed=0),
+        path=str(tmp_path),
+    )
+    vector_db.insert_vectors(vectors)
+    vector_db.delete_vector(vectors[0].id)
+    vector_db.save()
+
+    # vector size, distance and the hnsw graph come from disk
+    reopened_db = NumpyVectorDB(index=HNSWIndex(m=8, seed=0), path=str(tmp_path))
+    assert isinstance(reopened_db.storage.embeddings, np.memmap), "embeddings not memory-mapped"
+    assert len(reopened_db) == 499, "unexpected collection size"
+    assert reopened_db.read_vector(vectors[0].id) is None, "deleted vector restored"
+    assert reopened_db.read_vector(vectors[1].id).metadata == {"i": 1}, "metadata not restored"
+
+    query = Vector(embedding=vectors[1].embedding)
+    expected = [(x.vector.id, x.distance) for x in vector_db.get_neighbor_vectors(query, 5)]
+    assert [(x.vector.id, x.distance) for x in reopened_db.get_neighbor_vectors(query, 5)] == expected
+
+    # writes after opening do not touch the files until saved again
+    reopened_db.insert_vector(Vector(embedding=vectors[0].embedding, vector_id="new"))
+    assert NumpyVectorDB(path=str(tmp_path)).read_vector("new") is None, "unsaved write persisted"
+    reopened_db.save()
+    assert NumpyVectorDB(path=str(tmp_path)).read_vector("new") is not None, "saved write missing"
+
+
+def test_vector_batch():
+    rng = np.random.default_rng(0)
+    batch = VectorBatch(
+        embeddings=rng.standard_normal((100, 8)),
+        metadata=[{"i": i} for i in range(100)],
+    )
+    assert batch.embeddings.dtype == np.float32, "batch embeddings not float32"
+
+    vector_db = NumpyVectorDB(vector_size=8, distance_function=DistanceFunction.L2)
+    vector_db.insert_vectors(batch)
+    assert len(vector_db) == 100, "batch not inserted"
+
+    updated = VectorBatch(embeddings=batch.embeddings[:10] + 1.0, ids=batch.ids[:10], metadata=batch.metadata[:10])
+    vector_db.update_vectors(updated)
+
+    v = vector_db.read_vector(batch.ids[0])
+    assert np.allclose(v.embedding, batch.embeddings[0] + 1.0), "batch update not applied"
+    assert v.metadata == {"i": 0}, "batch metadata not stored"
+
+
+def test_neighbor_vectors_batch():
+    rng = np.random.default_rng(0)
+    batch = VectorBatch(embeddings=rng.standard_normal((500, 16)))
+
+    vector_db = NumpyVectorDB(vector_size=16, distance_function=DistanceFunction.COSINE, index=HNSWIndex(seed=0))
+    vector_db.insert_vectors(batch)
+
+    queries = VectorBatch(embeddings=rng.standard_normal((20, 16)))
+    results = vector_db.get_neighbor_vectors_batch(queries, 5)
+    assert len(results) == 20, "one result list per query expected"
+
+    for query, result in zip(queries, results, strict=True):
+        expected = [(x.vector.id, x.distance) for x in vector_db.get_neighbor_vectors(query, 5)]
+        assert [(x.vector.id, x.distance) for x in result] == expected, "batch search differs from single search"
+
+    assert vector_db.get_neighbor_vectors_batch([], 5) == [], "empty batch should return no results"
+
+
+def test_filtered_search():
+    vector_db = NumpyVectorDB(vector_size=3, distance_function=DistanceFunction.L2, index=HNSWIndex())
+    vectors = [
+        Vector(embedding=[1.0, 0.0, float(i)], metadata={"i": i, "parity": "odd" if i % 2 else "even"})
+        for i in range(20)
+    ]
+    vector_db.insert_vectors(vectors)
+
+    neighbors = vector_db.get_neighbor_vectors(vectors[0], 3, filter=Eq("parity", "odd") & Range("i", gte=5))
+    assert [x.vector.metadata["i"] for x in neighbors] == [5, 7, 9], "filtered neighbors not equal"
+
+    neighbors_batch = vector_db.get_neighbor_vectors_batch(vectors[:2], 2, filter=~In("i", [0, 1, 2]))
+    assert [[x.vector.metadata["i"] for x in q] for q in neighbors_batch] == [[3, 4], [3, 4]], "negated filter"
+
+    assert vector_db.get_neighbor_vectors(vectors[0], 3, filter=Eq("parity", "none")) == [], "no row should match"
+
+
+def test_negated_range():
+    records = [None, {}, {"x": 0}, {"x": 3}, {"x": 7}, {"x": "a"}, {"x": 3, "y": 1}, {"y": 2}]
+    filters = [
+        ~Range("x", gt=1, lt=5),
+        Not(Range("x", gte=3)),
+        ~(Range("x", gt=1) & Eq("y", 1)),
+        ~(Range("x", lt=1) | ~Eq("y", 2)),
+        ~In("x", [0, 7]),
+    ]
+
+    # Chroma and Pinecone compile the pushed down filter, every other backend has to agree with it
+    for filter in filters:
+        for metadata in records:
+            assert filter.matches(metadata) == push_down_not(filter).matches(metadata), f"{filter} on {metadata}"
+
+    assert not (~Range("x", gt=1, lt=5)).matches({}), "negated range matched a missing key"
+
+    vector_db = NumpyVectorDB(vector_size=2, distance_function=DistanceFunction.L2)
+    vector_db.insert_vectors([Vector(embedding=[float(i), 0.0], metadata=m) for i, m in enumerate(records)])
+    found = vector_db.get_neighbor_vectors(Vector(embedding=[0.0, 0.0]), 10, filter=~Range("x", gt=1, lt=5))
+    assert [x.vector.metadata for x in found] == [{"x": 0}, {"x": 7}], "negated range not applied"
+
+
+def test_metadata_index(tmp_path):
+    vector_db = NumpyVectorDB(vector_size=3, distance_function=DistanceFunction.L2, path=str(tmp_path))
+    vectors = [
+        Vector(embedding=[1.0, 0.0, float(i)], vector_id=str(i), metadata={"tenant": f"t{i % 4}", "i": i})
+        for i in range(40)
+    ]
+    vector_db.insert_vectors(vectors)
+    vector_db.create_metadata_index("tenant", "keyword")
+    vector_db.create_metadata_index("i", MetadataType.INTEGER)
+
+    neighbors = vector_db.get_neighbor_vectors(vectors[0], 3, filter=Eq("tenant", "t1") & Range("i", lt=30))
+    assert [x.vector.id for x in neighbors] == ["1", "5", "9"], "indexed filter neighbors not equal"
+
+    # deletes past the compaction ratio renumber the slots, the index must follow
+    vector_db.delete_vectors([str(i) for i in range(0, 40, 2)] + ["1", "3", "5"])
+    vector_db.insert_vector(Vector(embedding=[1.0, 0.0, 0.0], vector_id="new", metadata={"tenant": "t1", "i": 0}))
+    neighbors = vector_db.get_neighbor_vectors(vectors[0], 3, filter=In("tenant", ["t1", "t2"]))
+    assert [x.vector.id for x in neighbors] == ["new", "9", "13"], "index not updated"
+
+    vector_db.save()
+    reopened_db = NumpyVectorDB(path=str(tmp_path))
+    assert set(reopened_db.metadata_indexes) == {"tenant", "i"}, "metadata indexes not persisted"
+    neighbors = reopened_db.get_neighbor_vectors(vectors[0], 3, filter=Eq("tenant", "t1") | Range("i", gte=38))
+    assert [x.vector.id for x in neighbors] == ["new", "9", "13"], "reopened index neighbors not equal"
+
+
+def test_projection():
+    vector_db = NumpyVectorDB(vector_size=3, distance_function=DistanceFunction.L2)
+    v1 = Vector(embedding=[2.0, 2.0, 1.0], metadata={"text": "hellow from pyvectordb"})
+    vector_db.insert_vectors([v1, Vector(embedding=[2.0, 2.0, 2.0], metadata={"text": "hi"})])
+
+    neighbors = vector_db.get_neighbor_vectors(v1, 2, include_embedding=False, include_metadata=False)
+    assert [x.vector.id for x in neighbors][0] == v1.id, "nearest neighbor is not the vector itself"
+    assert all(x.vector.embedding is None and x.vector.metadata is None for x in neighbors), "projection not applied"
+
+    v_from_db = vector_db.read_vector(v1.id, include_embedding=False)
+    assert v_from_db.embedding is None and v_from_db.metadata == v1.metadata, "read projection not applied"
+
+
+def test_search_result():
+    vector_db = NumpyVectorDB(vector_size=3, distance_function=DistanceFunction.L2)
+    vectors = [Vector(embedding=[1.0, 0.0, float(i)], vector_id=str(i), metadata={"i": i}) for i in range(10)]
+    vector_db.insert_vectors(vectors)
+
+    result = vector_db.get_neighbor_results(vectors[0], 3)
+    assert result.ids.tolist() == ["0", "1", "2"], "result ids not equal"
+    assert np.allclose(result.distances, [0.0, 1.0, 2.0]), "result distances not equal"
+    assert result.embeddings.shape == (3, 3) and result.embeddings.dtype == np.float32, "embedding matrix expected"
+    assert result.metadata == [{"i": 0}, {"i": 1}, {"i": 2}], "result metadata not equal"
+
+    expected = [(x.vector.id, x.distance) for x in vector_db.get_neighbor_vectors(vectors[0], 3)]
+    assert [(x.vector.id, x.distance) for x in result.to_vector_distances()] == expected, "list form differs"
+
+    results = vector_db.get_neighbor_results_batch(vectors[:2], 20, include_embedding=False, include_metadata=False)
+    assert [len(r) for r in results] == [10, 10], "one result of the found neighbors per query expected"
+    assert results[1].embeddings is None and results[1].metadata is None, "projection not applied"
+
+
+def test_search_params():
+    rng = np.random.default_rng(0)
+    vectors = [Vector(embedding=e, vector_id=str(i)) for i, e in enumerate(rng.standard_normal((1000, 16)).tolist())]
+    queries = [Vector(embedding=q) for q in rng.standard_normal((20, 16)).tolist()]
+
+    flat_db = NumpyVectorDB(vector_size=16, distance_function=DistanceFunction.L2)
+    ivf_db = NumpyVectorDB(
+        vector_size=16, distance_function=DistanceFunction.L2, index=IVFIndex(nlist=16, nprobe=1, seed=0)
+    )
+    hnsw_db = NumpyVectorDB(
+        vector_size=16, distance_function=DistanceFunction.L2, index=HNSWIndex(m=4, ef_search=10, seed=0)
+    )
+    for vector_db in (flat_db, ivf_db, hnsw_db):
+        vector_db.insert_vectors(vectors)
+
+    expected = [[x.vector.id for x in flat_db.get_neighbor_vectors(q, 10)] for q in queries]
+    for vector_db, params in [
+        (ivf_db, SearchParams(nprobe=16)),
+        (ivf_db, SearchParams(exact=True)),
+        (hnsw_db, SearchParams(exact=True)),
+    ]:
+        found = [[x.vector.id for x in vector_db.get_neighbor_vectors(q, 10, params=params)] for q in queries]
+        assert found == expected, f"{params} search not exact"
+
+    def recall(params):
+        found = [{x.vector.id for x in hnsw_db.get_neighbor_vectors(q, 10, params=params)} for q in queries]
+        return np.mean([len(set(e) & f) / 10 for e, f in zip(expected, found, strict=True)])
+
+    assert recall(SearchParams(ef=200)) >= recall(None), "larger ef lowered recall"
+
+
+def test_async_integration():
+    async def run():
+        async with AsyncNumpyVectorDB(vector_size=3, distance_function=DistanceFunction.L2) as vector_db:
+            v1 = Vector(embedding=[2.0, 2.0, 1.0], metadata={"text": "hellow from pyvectordb"})
+            await vector_db.insert_vectors([v1, Vector(embedding=[2.0, 2.0, 2.0])])
+
+            assert (await vector_db.read_vector(v1.id)).metadata == v1.metadata, "metadata not equal"
+            neighbors = await vector_db.get_neighbor_vectors(v1, 1)
+            assert neighbors[0].vector.id == v1.id, "nearest neighbor is not the vector itself"
+
+            await vector_db.delete_vector(v1.id)
+            assert await vector_db.read_vector(v1.id) is None, "vector not deleted"
+
+    asyncio.run(run())
@@ -1,10 +1,13 @@
+import asyncio
 import os
 
 from dotenv import load_dotenv
 
 from pyvectordb import Vector
 from pyvectordb.distance_function import DistanceFunction
+from pyvectordb.filter import Eq, In
 from pyvectordb.milvus import MilvusDB
+from pyvectordb.milvus.aio import AsyncMilvusDB
 
 load_dotenv()
 
@@ -46,5 +49,47 @@ def test_integration():
     for x in vector_db.get_neighbor_vectors(v1, 3):
         print(f"{x}")
 
+    neighbors_batch = vector_db.get_neighbor_vectors_batch([v1, v3], 3)
+    assert len(neighbors_batch) == 2, "one neighbor list per query expected"
+
+    vector_db.create_metadata_index("text", "keyword")
+    filtered = vector_db.get_neighbor_vectors(v1, 3, filter=Eq("text", "hi") | In("text", ["good morning!"]))
+    assert {x.vector.metadata["text"] for x in filtered} == {"hi", "good morning!"}, "filtered neighbors not equal"
+
+    ids_only = vector_db.get_neighbor_vectors(v1, 3, include_embedding=False, include_metadata=False)
+    assert ids_only[0].vector.get_id() == v1.get_id(), "projected nearest neighbor is not the vector itself"
+    assert all(x.vector.embedding is None and x.vector.metadata is None for x in ids_only), "projection not applied"
+
     vector_db.delete_vector(v1.get_id())
     vector_db.delete_vectors([v2, v3])
+
+
+def test_async_integration():
+    v1 = Vector(embedding=[2.0, 2.0, 1.0], metadata={"text": "hellow from pyvectordb"})
+    v2 = Vector(embedding=[2.0, 2.0, 2.0], metadata={"text": "hi"})
+    v3 = Vector(embedding=[2.0, 2.0, 3.0], metadata={"text": "good morning!"})
+
+    async def run():
+        async with AsyncMilvusDB(
+            host=os.getenv("MILVUS_HOST"),
+            port=int(os.getenv("MILVUS_PORT", 19530)),
+            collection=os.getenv("MILVUS_COLLECTION"),
+            vector_size=int(os.getenv("MILVUS_VECTOR_SIZE")),
+            distance_function=DistanceFunction.COSINE,
+        ) as vector_db:
+            await vector_db.insert_vector(v1)
+            await vector_db.insert_vectors([v2, v3])
+
+            v_from_db = await vector_db.read_vector(v1.get_id())
+            v_from_db.embedding = [2.0, 2.0, 4.0]
+            await vector_db.update_vector(v_from_db)
+            v_from_db_updated = await vector_db.read_vector(v1.get_id())
+            assert list(v_from_db_updated.embedding) == [2.0, 2.0, 4.0], "updated embedding not equal"
+
+            neighbors_batch = await vector_db.get_neighbor_vectors_batch([v1, v3], 3)
+            assert len(neighbors_batch) == 2, "one neighbor list per query expected"
+
+            await vector_db.delete_vector(v1.get_id())
+            await vector_db.delete_vectors([v2, v3])
+
+    asyncio.run(run())
@@ -1,10 +1,14 @@
+import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 from dotenv import load_dotenv
 
-from pyvectordb import Vector
+from pyvectordb import Vector, VectorBatch
 from pyvectordb.distance_function import DistanceFunction
-from pyvectordb.pgvector import PgvectorDB
+from pyvectordb.filter import Eq, In, Range
+from pyvectordb.pgvector import IndexType, PgvectorDB
+from pyvectordb.pgvector.aio import AsyncPgvectorDB
 
 load_dotenv()
 
@@ -48,5 +52,177 @@ def test_integration():
     for x in vector_db.get_neighbor_vectors(v1, 3):
         print(f"{x}")
 
+    neighbors_batch = vector_db.get_neighbor_vectors_batch([v1, v3], 3)
+    assert len(neighbors_batch) == 2, "one neighbor list per query expected"
+
+    vector_db.create_metadata_index("text", "keyword")
+    filtered = vector_db.get_neighbor_vectors(v1, 3, filter=Eq("text", "hi") | In("text", ["good morning!"]))
+    assert {x.vector.metadata["text"] for x in filtered} == {"hi", "good morning!"}, "filtered neighbors not equal"
+
+    # jsonb orders strings above numbers, a numeric range must still skip string values
+    mistyped = vector_db.get_neighbor_vectors(v1, 3, filter=Range("text", gt=0))
+    assert len(mistyped) == 0, "numeric range matched string metadata"
+
+    ids_only = vector_db.get_neighbor_vectors(v1, 3, include_embedding=False, include_metadata=False)
+    assert ids_only[0].vector.get_id() == v1.get_id(), "projected nearest neighbor is not the vector itself"
+    assert all(x.vector.embedding is None and x.vector.metadata is None for x in ids_only), "projection not applied"
+
+    # inserting existing ids overwrites them
+    vector_db.insert_vectors([Vector(embedding=[2.0, 2.0, 5.0], vector_id=v1.get_id(), metadata=v1.metadata), v2])
+    assert list(vector_db.read_vector(v1.get_id()).embedding) == [2.0, 2.0, 5.0], "upserted embedding not equal"
+
     vector_db.delete_vector(v1.get_id())
     vector_db.delete_vectors([v2, v3])
+
+
+def test_bulk_insert():
+    vector_db = PgvectorDB(
+        user=os.getenv("PG_USER"),
+        password=os.getenv("PG_PASSWORD"),
+        host=os.getenv("PG_HOST"),
+        port=os.getenv("PG_PORT"),
+        db_name=os.getenv("PG_NAME"),
+        collection=os.getenv("PG_COLLECTION"),
+        distance_function=DistanceFunction.L2,
+    )
+
+    batches = (
+        VectorBatch(embeddings=[[float(i), 2.0, float(j)] for j in range(100)], metadata=[{"batch": i}] * 100)
+        for i in range(3)
+    )
+    ids = []
+
+    def track(batches):
+        for batch in batches:
+            ids.extend(batch.ids)
+            yield batch
+
+    count = vector_db.bulk_insert_vectors(track(batches), batch_size=64, rebuild_indexes=True, maintenance_workers=2)
+    assert count == 300, "not every vector was copied"
+
+    v = vector_db.read_vector(ids[-1])
+    assert list(v.embedding) == [2.0, 2.0, 99.0], "copied embedding not equal"
+
+    assert vector_db.delete_vectors_where(metadata={"batch": 0}) == 100, "predicate delete count not equal"
+    assert vector_db.read_vector(ids[0]) is None, "vector matching the predicate not deleted"
+
+    # a repeated id in one upsert batch keeps its last row
+    vector_db.update_vectors(
+        [Vector(embedding=[1.0, 1.0, 1.0], vector_id=ids[-1]), Vector(embedding=[3.0, 3.0, 3.0], vector_id=ids[-1])]
+    )
+    assert list(vector_db.read_vector(ids[-1]).embedding) == [3.0, 3.0, 3.0], "last repeated row not kept"
+
+    vector_db.delete_vectors(ids)
+    assert vector_db.read_vector(ids[-1]) is None, "bulk deleted vector still readable"
+
+
+def test_index():
+    vector_db = PgvectorDB(
+        user=os.getenv("PG_USER"),
+        password=os.getenv("PG_PASSWORD"),
+        host=os.getenv("PG_HOST"),
+        port=os.getenv("PG_PORT"),
+        db_name=os.getenv("PG_NAME"),
+        collection=f"{os.getenv('PG_COLLECTION')}_indexed",
+        distance_function=DistanceFunction.COSINE,
+        vector_size=3,
+    )
+
+    vectors = [Vector(embedding=[1.0, 2.0, float(i)]) for i in range(1, 51)]
+    vector_db.insert_vectors(vectors)
+
+    assert vector_db.create_index(IndexType.HNSW, m=8, ef_construction=32).endswith("_hnsw_idx"), "hnsw not created"
+    vector_db.create_index(IndexType.IVFFLAT, lists=4, concurrently=True)
+
+    neighbors = vector_db.get_neighbor_vectors(vectors[0], 3, ef_search=64, probes=4)
+    assert neighbors[0].vector.id == vectors[0].id, "indexed search nearest neighbor not equal"
+
+    vector_db.drop_index(IndexType.HNSW)
+    vector_db.drop_index(IndexType.IVFFLAT)
+    vector_db.delete_vectors(vectors)
+
+
+def test_compact_storage():
+    for storage in ["halfvec", "bit"]:
+        vector_db = PgvectorDB(
+            user=os.getenv("PG_USER"),
+            password=os.getenv("PG_PASSWORD"),
+            host=os.getenv("PG_HOST"),
+            port=os.getenv("PG_PORT"),
+            db_name=os.getenv("PG_NAME"),
+            collection=f"{os.getenv('PG_COLLECTION')}_{storage}",
+            distance_function=DistanceFunction.COSINE,
+            vector_size=3,
+            storage=storage,
+            rerank=4,
+        )
+
+        vectors = [Vector(embedding=[1.0, float(i % 7) - 3.0, float(i) - 25.0]) for i in range(50)]
+        vector_db.insert_vectors(vectors)
+        assert storage in vector_db.create_index(IndexType.HNSW), "compact index not created"
+
+        neighbors = vector_db.get_neighbor_vectors(vectors[10], 3)
+        assert neighbors[0].vector.id == vectors[10].id, "re-ranked nearest neighbor not equal"
+        assert abs(neighbors[0].distance) < 1e-6, "re-ranked distance is not exact"
+
+        vector_db.drop_index(IndexType.HNSW)
+        vector_db.delete_vectors(vectors)
+        vector_db.close()
+
+
+def test_threaded_sessions():
+    vector_db = PgvectorDB(
+        user=os.getenv("PG_USER"),
+        password=os.getenv("PG_PASSWORD"),
+        host=os.getenv("PG_HOST"),
+        port=os.getenv("PG_PORT"),
+        db_name=os.getenv("PG_NAME"),
+        collection=os.getenv("PG_COLLECTION"),
+        distance_function=DistanceFunction.L2,
+        pool_size=4,
+        max_overflow=0,
+    )
+
+    vectors = [Vector(embedding=[3.0, 3.0, float(i)]) for i in range(16)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(vector_db.insert_vector, vectors))
+        neighbors = list(executor.map(lambda v: vector_db.get_neighbor_vectors(v, 1), vectors))
+
+    for v, vd in zip(vectors, neighbors, strict=True):
+        assert vd[0].vector.id == v.id, "threaded search nearest neighbor not equal"
+
+    vector_db.delete_vectors(vectors)
+    vector_db.close()
+
+
+def test_async_integration():
+    v1 = Vector(embedding=[2.0, 2.0, 1.0], metadata={"text": "hellow from pyvectordb"})
+    v2 = Vector(embedding=[2.0, 2.0, 2.0], metadata={"text": "hi"})
+    v3 = Vector(embedding=[2.0, 2.0, 3.0], metadata={"text": "good morning!"})
+
+    async def run():
+        async with AsyncPgvectorDB(
+            user=os.getenv("PG_USER"),
+            password=os.getenv("PG_PASSWORD"),
+            host=os.getenv("PG_HOST"),
+            port=os.getenv("PG_PORT"),
+            db_name=os.getenv("PG_NAME"),
+            collection=os.getenv("PG_COLLECTION"),
+            distance_function=DistanceFunction.L2,
+        ) as vector_db:
+            await vector_db.insert_vector(v1)
+            await vector_db.insert_vectors([v2, v3])
+
+            v_from_db = await vector_db.read_vector(v1.get_id())
+            v_from_db.embedding = [2.0, 2.0, 4.0]
+            await vector_db.update_vector(v_from_db)
+            v_from_db_updated = await vector_db.read_vector(v1.get_id())
+            assert list(v_from_db_updated.embedding) == [2.0, 2.0, 4.0], "updated embedding not equal"
+
+            neighbors_batch = await vector_db.get_neighbor_vectors_batch([v1, v3], 3)
+            assert len(neighbors_batch) == 2, "one neighbor list per query expected"
+
+            await vector_db.delete_vector(v1.get_id())
+            await vector_db.delete_vectors([v2, v3])
+
+    asyncio.run(run())
@@ -1,10 +1,15 @@
+import asyncio
 import os
 
 from dotenv import load_dotenv
 
 from pyvectordb import Vector
 from pyvectordb.distance_function import DistanceFunction
+from pyvectordb.filter import Eq, In
+from pyvectordb.index_spec import IndexSpec
 from pyvectordb.qdrant import QdrantDB
+from pyvectordb.qdrant.aio import AsyncQdrantDB
+from pyvectordb.search_params import SearchParams
 
 load_dotenv()
 
@@ -47,5 +52,70 @@ def test_integration():
     for x in vector_db.get_neighbor_vectors(v1, 3):
         print(f"{x}")
 
+    neighbors_batch = vector_db.get_neighbor_vectors_batch([v1, v3], 3)
+    assert len(neighbors_batch) == 2, "one neighbor list per query expected"
+
+    vector_db.create_metadata_index("text", "keyword")
+    filtered = vector_db.get_neighbor_vectors(v1, 3, filter=Eq("text", "hi") | In("text", ["good morning!"]))
+    assert {x.vector.metadata["text"] for x in filtered} == {"hi", "good morning!"}, "filtered neighbors not equal"
+
+    exact = vector_db.get_neighbor_vectors(v1, 3, params=SearchParams(ef=128, exact=True))
+    assert exact[0].vector.get_id() == v1.get_id(), "exact nearest neighbor is not the vector itself"
+
+    ids_only = vector_db.get_neighbor_vectors(v1, 3, include_embedding=False, include_metadata=False)
+    assert ids_only[0].vector.get_id() == v1.get_id(), "projected nearest neighbor is not the vector itself"
+    assert all(x.vector.embedding is None and x.vector.metadata is None for x in ids_only), "projection not applied"
+
     vector_db.delete_vector(v1.get_id())
     vector_db.delete_vectors([v2, v3])
+
+
+def test_index_spec():
+    collection = f"{os.getenv('Q_COLLECTION')}_index_spec"
+    vector_db = QdrantDB(
+        host=os.getenv("Q_HOST"),
+        api_key=os.getenv("Q_API_KEY"),
+        port=os.getenv("Q_PORT"),
+        collection=collection,
+        vector_size=int(os.getenv("Q_VECTOR_SIZE")),
+        distance_function=DistanceFunction.COSINE,
+        index_spec=IndexSpec("hnsw", m=32, ef_construction=200, quantization="scalar", on_disk=True),
+    )
+
+    params = vector_db.client.get_collection(collection).config.params.vectors
+    assert params.hnsw_config.m == 32 and params.on_disk, "hnsw config not applied"
+    assert params.quantization_config.scalar is not None, "scalar quantization not applied"
+
+    vector_db.client.delete_collection(collection)
+
+
+def test_async_integration():
+    v1 = Vector(embedding=[2.0, 2.0, 1.0], metadata={"text": "hellow from pyvectordb"})
+    v2 = Vector(embedding=[2.0, 2.0, 2.0], metadata={"text": "hi"})
+    v3 = Vector(embedding=[2.0, 2.0, 3.0], metadata={"text": "good morning!"})
+
+    async def run():
+        async with AsyncQdrantDB(
+            host=os.getenv("Q_HOST"),
+            api_key=os.getenv("Q_API_KEY"),
+            port=os.getenv("Q_PORT"),
+            collection=os.getenv("Q_COLLECTION"),
+            vector_size=int(os.getenv("Q_VECTOR_SIZE")),
+            distance_function=DistanceFunction.EUCLIDEAN,
+        ) as vector_db:
+            await vector_db.insert_vector(v1)
+            await vector_db.insert_vectors([v2, v3])
+
+            v_from_db = await vector_db.read_vector(v1.get_id())
+            v_from_db.embedding = [2.0, 2.0, 4.0]
+            await vector_db.update_vector(v_from_db)
+            v_from_db_updated = await vector_db.read_vector(v1.get_id())
+            assert list(v_from_db_updated.embedding) == [2.0, 2.0, 4.0], "updated embedding not equal"
+
+            neighbors_batch = await vector_db.get_neighbor_vectors_batch([v1, v3], 3)
+            assert len(neighbors_batch) == 2, "one neighbor list per query expected"
+
+            await vector_db.delete_vector(v1.get_id())
+            await vector_db.delete_vectors([v2, v3])
+
+    asyncio.run(run())